@@ -0,0 +1,122 @@
+"""
+Change Detector – decides whether supervisor synthesis needs a fresh LLM call.
+
+Agent outputs are reduced to a normalized feature set (scores, counts, top
+headlines, hotspot IDs, ...). If no feature moved past its threshold since
+the last synthesis for the same conflict, that synthesis is reused.
+
+Thresholds (env):
+- SYNTHESIS_SCORE_DELTA  max per-agent score change still treated as noise
+- SYNTHESIS_COUNT_DELTA  max change in any item count still treated as noise
+- SYNTHESIS_MAX_AGE      seconds after which synthesis is redone regardless
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from cachetools import LRUCache
+
+SCORE_DELTA = float(os.getenv("SYNTHESIS_SCORE_DELTA", "2.5"))
+COUNT_DELTA = int(os.getenv("SYNTHESIS_COUNT_DELTA", "2"))
+MAX_AGE_S = float(os.getenv("SYNTHESIS_MAX_AGE", "900"))
+
+
+def _titles(items: List[Dict[str, Any]], key: str, n: int) -> List[str]:
+    return sorted(str(i.get(key) or "").strip().lower() for i in items[:n] if isinstance(i, dict))
+
+
+def extract_features(results: Dict[str, Dict[str, Any]], agent_status: Dict[str, str]) -> Dict[str, Any]:
+    """Normalize agent outputs down to what materially drives the synthesis."""
+    finint = results.get("finint") or {}
+    sigint = results.get("sigint") or {}
+    news = results.get("news") or {}
+    geoint = results.get("geoint") or {}
+    socmint = results.get("socmint") or {}
+
+    return {
+        "scores": {
+            "finint": float(finint.get("escalation_score", 0.0)),
+            "sigint": float(sigint.get("sigint_score", 0.0)),
+            "news": float(news.get("news_score", 0.0)),
+            "geoint": float(geoint.get("geoint_score", 0.0)),
+            "socmint": float(socmint.get("socmint_score", 0.0)),
+        },
+        "counts": {
+            "aircraft": len(sigint.get("aircraft") or []),
+            "ships": len(sigint.get("ships") or []),
+            "articles": len(news.get("articles") or []),
+            "anomalies": int(geoint.get("anomaly_count") or len(geoint.get("anomalies") or [])),
+            "signals": int(socmint.get("total_signals") or 0),
+            "markets": len(finint.get("polymarket") or []),
+        },
+        "sets": {
+            "headlines": _titles(news.get("articles") or [], "title", 5),
+            "hotspots": sorted(
+                f"{round(float(h.get('lat') or 0), 2)},{round(float(h.get('lon') or 0), 2)}"
+                for h in (geoint.get("hotspots") or [])[:3]
+                if isinstance(h, dict)
+            ),
+            "signals": sorted(str(s).strip().lower() for s in (socmint.get("top_signals") or [])[:3]),
+            "alerts": sorted(str(a) for a in (sigint.get("alerts") or [])[:5]),
+            "status": sorted(f"{k}:{v}" for k, v in agent_status.items() if v != "ok"),
+        },
+    }
+
+
+def fingerprint(features: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(features, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def material_change(previous: Dict[str, Any], current: Dict[str, Any]) -> str | None:
+    """Return the first reason the inputs changed materially, or None."""
+    for name, score in current["scores"].items():
+        if abs(score - previous["scores"].get(name, 0.0)) > SCORE_DELTA:
+            return f"{name} score moved"
+    for name, count in current["counts"].items():
+        if abs(count - previous["counts"].get(name, 0)) > COUNT_DELTA:
+            return f"{name} count moved"
+    for name, items in current["sets"].items():
+        if items != previous["sets"].get(name):
+            return f"{name} changed"
+    return None
+
+
+class SynthesisCache:
+    """Last synthesis per conflict, with the features it was computed from."""
+
+    def __init__(self, maxsize: int = 128):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+
+    def lookup(self, key: str, features: Dict[str, Any]) -> Tuple[Dict[str, Any] | None, Dict[str, Any]]:
+        """Return (reusable synthesis or None, metadata describing the decision)."""
+        meta: Dict[str, Any] = {"reused": False, "fingerprint": fingerprint(features)}
+        entry = self._entries.get(key)
+        if entry is None:
+            meta["reason"] = "no previous synthesis"
+            return None, meta
+
+        age = time.time() - entry["at"]
+        reason = material_change(entry["features"], features)
+        if reason is None and age > MAX_AGE_S:
+            reason = "previous synthesis expired"
+        if reason is not None:
+            meta["reason"] = reason
+            return None, meta
+
+        meta.update({
+            "reused": True,
+            "reason": "inputs unchanged",
+            "reused_fingerprint": entry["fingerprint"],
+            "age_s": round(age, 1),
+        })
+        return entry["synthesis"], meta
+
+    def store(self, key: str, features: Dict[str, Any], synthesis: Dict[str, Any]) -> None:
+        self._entries[key] = {
+            "at": time.time(),
+            "features": features,
+            "fingerprint": fingerprint(features),
+            "synthesis": synthesis,
+        }
@@ -0,0 +1,92 @@
+"""
+Classifiers – prebuilt SIGINT lookup tables for aircraft and vessels.
+
+The callsign prefixes and the surveillance / tanker type names are each
+compiled once at import into one alternation, replacing a Python-level
+`any(...)` over the lists per record. The rules are the ones SIGINT always
+applied: a military callsign is a tanker if its type names one, otherwise
+transport; without one, the type decides. benchmarks/bench_classifier.py
+checks that the results stay identical to the per-record loops.
+
+Results are cached per (callsign, type), so a busy feed only pays for the
+airframes it has not seen yet. Vessel keywords are one compiled alternation
+over the lowercased fields, also cached per (name, type).
+"""
+import re
+from functools import lru_cache
+
+MILITARY_CALLSIGNS = [
+    "RCH",
+    "USAF",
+    "NAVY",
+    "DUKE",
+    "REACH",
+    "JAKE",
+    "EVAC",
+    "GTMO",
+    "SAM",
+    "AIR1",
+    "AIR2",
+]
+
+SURVEILLANCE_TYPES = [
+    "RC-135",
+    "E-3",
+    "E-8",
+    "P-8",
+    "EP-3",
+    "RQ-4",
+    "MQ-9",
+    "U-2",
+    "E-6",
+]
+
+TANKER_TYPES = [
+    "KC-135",
+    "KC-10",
+    "KC-46",
+]
+
+_CALLSIGN_RE = re.compile("|".join(re.escape(p) for p in sorted(MILITARY_CALLSIGNS, key=len, reverse=True)))
+_SURVEILLANCE_RE = re.compile("|".join(re.escape(t) for t in SURVEILLANCE_TYPES))
+_TANKER_RE = re.compile("|".join(re.escape(t) for t in TANKER_TYPES))
+
+WARSHIP_KEYWORDS = [
+    "warship",
+    "military",
+    "destroyer",
+    "frigate",
+    "corvette",
+    "carrier",
+    "aircraft carrier",
+    "navy",
+    "patrol boat",
+    "patrol vessel",
+]
+# Common hull prefixes (case-sensitive, anywhere in the name)
+HULL_PREFIXES = ["USS ", "HMS ", "FS ", "FREMM "]
+
+# Keywords are lowercase; inputs are lowercased once (cheaper than re.IGNORECASE)
+_WARSHIP_RE = re.compile("|".join(re.escape(k) for k in WARSHIP_KEYWORDS))
+_HULL_RE = re.compile("|".join(re.escape(p) for p in HULL_PREFIXES))
+
+CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def classify_aircraft(callsign: str, ac_type: str) -> str | None:
+    """Category of one airframe, or None if it is not military-relevant."""
+    type_upper = ac_type.upper()
+    if _CALLSIGN_RE.match(callsign.upper()):
+        # Callsigns like RCH, REACH, etc are usually transport or tanker
+        return "tanker" if _TANKER_RE.search(type_upper) else "transport"
+    if _SURVEILLANCE_RE.search(type_upper):
+        return "surveillance"
+    if _TANKER_RE.search(type_upper):
+        return "tanker"
+    return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def is_warship(name: str, ship_type: str) -> bool:
+    return bool(_WARSHIP_RE.search(name.lower()) or _WARSHIP_RE.search(ship_type.lower()) or _HULL_RE.search(name))
@@ -0,0 +1,138 @@
+"""
+Collectors – background pollers for high-rate feeds.
+
+Agents register a poll function per feed (ADS-B, vessels, ...). The FastAPI
+lifespan starts one task per registered collector; each polls on its own
+cadence and publishes the latest normalized snapshot to SNAPSHOTS. Agents
+read the snapshot instead of fetching, so analysis latency excludes network
+latency and polling frequency is independent of how many conflicts or
+clients are served.
+
+A failed poll keeps the previous snapshot; readers fall back to fetching
+themselves when the snapshot is missing or older than three poll periods
+(e.g. scripts running without the lifespan). A poll that outlasts its
+interval – a rate-limited upstream shared by several feeds – stretches
+the period, so slow feeds are not mistaken for stalled ones. A collector may be given an
+`active()` check and then idles while nobody asks for its feed.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+
+class SnapshotStore:
+    def __init__(self):
+        self._snapshots: Dict[str, Tuple[float, Any]] = {}
+
+    def publish(self, name: str, value: Any) -> None:
+        self._snapshots[name] = (time.time(), value)
+
+    def latest(self, name: str, max_age: float) -> Tuple[Any, float] | None:
+        """(value, age in seconds) if a snapshot no older than `max_age` exists."""
+        entry = self._snapshots.get(name)
+        if entry is None:
+            return None
+        age = time.time() - entry[0]
+        return (entry[1], age) if age <= max_age else None
+
+    def age(self, name: str) -> float | None:
+        entry = self._snapshots.get(name)
+        return None if entry is None else time.time() - entry[0]
+
+
+SNAPSHOTS = SnapshotStore()
+
+
+class Collector:
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        poll: Callable[[], Awaitable[Any]],
+        active: Callable[[], bool] | None = None,
+    ):
+        self.name = name
+        self.interval = interval
+        self.poll = poll
+        self.active = active
+        self.task: asyncio.Task | None = None
+        # max(interval, duration of the last poll)
+        self.period = interval
+        self.stats: Dict[str, Any] = {"polls": 0, "errors": 0, "last_error": None, "last_duration_s": None}
+
+    @property
+    def max_age(self) -> float:
+        """Snapshots older than this mean the poller is not keeping up."""
+        return self.period * 3
+
+    async def run(self) -> None:
+        while True:
+            if self.active is not None and not self.active():
+                await asyncio.sleep(self.interval)
+                continue
+            started = time.monotonic()
+            try:
+                SNAPSHOTS.publish(self.name, await self.poll())
+                self.stats["polls"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.stats["last_error"] = str(e)
+                print(f"[COLLECTOR] {self.name} poll failed: {e}")
+            elapsed = time.monotonic() - started
+            self.stats["last_duration_s"] = round(elapsed, 3)
+            self.period = max(self.interval, elapsed)
+            await asyncio.sleep(max(self.interval - elapsed, 0.0))
+
+
+_COLLECTORS: Dict[str, Collector] = {}
+
+
+def register_collector(
+    name: str,
+    interval: float,
+    poll: Callable[[], Awaitable[Any]],
+    active: Callable[[], bool] | None = None,
+) -> Collector:
+    """Register `poll()` to run every `interval` seconds (while `active()`) once collectors start."""
+    collector = _COLLECTORS[name] = Collector(name, interval, poll, active)
+    return collector
+
+
+def latest_snapshot(name: str) -> Tuple[Any, float] | None:
+    """Fresh (value, age) from the named collector, or None to fetch directly."""
+    collector = _COLLECTORS.get(name)
+    if collector is None or collector.task is None:
+        return None
+    return SNAPSHOTS.latest(name, collector.max_age)
+
+
+def start_collectors() -> None:
+    for collector in _COLLECTORS.values():
+        if collector.task is None or collector.task.done():
+            collector.task = asyncio.create_task(collector.run(), name=f"collector:{collector.name}")
+
+
+async def stop_collectors() -> None:
+    tasks: List[asyncio.Task] = []
+    for collector in _COLLECTORS.values():
+        if collector.task is not None:
+            collector.task.cancel()
+            tasks.append(collector.task)
+            collector.task = None
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def collector_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        name: {
+            **c.stats,
+            "interval_s": c.interval,
+            "period_s": round(c.period, 3),
+            "running": c.task is not None and not c.task.done(),
+            "active": c.active is None or c.active(),
+            "snapshot_age_s": None if SNAPSHOTS.age(name) is None else round(SNAPSHOTS.age(name), 1),
+        }
+        for name, c in _COLLECTORS.items()
+    }
@@ -0,0 +1,209 @@
+"""
+Commodity Cache – shared daily commodity series with a local history.
+
+Alpha Vantage commodity series (BRENT, WTI, ...) gain one data point per
+trading day, so there is nothing to fetch until the next expected point can
+exist: the trading day after the latest stored date, once that day has
+closed (plus PUBLISH_LAG_H). Upstream publishes with a variable lag, so a
+check that does not bring the new point is not repeated until the next UTC
+day – every analysis of every conflict shares at most one upstream call per
+series per day.
+
+Requests go through a token bucket sized to the API quota. A throttled
+response ("Note" / "Information" payload) drains the bucket for a minute and
+the stored history is served instead. History is merged by date, capped at
+HISTORY_POINTS and, with COMMODITY_CACHE_DIR set, persisted as one JSON file
+per series so a restarted worker neither loses it nor re-fetches.
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from .rate_limit import TokenBucket
+from .singleflight import SingleFlight
+
+# Alpha Vantage free tier: 5 requests per minute
+RATE_PER_MIN = float(os.getenv("ALPHAVANTAGE_PER_MIN", "5"))
+# Hours after a trading day's close before its value is expected upstream
+PUBLISH_LAG_H = float(os.getenv("COMMODITY_PUBLISH_LAG_H", "0"))
+# Retry delay after a failed or throttled fetch
+RETRY_S = float(os.getenv("COMMODITY_RETRY", "900"))
+HISTORY_POINTS = int(os.getenv("COMMODITY_HISTORY_POINTS", "1000"))
+THROTTLE_PAUSE_S = 60.0
+
+# fetch(function) → raw Alpha Vantage payload
+Fetch = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+def _safe_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _next_trading_day(day: date) -> date:
+    day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def _expected_at(day: date) -> datetime:
+    """When the value for trading day `day` should be available upstream."""
+    close = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(days=1)
+    return close + timedelta(hours=PUBLISH_LAG_H)
+
+
+class _Series:
+    __slots__ = ("points", "checked", "retry_at", "stats")
+
+    def __init__(self):
+        # date (ISO) → value, newest first once sorted
+        self.points: Dict[str, float] = {}
+        # (expected trading day, UTC day it was checked) of the last upstream call
+        self.checked: Tuple[str, str] | None = None
+        self.retry_at = 0.0
+        self.stats: Dict[str, Any] = {"calls": 0, "new_points": 0, "throttled": 0, "errors": 0, "last_error": None}
+
+    def latest(self) -> date | None:
+        return date.fromisoformat(max(self.points)) if self.points else None
+
+    def expected(self) -> date | None:
+        latest = self.latest()
+        return None if latest is None else _next_trading_day(latest)
+
+    def payload(self) -> Dict[str, Any]:
+        """Alpha Vantage-shaped payload, newest first."""
+        return {
+            "interval": "daily",
+            "data": [{"date": d, "value": str(self.points[d])} for d in sorted(self.points, reverse=True)],
+        }
+
+
+class CommodityCache:
+    def __init__(self, fetch: Fetch, root: str | None = None, rate_per_min: float = RATE_PER_MIN):
+        self.root = root
+        self._fetch = fetch
+        self._series: Dict[str, _Series] = {}
+        self._flight = SingleFlight()
+        self.governor = TokenBucket(rate_per_min / 60.0, capacity=max(rate_per_min, 1.0))
+
+    async def series(self, function: str) -> Dict[str, Any]:
+        """Daily series for `function` (e.g. "BRENT"), refreshed only when a new point is due."""
+        if function not in self._series:
+            await self._flight.do(("load", function), lambda: self._load(function))
+        s = self._series[function]
+        if self._due(s):
+            await self._flight.do(function, lambda: self._refresh(function, s))
+        return s.payload()
+
+    def _due(self, s: _Series) -> bool:
+        now = time.time()
+        if now < s.retry_at:
+            return False
+        expected = s.expected()
+        if expected is None:
+            return True
+        if now < _expected_at(expected).timestamp():
+            return False
+        today = datetime.fromtimestamp(now, tz=timezone.utc).date().isoformat()
+        return s.checked != (expected.isoformat(), today)
+
+    async def _refresh(self, function: str, s: _Series) -> None:
+        expected = s.expected()
+        await self.governor.acquire()
+        s.stats["calls"] += 1
+        try:
+            data = await self._fetch(function)
+        except Exception as e:
+            s.stats["errors"] += 1
+            s.stats["last_error"] = str(e)
+            s.retry_at = time.time() + RETRY_S
+            print(f"[COMMODITY] {function} fetch failed, serving {len(s.points)} stored points: {e}")
+            return
+
+        rows = data.get("data") if isinstance(data, dict) else None
+        if not isinstance(rows, list):
+            # Throttled responses come back as 200 with a "Note"/"Information" body
+            message = data.get("Note") or data.get("Information") or data.get("Error Message") if isinstance(data, dict) else None
+            s.stats["throttled"] += 1
+            s.stats["last_error"] = message
+            s.retry_at = time.time() + max(RETRY_S, THROTTLE_PAUSE_S)
+            self.governor.pause(THROTTLE_PAUSE_S)
+            print(f"[COMMODITY] {function} throttled, serving {len(s.points)} stored points: {message}")
+            return
+
+        before = len(s.points)
+        for row in rows:
+            day = str(row.get("date") or row.get("timestamp") or "")
+            value = _safe_float(row.get("value") or row.get("price"))
+            # Holidays come through as "."
+            if day and value is not None:
+                s.points[day] = value
+        if len(s.points) > HISTORY_POINTS:
+            for day in sorted(s.points)[: len(s.points) - HISTORY_POINTS]:
+                del s.points[day]
+        s.stats["new_points"] += max(len(s.points) - before, 0)
+
+        # On a cold start the point just looked for is the one after the fetched history
+        expected = expected or s.expected()
+        if expected is None:
+            s.retry_at = time.time() + RETRY_S
+        else:
+            s.checked = (expected.isoformat(), datetime.now(timezone.utc).date().isoformat())
+            s.retry_at = 0.0
+        if self.root:
+            await asyncio.to_thread(self._persist, function, s)
+
+    # ── Disk tier ──────────────────────────────────────────────────────────
+
+    def _path(self, function: str) -> str:
+        return os.path.join(self.root or "", f"{function.lower()}.json")
+
+    async def _load(self, function: str) -> None:
+        s = _Series()
+        if self.root:
+            stored = await asyncio.to_thread(self._read, function)
+            if stored is not None:
+                s.points = {d: float(v) for d, v in stored.get("points", {}).items()}
+                checked = stored.get("checked")
+                s.checked = tuple(checked) if checked else None
+        self._series[function] = s
+
+    def _read(self, function: str) -> Dict[str, Any] | None:
+        try:
+            with open(self._path(function), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _persist(self, function: str, s: _Series) -> None:
+        os.makedirs(self.root or "", exist_ok=True)
+        path = self._path(function)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"function": function, "checked": s.checked, "points": s.points}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[COMMODITY] Could not persist {function}: {e}")
+
+    # ── Stats ──────────────────────────────────────────────────────────────
+
+    def snapshot(self) -> Dict[str, Any]:
+        series: Dict[str, Any] = {}
+        for function, s in self._series.items():
+            expected = s.expected()
+            series[function] = {
+                **s.stats,
+                "points": len(s.points),
+                "latest": None if s.latest() is None else s.latest().isoformat(),
+                "next_expected": None if expected is None else expected.isoformat(),
+                "due_after": None if expected is None else _expected_at(expected).isoformat(),
+                "last_checked": None if s.checked is None else s.checked[1],
+            }
+        return {"governor": self.governor.stats, "series": series}
@@ -0,0 +1,173 @@
+"""
+Compaction – token-budgeted digest of agent outputs for the supervisor prompt.
+
+Raw agent results grow with world activity (every FIRMS anomaly, every
+aircraft, every post). The supervisor only needs scores, aggregates and the
+most relevant items, so each agent is reduced to a ranked top-K digest plus
+histograms. K is lowered until the serialized payload fits the token budget;
+a payload that already fits is sent as is, since digests carry fixed
+overhead (histograms, counts) that can outweigh a handful of raw items.
+"""
+import json
+import os
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+TOKEN_BUDGET = int(os.getenv("SUPERVISOR_TOKEN_BUDGET", "3000"))
+TOP_K_STEPS = (10, 5, 3, 1)
+TEXT_LIMIT = 160
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for JSON-heavy English payloads
+    return (len(text) + 3) // 4
+
+
+def _histogram(items: List[Dict[str, Any]], key: str) -> Dict[str, int]:
+    return dict(Counter(str(i.get(key) or "unknown") for i in items if isinstance(i, dict)))
+
+
+def _clip(text: Any) -> str:
+    text = str(text or "")
+    return text if len(text) <= TEXT_LIMIT else text[:TEXT_LIMIT - 1] + "…"
+
+
+def _status(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: result[k] for k in ("stale", "stale_age_s", "missing") if k in result}
+
+
+# ── Per-agent digests ──────────────────────────────────────────────────────
+
+def _digest_finint(r: Dict[str, Any], k: int) -> Dict[str, Any]:
+    markets = sorted(r.get("polymarket") or [], key=lambda m: m.get("probability", 0.0), reverse=True)
+    return {
+        **_status(r),
+        "escalation_score": r.get("escalation_score"),
+        "brent": r.get("brent"),
+        "wti": r.get("wti"),
+        "polymarket": [{"question": _clip(m.get("question")), "probability": m.get("probability")} for m in markets[:k]],
+        "summary": _clip(r.get("summary")),
+    }
+
+
+_AIRCRAFT_PRIORITY = {"surveillance": 0, "tanker": 1, "transport": 2}
+
+
+def _digest_sigint(r: Dict[str, Any], k: int) -> Dict[str, Any]:
+    aircraft = sorted(r.get("aircraft") or [], key=lambda a: _AIRCRAFT_PRIORITY.get(a.get("category"), 9))
+    ships = r.get("ships") or []
+    return {
+        **_status(r),
+        "region": r.get("region"),
+        "sigint_score": r.get("sigint_score"),
+        "aircraft_count": len(r.get("aircraft") or []),
+        "aircraft_by_category": _histogram(aircraft, "category"),
+        "aircraft": [{"callsign": a.get("callsign"), "type": a.get("type"), "category": a.get("category")} for a in aircraft[:k]],
+        "ship_count": len(ships),
+        "ships": [{"name": s.get("name"), "type": s.get("type")} for s in ships[:k]],
+        "alerts": (r.get("alerts") or [])[:k],
+        "summary": _clip(r.get("summary")),
+    }
+
+
+def _digest_news(r: Dict[str, Any], k: int) -> Dict[str, Any]:
+    articles = r.get("articles") or []
+    ranked = sorted(articles, key=lambda a: abs(a.get("sentiment_score") or 0.0), reverse=True)
+    return {
+        **_status(r),
+        "news_score": r.get("news_score"),
+        "overall_sentiment": r.get("overall_sentiment"),
+        "sentiment_label": r.get("sentiment_label"),
+        "article_count": len(articles),
+        "articles_by_label": _histogram(articles, "sentiment_label"),
+        "top_sources": (r.get("top_sources") or [])[:k],
+        "articles": [
+            {"title": _clip(a.get("title")), "source": a.get("source"), "label": a.get("sentiment_label")}
+            for a in ranked[:k]
+        ],
+    }
+
+
+def _digest_geoint(r: Dict[str, Any], k: int) -> Dict[str, Any]:
+    anomalies = [a for a in (r.get("anomalies") or []) if isinstance(a, dict)]
+    hotspots = r.get("hotspots") or sorted(anomalies, key=lambda a: a.get("frp") or 0.0, reverse=True)
+    return {
+        **_status(r),
+        "geoint_score": r.get("geoint_score"),
+        "anomaly_count": r.get("anomaly_count", len(anomalies)),
+        "pixel_count": r.get("pixel_count"),
+        "high_confidence_count": r.get("high_confidence_count"),
+        "trend": r.get("trend"),
+        "anomalies_by_type": _histogram(anomalies, "type"),
+        "anomalies_by_confidence": _histogram(anomalies, "confidence"),
+        "hotspots": [
+            {key: h.get(key) for key in ("lat", "lon", "frp", "pixels", "type", "confidence", "acquired") if key in h}
+            for h in hotspots[:k]
+        ],
+        "summary": _clip(r.get("summary")),
+    }
+
+
+def _digest_socmint(r: Dict[str, Any], k: int) -> Dict[str, Any]:
+    posts = [
+        p for key in ("telegram_posts", "reddit_posts", "rss_articles")
+        for p in (r.get(key) or []) if isinstance(p, dict)
+    ]
+    ranked = sorted(posts, key=lambda p: abs(p.get("sentiment_score") or 0.0), reverse=True)
+    return {
+        **_status(r),
+        "socmint_score": r.get("socmint_score"),
+        "total_signals": r.get("total_signals"),
+        "escalatory_count": r.get("escalatory_count"),
+        "de_escalatory_count": r.get("de_escalatory_count"),
+        "overall_sentiment": r.get("overall_sentiment"),
+        "posts_by_platform": _histogram(posts, "platform"),
+        "top_signals": [_clip(s) for s in (r.get("top_signals") or [])[:k]],
+        "posts": [
+            {"source": p.get("source"), "text": _clip(p.get("title") or p.get("text")), "label": p.get("sentiment_label")}
+            for p in ranked[:k]
+        ],
+        "summary": _clip(r.get("summary")),
+    }
+
+
+DIGESTS = {
+    "finint": _digest_finint,
+    "sigint": _digest_sigint,
+    "news": _digest_news,
+    "geoint": _digest_geoint,
+    "socmint": _digest_socmint,
+}
+
+
+def compact_payload(payload: Dict[str, Any], budget: int = TOKEN_BUDGET) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Replace each agent's raw result in `payload` with its digest, lowering
+    top-K until the serialized payload fits `budget` tokens. A payload that
+    already fits is returned unchanged (top_k None in the stats).
+
+    Returns (compact payload, size stats).
+    """
+    raw_json = json.dumps(payload, default=str)
+
+    compact: Dict[str, Any] = payload
+    compact_json = raw_json
+    top_k: int | None = None
+    if estimate_tokens(raw_json) > budget:
+        for top_k in TOP_K_STEPS:
+            compact = {
+                key: DIGESTS[key](value or {}, top_k) if key in DIGESTS else value
+                for key, value in payload.items()
+            }
+            compact_json = json.dumps(compact, default=str)
+            if estimate_tokens(compact_json) <= budget:
+                break
+
+    stats = {
+        "raw_bytes": len(raw_json),
+        "compact_bytes": len(compact_json),
+        "raw_tokens_est": estimate_tokens(raw_json),
+        "compact_tokens_est": estimate_tokens(compact_json),
+        "top_k": top_k,
+        "budget": budget,
+    }
+    return compact, stats
@@ -2,7 +2,11 @@ import asyncio
 import os
 from typing import Any, Dict, List, Tuple
 
-import httpx
+from .collectors import latest_snapshot, register_collector
+from .commodity_cache import CommodityCache
+from .http_pool import get_http_pool, run_with_pool
+from .polymarket_sync import REFRESH_S as POLYMARKET_REFRESH_S, MarketCatalog
+from .regions import CONFLICT_KEYWORDS, conflict_region
 
 
 ALPHAVANTAGE_URL = "https://www.alphavantage.co/query"
@@ -38,17 +42,21 @@ def _format_pct(change: float | None) -> str:
     return f"{change:+.1f}%"
 
 
-async def _fetch_alpha_series(client: httpx.AsyncClient, function: str, api_key: str) -> Dict[str, Any]:
+async def _fetch_alpha_series(function: str) -> Dict[str, Any]:
     params = {
         "function": function,
         "interval": "daily",
-        "apikey": api_key,
+        "apikey": os.getenv("ALPHAVANTAGE_API_KEY"),
     }
-    resp = await client.get(ALPHAVANTAGE_URL, params=params)
+    resp = await get_http_pool().client("alphavantage").get(ALPHAVANTAGE_URL, params=params)
     resp.raise_for_status()
     return resp.json()
 
 
+# Daily BRENT / WTI history shared by every conflict, refreshed once a new point is due
+COMMODITIES = CommodityCache(_fetch_alpha_series, root=os.getenv("COMMODITY_CACHE_DIR") or None)
+
+
 def _parse_alpha_series(data: Dict[str, Any]) -> Tuple[str, float | None, float | None]:
     """
     Parse Alpha Vantage commodities payload.
@@ -73,8 +81,8 @@ def _parse_alpha_series(data: Dict[str, Any]) -> Tuple[str, float | None, float
     return as_of, latest_price, change_pct
 
 
-async def _fetch_polymarket_markets(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
-    resp = await client.get(POLYMARKET_MARKETS_URL, params={"limit": 100})
+async def _fetch_polymarket_page(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    resp = await get_http_pool().client("polymarket").get(POLYMARKET_MARKETS_URL, params=params)
     resp.raise_for_status()
     data = resp.json()
     if isinstance(data, list):
@@ -84,59 +92,37 @@ async def _fetch_polymarket_markets(client: httpx.AsyncClient) -> List[Dict[str,
     return []
 
 
-def _market_matches_keywords(question: str) -> bool:
-    q_lower = question.lower()
-    return any(keyword in q_lower for keyword in POLYMARKET_KEYWORDS)
-
-
-def _extract_probability(market: Dict[str, Any]) -> float:
-    prices = market.get("outcomePrices") or market.get("prices") or []
-    if not isinstance(prices, list):
-        prices = [prices]
+# Full active-market catalog, indexed by POLYMARKET_KEYWORDS and every conflict keyword
+POLYMARKET = MarketCatalog(
+    _fetch_polymarket_page,
+    POLYMARKET_KEYWORDS + [k for keywords in CONFLICT_KEYWORDS.values() for k in keywords],
+)
+register_collector("polymarket", POLYMARKET_REFRESH_S, POLYMARKET.sync)
 
-    probs: List[float] = []
-    for p in prices:
-        val = _safe_float(p)
-        if val is not None:
-            probs.append(val)
 
-    if not probs:
-        return 0.0
-
-    # Use the highest outcome price as the implied conflict probability
-    return max(probs)
-
-
-def _extract_volume(market: Dict[str, Any]) -> float:
-    for key in ("volume", "volume24hr", "volume24h", "liquidity"):
-        if key in market:
-            val = _safe_float(market[key])
-            if val is not None:
-                return val
-    return 0.0
+async def _polymarket_catalog() -> MarketCatalog:
+    """Catalog kept fresh by the collector, or synced here when no collector runs."""
+    if latest_snapshot("polymarket") is not None:
+        return POLYMARKET
+    try:
+        return await POLYMARKET.sync()
+    except Exception as e:
+        if not POLYMARKET.synced:
+            raise
+        print(f"[FININT] Polymarket sync failed, using catalog from {POLYMARKET.age():.0f}s ago: {e}")
+        return POLYMARKET
 
 
 def _prepare_polymarket(markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    relevant: List[Dict[str, Any]] = []
-    for m in markets:
-        question = m.get("question") or m.get("title") or m.get("name")
-        if not isinstance(question, str):
-            continue
-        if not _market_matches_keywords(question):
-            continue
-
-        probability = _extract_probability(m)
-        if probability == 0.0:
-            continue
-        volume = _extract_volume(m)
-
-        relevant.append(
-            {
-                "question": question,
-                "probability": probability,
-                "volume": volume,
-            }
-        )
+    relevant = [
+        {
+            "question": m["question"],
+            "probability": m["probability"],
+            "volume": m["volume"],
+        }
+        for m in markets
+        if m["probability"] != 0.0
+    ]
 
     # Sort by volume descending, then probability descending, and take top 5
     relevant.sort(key=lambda x: (x["volume"], x["probability"]), reverse=True)
@@ -207,17 +193,15 @@ def _build_summary(
     return " ".join([brent_part, wti_part, markets_part, score_part])
 
 
-async def _run_finint_agent_async(conflict: str) -> Dict[str, Any]:  # conflict kept for compatibility
-    api_key = os.getenv("ALPHAVANTAGE_API_KEY")
-    if not api_key:
+async def arun_finint_agent(conflict: str) -> Dict[str, Any]:
+    if not os.getenv("ALPHAVANTAGE_API_KEY"):
         raise RuntimeError("ALPHAVANTAGE_API_KEY is not set")
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        brent_data, wti_data, polymarket_raw = await asyncio.gather(
-            _fetch_alpha_series(client, "BRENT", api_key),
-            _fetch_alpha_series(client, "WTI", api_key),
-            _fetch_polymarket_markets(client),
-        )
+    brent_data, wti_data, catalog = await asyncio.gather(
+        COMMODITIES.series("BRENT"),
+        COMMODITIES.series("WTI"),
+        _polymarket_catalog(),
+    )
 
     # Parse Brent
     brent_as_of, brent_price, brent_change_pct = _parse_alpha_series(brent_data)
@@ -235,8 +219,9 @@ async def _run_finint_agent_async(conflict: str) -> Dict[str, Any]:  # conflict
         "as_of": wti_as_of,
     }
 
-    # Polymarket
-    polymarket_struct = _prepare_polymarket(polymarket_raw)
+    # Polymarket: index hits for the standing keywords plus the conflict's own
+    terms = POLYMARKET_KEYWORDS + CONFLICT_KEYWORDS[conflict_region(conflict)]
+    polymarket_struct = _prepare_polymarket(catalog.lookup(terms))
 
     # Escalation score
     escalation_score = _compute_escalation_score(brent_change_pct, polymarket_struct)
@@ -253,13 +238,22 @@ async def _run_finint_agent_async(conflict: str) -> Dict[str, Any]:  # conflict
     }
 
 
+def polymarket_stats() -> Dict[str, Any]:
+    return POLYMARKET.snapshot()
+
+
+def commodity_stats() -> Dict[str, Any]:
+    return COMMODITIES.snapshot()
+
+
 def run_finint_agent(conflict: str) -> Dict[str, Any]:
     """
     Public sync entrypoint for the FININT agent.
 
-    Uses async httpx under the hood but exposes a synchronous API
-    for compatibility with existing supervisor code.
+    Runs arun_finint_agent on a private event loop; for callers that are
+    not already inside one (scripts, tests). The supervisor awaits
+    arun_finint_agent directly.
     """
-    return asyncio.run(_run_finint_agent_async(conflict))
+    return run_with_pool(arun_finint_agent, conflict)
 
 
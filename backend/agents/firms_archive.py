@@ -0,0 +1,209 @@
+"""
+FIRMS Archive – incremental local store of FIRMS detections.
+
+Detections are partitioned by region and UTC acquisition day. Each partition
+is a directory of .npy columns (lat, lon, frp, conf, acq – see
+firms_columnar) under FIRMS_ARCHIVE_DIR, opened memory-mapped and sorted by
+acquisition time. Past days never change, so they are written once; a
+refresh only rewrites the partitions that received new rows (normally just
+today's). Without FIRMS_ARCHIVE_DIR the partitions live in memory only.
+
+A refresh requests FIRMS days from the region's watermark (last acquisition
+time seen) onward and keeps only rows newer than it. A small overlap covers
+passes FIRMS processes late; overlapping rows are deduplicated.
+
+Window queries (rolling, e.g. the last 24h whatever the UTC day) and trends
+(last 24h vs. the 7-day baseline) are local binary searches and scans.
+"""
+import asyncio
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+
+from .firms_columnar import FirmsDetections
+from .singleflight import SingleFlight
+
+DAY_S = 86400
+# FIRMS area API: at most 10 days per request
+MAX_DAY_RANGE = 10
+BASELINE_DAYS = 7
+
+RETENTION_DAYS = int(os.getenv("FIRMS_ARCHIVE_RETENTION_DAYS", "30"))
+# Minimum seconds between upstream refreshes of one region
+REFRESH_S = float(os.getenv("FIRMS_ARCHIVE_REFRESH", "900"))
+# Re-request this many seconds before the watermark to catch late passes
+OVERLAP_S = int(os.getenv("FIRMS_ARCHIVE_OVERLAP", "3600"))
+
+# fetch(region, days, start) → detections for `days` UTC days from `start`
+Fetch = Callable[[str, int, date], Awaitable[FirmsDetections]]
+
+
+def _utc_day(epoch: float) -> date:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).date()
+
+
+def _sorted_unique(detections: FirmsDetections) -> FirmsDetections:
+    """Sort by acquisition time and drop rows repeated by overlapping fetches."""
+    ordered = detections.select(np.lexsort((detections.lon, detections.lat, detections.acq)))
+    keep = np.ones(len(ordered), dtype=bool)
+    keep[1:] = (
+        (ordered.acq[1:] != ordered.acq[:-1])
+        | (ordered.lat[1:] != ordered.lat[:-1])
+        | (ordered.lon[1:] != ordered.lon[:-1])
+    )
+    return ordered.select(keep)
+
+
+class FirmsArchive:
+    def __init__(self, fetch: Fetch, root: str | None = None):
+        self.root = root
+        self._fetch = fetch
+        # region → day → columns (memory-mapped when backed by disk)
+        self._partitions: Dict[str, Dict[date, FirmsDetections]] = {}
+        self._flight = SingleFlight(fresh_ttl=REFRESH_S)
+
+    # ── Refresh ────────────────────────────────────────────────────────────
+
+    async def sync(self, region: str) -> None:
+        """Pull detections newer than the region's watermark (at most every REFRESH_S)."""
+        await self._flight.do(region, lambda: self._sync(region))
+
+    async def _sync(self, region: str) -> None:
+        if region not in self._partitions:
+            self._partitions[region] = await asyncio.to_thread(self._open_region, region)
+        partitions = self._partitions[region]
+
+        today = _utc_day(time.time())
+        oldest = today - timedelta(days=RETENTION_DAYS - 1)
+        watermark = self.watermark(region)
+        if watermark:
+            since = watermark - OVERLAP_S
+            start = max(_utc_day(since), oldest)
+        else:
+            # Cold start: enough history for the baseline comparison
+            since = 0
+            start = max(today - timedelta(days=BASELINE_DAYS), oldest)
+
+        chunks = []
+        while start <= today:
+            days = min(MAX_DAY_RANGE, (today - start).days + 1)
+            chunks.append((days, start))
+            start += timedelta(days=days)
+        parts = await asyncio.gather(*(self._fetch(region, days, day) for days, day in chunks))
+
+        fetched = FirmsDetections.concat(parts)
+        fresh = fetched.select(fetched.acq > since)
+        updated: Dict[date, FirmsDetections] = {}
+        if len(fresh):
+            days_of = fresh.acq // DAY_S
+            for day_number in np.unique(days_of):
+                day = _utc_day(int(day_number) * DAY_S)
+                if day < oldest:
+                    continue
+                rows = fresh.select(days_of == day_number)
+                existing = partitions.get(day)
+                updated[day] = _sorted_unique(FirmsDetections.concat([existing, rows]) if existing is not None else rows)
+
+        expired = [day for day in partitions if day < oldest]
+        if self.root and (updated or expired):
+            updated = await asyncio.to_thread(self._persist, region, updated, expired)
+        for day in expired:
+            partitions.pop(day, None)
+        partitions.update(updated)
+
+    # ── Queries ────────────────────────────────────────────────────────────
+
+    def watermark(self, region: str) -> int:
+        """Latest acquisition epoch stored for the region (0 if none)."""
+        partitions = self._partitions.get(region) or {}
+        for day in sorted(partitions, reverse=True):
+            if len(partitions[day]):
+                return int(partitions[day].acq[-1])
+        return 0
+
+    def window(self, region: str, days: int = 1, now: float | None = None) -> FirmsDetections:
+        """Detections acquired in the last `days` × 24h – rolling, across day partitions."""
+        now = time.time() if now is None else now
+        start = now - max(days, 1) * DAY_S
+        first = _utc_day(start)
+        partitions = self._partitions.get(region) or {}
+        parts = []
+        for day in sorted(partitions):
+            if day >= first:
+                part = partitions[day]
+                # Partitions are sorted by acquisition time
+                lo = int(np.searchsorted(part.acq, start, "left"))
+                hi = int(np.searchsorted(part.acq, now, "right"))
+                parts.append(part if lo == 0 and hi == len(part) else part.select(slice(lo, hi)))
+        return FirmsDetections.concat(parts)
+
+    def count_between(self, region: str, start: float, end: float) -> int:
+        """Detections acquired in [start, end); binary search per sorted partition."""
+        total = 0
+        first, last = _utc_day(start), _utc_day(end)
+        for day, part in (self._partitions.get(region) or {}).items():
+            if first <= day <= last:
+                total += int(np.searchsorted(part.acq, end, "left") - np.searchsorted(part.acq, start, "left"))
+        return total
+
+    def trend(self, region: str, now: float | None = None) -> Dict[str, Any]:
+        """Last-24h detection count against the mean of the preceding BASELINE_DAYS days."""
+        now = time.time() if now is None else now
+        last_24h = self.count_between(region, now - DAY_S, now)
+        baseline = self.count_between(region, now - (BASELINE_DAYS + 1) * DAY_S, now - DAY_S) / BASELINE_DAYS
+        return {
+            "region": region,
+            "last_24h": last_24h,
+            "baseline_daily_mean": round(baseline, 1),
+            "ratio": round(last_24h / baseline, 2) if baseline else None,
+        }
+
+    # ── Disk partitions ────────────────────────────────────────────────────
+
+    def _day_dir(self, region: str, day: date) -> str:
+        return os.path.join(self.root or "", region, day.isoformat())
+
+    def _open_region(self, region: str) -> Dict[date, FirmsDetections]:
+        partitions: Dict[date, FirmsDetections] = {}
+        region_dir = os.path.join(self.root or "", region)
+        if not self.root or not os.path.isdir(region_dir):
+            return partitions
+        for name in sorted(os.listdir(region_dir)):
+            try:
+                day = date.fromisoformat(name)
+                partitions[day] = self._open_partition(self._day_dir(region, day))
+            except (OSError, ValueError) as e:
+                print(f"[FIRMS] Skipping partition {region}/{name}: {e}")
+        return partitions
+
+    def _open_partition(self, path: str) -> FirmsDetections:
+        columns = [np.load(os.path.join(path, f"{col}.npy"), mmap_mode="r") for col in FirmsDetections.__slots__]
+        if len({c.shape[0] for c in columns}) != 1:
+            raise ValueError("column lengths differ")
+        return FirmsDetections(*columns)
+
+    def _persist(
+        self, region: str, updated: Dict[date, FirmsDetections], expired: List[date],
+    ) -> Dict[date, FirmsDetections]:
+        for day in expired:
+            shutil.rmtree(self._day_dir(region, day), ignore_errors=True)
+
+        mapped: Dict[date, FirmsDetections] = {}
+        for day, part in updated.items():
+            path = self._day_dir(region, day)
+            os.makedirs(path, exist_ok=True)
+            try:
+                for col in FirmsDetections.__slots__:
+                    target = os.path.join(path, f"{col}.npy")
+                    with open(f"{target}.tmp", "wb") as f:
+                        np.save(f, np.ascontiguousarray(getattr(part, col)))
+                    os.replace(f"{target}.tmp", target)
+                mapped[day] = self._open_partition(path)
+            except (OSError, ValueError) as e:
+                print(f"[FIRMS] Could not write partition {region}/{day}: {e}")
+                mapped[day] = part
+        return mapped
@@ -0,0 +1,177 @@
+"""
+FIRMS Columnar – typed-array representation of NASA FIRMS detections.
+
+Detections are held as parallel NumPy columns (lat, lon, frp, confidence
+code, acquisition epoch) instead of one dict per row. Bbox masks, confidence
+bucketing, FRP classification and top-K are vectorized;
+dicts are only materialized for the rows an API response actually returns.
+"""
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+# Confidence codes (index into CONFIDENCE_LABELS)
+CONF_LOW, CONF_NOMINAL, CONF_HIGH = 0, 1, 2
+CONFIDENCE_LABELS = ("low", "nominal", "high")
+
+# Anomaly type codes (index into TYPE_LABELS)
+TYPE_UNKNOWN, TYPE_FIRE, TYPE_EXPLOSION = 0, 1, 2
+TYPE_LABELS = ("unknown", "fire", "explosion")
+
+FIRE_FRP = 100.0
+EXPLOSION_FRP = 1000.0
+
+_CONFIDENCE_CODES = {"H": CONF_HIGH, "HIGH": CONF_HIGH, "N": CONF_NOMINAL, "NOMINAL": CONF_NOMINAL, "L": CONF_LOW, "LOW": CONF_LOW}
+
+
+def frp_types(frp: np.ndarray) -> np.ndarray:
+    """FRP (MW) → anomaly type code."""
+    return np.where(
+        frp > EXPLOSION_FRP, TYPE_EXPLOSION,
+        np.where(frp >= FIRE_FRP, TYPE_FIRE, TYPE_UNKNOWN),
+    ).astype(np.int8)
+
+
+def label_counts(codes: np.ndarray, labels: Sequence[str]) -> Dict[str, int]:
+    counts = np.bincount(codes, minlength=len(labels))
+    return {label: int(counts[i]) for i, label in enumerate(labels)}
+
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, largest first."""
+    n = int(values.shape[0])
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        idx = np.argpartition(-values, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    return idx[np.argsort(-values[idx], kind="stable")]
+
+
+def confidence_code(raw: str | None) -> int:
+    """VIIRS letter codes (l/n/h) or MODIS percentages → confidence code."""
+    if raw is None:
+        return CONF_LOW
+    s = raw.strip().upper()
+    code = _CONFIDENCE_CODES.get(s)
+    if code is not None:
+        return code
+    try:
+        v = float(s)
+    except ValueError:
+        return CONF_LOW
+    return CONF_HIGH if v >= 80 else CONF_NOMINAL if v >= 40 else CONF_LOW
+
+
+@lru_cache(maxsize=64)
+def _day_epoch(acq_date: str) -> int:
+    return int(datetime.strptime(acq_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+def acquisition_epoch(acq_date: str, acq_time: str) -> int:
+    """FIRMS acq_date (YYYY-MM-DD) + acq_time (HHMM, UTC) → epoch seconds; 0 if unknown."""
+    try:
+        day = _day_epoch(acq_date.strip())
+    except ValueError:
+        return 0
+    t = acq_time.strip().zfill(4)
+    if len(t) != 4 or not t.isdigit():
+        return day
+    return day + int(t[:2]) * 3600 + int(t[2:]) * 60
+
+
+class DetectionBuilder:
+    """Accumulates parsed rows in typed buffers; no per-row Python objects."""
+
+    def __init__(self):
+        self._lat = array("d")
+        self._lon = array("d")
+        self._frp = array("d")
+        self._conf = array("b")
+        self._acq = array("q")
+
+    def append(self, lat: float, lon: float, frp: float, conf: int, acq: int) -> None:
+        self._lat.append(lat)
+        self._lon.append(lon)
+        self._frp.append(frp)
+        self._conf.append(conf)
+        self._acq.append(acq)
+
+    def build(self) -> "FirmsDetections":
+        return FirmsDetections(
+            np.frombuffer(self._lat, dtype=np.float64).copy(),
+            np.frombuffer(self._lon, dtype=np.float64).copy(),
+            np.frombuffer(self._frp, dtype=np.float64).copy(),
+            np.frombuffer(self._conf, dtype=np.int8).copy(),
+            np.frombuffer(self._acq, dtype=np.int64).copy(),
+        )
+
+
+class FirmsDetections:
+    __slots__ = ("lat", "lon", "frp", "conf", "acq")
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, frp: np.ndarray, conf: np.ndarray, acq: np.ndarray):
+        self.lat = lat
+        self.lon = lon
+        self.frp = frp
+        self.conf = conf
+        self.acq = acq
+
+    def __len__(self) -> int:
+        return int(self.lat.shape[0])
+
+    @classmethod
+    def empty(cls) -> "FirmsDetections":
+        return DetectionBuilder().build()
+
+    @classmethod
+    def concat(cls, parts: Sequence["FirmsDetections"]) -> "FirmsDetections":
+        if not parts:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(p, col) for p in parts]) for col in cls.__slots__))
+
+    # ── Vectorized queries ─────────────────────────────────────────────────
+
+    def bbox_mask(self, bbox: Dict[str, float]) -> np.ndarray:
+        return (
+            (self.lat >= bbox["lat_min"]) & (self.lat <= bbox["lat_max"])
+            & (self.lon >= bbox["lon_min"]) & (self.lon <= bbox["lon_max"])
+        )
+
+    def select(self, mask_or_index: np.ndarray) -> "FirmsDetections":
+        return FirmsDetections(*(getattr(self, col)[mask_or_index] for col in self.__slots__))
+
+    def types(self) -> np.ndarray:
+        return frp_types(self.frp)
+
+    def confidence_counts(self) -> Dict[str, int]:
+        return label_counts(self.conf, CONFIDENCE_LABELS)
+
+    def type_counts(self) -> Dict[str, int]:
+        return label_counts(self.types(), TYPE_LABELS)
+
+    def top_k(self, k: int) -> np.ndarray:
+        """Indices of the k highest-FRP detections, highest first."""
+        return top_k_indices(self.frp, k)
+
+    # ── Materialization ────────────────────────────────────────────────────
+
+    def to_dicts(self, index: Iterable[int] | np.ndarray | None = None) -> List[Dict[str, Any]]:
+        view = self if index is None else self.select(np.asarray(index, dtype=np.int64))
+        types = view.types()
+        acquired = np.datetime_as_string(view.acq.astype("datetime64[s]"), unit="m")
+        return [
+            {
+                "lat": float(view.lat[i]),
+                "lon": float(view.lon[i]),
+                "frp": float(view.frp[i]),
+                "confidence": CONFIDENCE_LABELS[view.conf[i]],
+                "type": TYPE_LABELS[types[i]],
+                "acquired": f"{acquired[i]}Z" if view.acq[i] else "",
+            }
+            for i in range(len(view))
+        ]
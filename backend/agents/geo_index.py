@@ -0,0 +1,238 @@
+"""
+Geo Index – grid spatial index and event clustering for FIRMS detections.
+
+GridIndex buckets points into a regular lat/lon grid. Keys are sorted so
+every grid row of a query box is one contiguous slice, which gives cheap
+bbox and radius queries.
+
+cluster_events links detections closer than GEOINT_CLUSTER_KM (adjacent
+VIIRS pixels of one fire or strike) and merges each connected group into an
+event with aggregated FRP, extent and first/last seen. Pair generation,
+union-find and the aggregation all run on NumPy arrays.
+"""
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .firms_columnar import (
+    CONFIDENCE_LABELS,
+    TYPE_LABELS,
+    FirmsDetections,
+    frp_types,
+    label_counts,
+    top_k_indices,
+)
+
+KM_PER_DEG = 111.32
+EARTH_RADIUS_KM = 6371.0
+# VIIRS I-band pixels are 375 m at nadir and up to ~800 m at the scan edge
+CLUSTER_KM = float(os.getenv("GEOINT_CLUSTER_KM", "1.0"))
+INDEX_CELL_DEG = float(os.getenv("GEOINT_INDEX_CELL_DEG", "0.25"))
+
+# Row stride of the packed (row, col) cell key
+_ROW = np.int64(1 << 32)
+
+
+def haversine_km(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> np.ndarray:
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate [start, stop) ranges → (owner index, position) arrays."""
+    counts = np.maximum(stops - starts, 0)
+    owners = np.repeat(np.arange(counts.shape[0]), counts)
+    offsets = np.cumsum(counts) - counts
+    positions = np.arange(int(counts.sum())) - np.repeat(offsets, counts) + np.repeat(starts, counts)
+    return owners, positions
+
+
+class GridIndex:
+    """Points bucketed into `cell`-sized grid cells, keys sorted row-major."""
+
+    def __init__(self, y: np.ndarray, x: np.ndarray, cell: float):
+        self.cell = cell
+        self.y = y
+        self.x = x
+        keys = self._key(np.floor(y / cell), np.floor(x / cell))
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    @classmethod
+    def from_detections(cls, detections: FirmsDetections, cell_deg: float = INDEX_CELL_DEG) -> "GridIndex":
+        return cls(np.asarray(detections.lat), np.asarray(detections.lon), cell_deg)
+
+    @staticmethod
+    def _key(row: np.ndarray, col: np.ndarray) -> np.ndarray:
+        return row.astype(np.int64) * _ROW + col.astype(np.int64)
+
+    def _candidates(self, y_min: float, y_max: float, x_min: float, x_max: float) -> np.ndarray:
+        rows = np.arange(np.floor(y_min / self.cell), np.floor(y_max / self.cell) + 1)
+        lo = np.searchsorted(self.keys, self._key(rows, np.full_like(rows, np.floor(x_min / self.cell))), "left")
+        hi = np.searchsorted(self.keys, self._key(rows, np.full_like(rows, np.floor(x_max / self.cell))), "right")
+        _, positions = _ranges(lo, hi)
+        return self.order[positions]
+
+    def bbox(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+        """Indices of points inside the box."""
+        idx = self._candidates(lat_min, lat_max, lon_min, lon_max)
+        y, x = self.y[idx], self.x[idx]
+        return np.sort(idx[(y >= lat_min) & (y <= lat_max) & (x >= lon_min) & (x <= lon_max)])
+
+    def radius(self, lat: float, lon: float, km: float) -> np.ndarray:
+        """Indices of points within `km` of (lat, lon)."""
+        dlat = km / KM_PER_DEG
+        dlon = km / (KM_PER_DEG * max(np.cos(np.radians(lat)), 1e-6))
+        idx = self._candidates(lat - dlat, lat + dlat, lon - dlon, lon + dlon)
+        return np.sort(idx[haversine_km(lat, lon, self.y[idx], self.x[idx]) <= km])
+
+
+# ── Clustering ─────────────────────────────────────────────────────────────
+
+def _neighbour_pairs(y: np.ndarray, x: np.ndarray, eps: float) -> Tuple[np.ndarray, np.ndarray]:
+    """All point pairs (a < b) within `eps`, found via a grid of eps-sized cells."""
+    grid = GridIndex(y, x, eps)
+    row = grid.keys // _ROW
+    col = grid.keys - row * _ROW
+    firsts, seconds = [], []
+    for dy in (-1, 0, 1):
+        lo = np.searchsorted(grid.keys, GridIndex._key(row + dy, col - 1), "left")
+        hi = np.searchsorted(grid.keys, GridIndex._key(row + dy, col + 1), "right")
+        owners, positions = _ranges(lo, hi)
+        # Positions are in sorted order; keep each unordered pair once
+        keep = positions > owners
+        firsts.append(owners[keep])
+        seconds.append(positions[keep])
+    a = grid.order[np.concatenate(firsts)]
+    b = grid.order[np.concatenate(seconds)]
+    close = (y[a] - y[b]) ** 2 + (x[a] - x[b]) ** 2 <= eps * eps
+    return a[close], b[close]
+
+
+def _components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Connected-component label (smallest member index) per point."""
+    labels = np.arange(n)
+    while a.shape[0]:
+        ra, rb = labels[a], labels[b]
+        pending = ra != rb
+        if not pending.any():
+            break
+        ra, rb = ra[pending], rb[pending]
+        low = np.minimum(ra, rb)
+        np.minimum.at(labels, ra, low)
+        np.minimum.at(labels, rb, low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return labels
+
+
+class FirmsEvents:
+    """Clustered detections; one row per event."""
+
+    __slots__ = (
+        "lat", "lon", "frp", "frp_max", "pixels", "conf",
+        "first_seen", "last_seen", "lat_min", "lat_max", "lon_min", "lon_max", "radius_km",
+    )
+
+    def __init__(self, **columns: np.ndarray):
+        for name in self.__slots__:
+            setattr(self, name, columns[name])
+
+    def __len__(self) -> int:
+        return int(self.lat.shape[0])
+
+    def types(self) -> np.ndarray:
+        # An event is as severe as its strongest pixel
+        return frp_types(self.frp_max)
+
+    def confidence_counts(self) -> Dict[str, int]:
+        return label_counts(self.conf, CONFIDENCE_LABELS)
+
+    def type_counts(self) -> Dict[str, int]:
+        return label_counts(self.types(), TYPE_LABELS)
+
+    def top_k(self, k: int) -> np.ndarray:
+        """Indices of the k events with the highest total FRP, highest first."""
+        return top_k_indices(self.frp, k)
+
+    def to_dicts(self, index: np.ndarray | None = None) -> List[Dict[str, Any]]:
+        idx = np.arange(len(self)) if index is None else np.asarray(index, dtype=np.int64)
+        types = self.types()
+        first = np.datetime_as_string(self.first_seen[idx].astype("datetime64[s]"), unit="m")
+        last = np.datetime_as_string(self.last_seen[idx].astype("datetime64[s]"), unit="m")
+        return [
+            {
+                "lat": round(float(self.lat[i]), 5),
+                "lon": round(float(self.lon[i]), 5),
+                "frp": round(float(self.frp[i]), 1),
+                "frp_max": float(self.frp_max[i]),
+                "pixels": int(self.pixels[i]),
+                "confidence": CONFIDENCE_LABELS[self.conf[i]],
+                "type": TYPE_LABELS[types[i]],
+                "acquired": f"{last[j]}Z" if self.last_seen[i] else "",
+                "first_seen": f"{first[j]}Z" if self.first_seen[i] else "",
+                "last_seen": f"{last[j]}Z" if self.last_seen[i] else "",
+                "extent": {
+                    "lat_min": float(self.lat_min[i]), "lat_max": float(self.lat_max[i]),
+                    "lon_min": float(self.lon_min[i]), "lon_max": float(self.lon_max[i]),
+                },
+                "radius_km": round(float(self.radius_km[i]), 2),
+            }
+            for j, i in enumerate(idx)
+        ]
+
+
+def cluster_events(detections: FirmsDetections, eps_km: float = CLUSTER_KM) -> Tuple[FirmsEvents, np.ndarray]:
+    """
+    Merge detections within `eps_km` of each other (transitively) into events.
+
+    Returns (events, event index per detection).
+    """
+    lat = np.asarray(detections.lat, dtype=np.float64)
+    lon = np.asarray(detections.lon, dtype=np.float64)
+    frp = np.asarray(detections.frp, dtype=np.float64)
+    n = lat.shape[0]
+
+    # Local equirectangular projection (km); fine at pixel-neighbour distances
+    y = lat * KM_PER_DEG
+    x = lon * KM_PER_DEG * np.cos(np.radians(lat))
+    a, b = _neighbour_pairs(y, x, eps_km)
+    _, event_of = np.unique(_components(n, a, b), return_inverse=True)
+    event_of = event_of.reshape(-1)
+
+    order = np.argsort(event_of, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(event_of[order]) != 0]) if n else np.empty(0, dtype=np.int64)
+
+    def reduce(ufunc: np.ufunc, values: Any) -> np.ndarray:
+        if not n:
+            return np.empty(0, dtype=np.asarray(values).dtype)
+        return ufunc.reduceat(np.asarray(values)[order], starts)
+
+    pixels = np.bincount(event_of, minlength=starts.shape[0])
+    weight = np.maximum(frp, 1e-3)
+    wsum = np.bincount(event_of, weights=weight, minlength=starts.shape[0])
+    c_lat = np.bincount(event_of, weights=lat * weight, minlength=starts.shape[0]) / np.maximum(wsum, 1e-12)
+    c_lon = np.bincount(event_of, weights=lon * weight, minlength=starts.shape[0]) / np.maximum(wsum, 1e-12)
+    spread = haversine_km(lat, lon, c_lat[event_of], c_lon[event_of])
+
+    events = FirmsEvents(
+        lat=c_lat,
+        lon=c_lon,
+        frp=np.bincount(event_of, weights=frp, minlength=starts.shape[0]),
+        frp_max=reduce(np.maximum, frp),
+        pixels=pixels,
+        conf=reduce(np.maximum, detections.conf).astype(np.int8),
+        first_seen=reduce(np.minimum, detections.acq).astype(np.int64),
+        last_seen=reduce(np.maximum, detections.acq).astype(np.int64),
+        lat_min=reduce(np.minimum, lat),
+        lat_max=reduce(np.maximum, lat),
+        lon_min=reduce(np.minimum, lon),
+        lon_max=reduce(np.maximum, lon),
+        radius_km=reduce(np.maximum, spread),
+    )
+    return events, event_of
@@ -1,27 +1,33 @@
 """
-GEOINT Agent – LangChain Tool-Calling Agent
-Detects thermal anomalies via NASA FIRMS in conflict regions.
+GEOINT Agent – NASA FIRMS thermal anomaly detection in conflict regions.
+
+Default (GEOINT_MODE=native) computes region, anomalies and the score
+directly in Python; GEOINT_NARRATIVE=1 adds a single Haiku call for the
+summary text. GEOINT_MODE=llm runs the original LangChain tool-calling loop.
 """
 import asyncio
 import csv
-import io
+import json
 import os
+from datetime import date
 from typing import Any, Dict, List
 
-import httpx
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 from langchain_core.tools import tool
 
+from .firms_archive import FirmsArchive
+from .firms_columnar import CONF_LOW, DetectionBuilder, FirmsDetections, acquisition_epoch, confidence_code
+from .geo_index import GridIndex, cluster_events
+from .http_pool import get_http_pool, run_with_pool
+from .regions import DEFAULT_REGION, REGIONS, conflict_region, point_region
+
 FIRMS_BASE = "https://firms.modaps.eosdis.nasa.gov/api/area/csv"
 
-# Region bounding boxes
-REGIONS = {
-    "middle_east": {"lat_min": 20, "lat_max": 40, "lon_min": 35, "lon_max": 65},
-    "eastern_europe": {"lat_min": 44, "lat_max": 55, "lon_min": 22, "lon_max": 40},
-    "east_asia": {"lat_min": 20, "lat_max": 45, "lon_min": 100, "lon_max": 130},
-    "africa": {"lat_min": -5, "lat_max": 25, "lon_min": 20, "lon_max": 45},
-}
+GEOINT_MODE = os.getenv("GEOINT_MODE", "native")
+GEOINT_NARRATIVE = os.getenv("GEOINT_NARRATIVE", "0") == "1"
+# Events returned per response (highest total FRP first); counts cover all of them
+MAX_ANOMALIES = int(os.getenv("GEOINT_MAX_ANOMALIES", "500"))
 
 
 def _safe_float(v: Any, default: float = 0.0) -> float:
@@ -31,35 +37,79 @@ def _safe_float(v: Any, default: float = 0.0) -> float:
         return default
 
 
-def _confidence(raw: Any) -> str:
-    if raw is None:
-        return "low"
-    s = str(raw).strip().upper()
-    if s in ("HIGH", "H"):
-        return "high"
-    if s in ("NOMINAL", "N"):
-        return "nominal"
-    try:
-        v = float(raw)
-        return "high" if v >= 80 else "nominal" if v >= 40 else "low"
-    except (TypeError, ValueError):
-        return "low"
+# ── Tools ──────────────────────────────────────────────────────────────────
+
+async def _fetch_firms_area(region: str, days: int, start: date) -> FirmsDetections:
+    """
+    Stream the FIRMS area CSV for the region's bbox into typed columns.
 
+    Covers `days` UTC days from `start`. Only the bbox is requested and each
+    line is split straight into the column buffers – no per-row dicts – so
+    memory stays proportional to the regional detection count rather than
+    the global one.
+    """
+    api_key = os.getenv("NASA_FIRMS_KEY")
+    if not api_key:
+        raise ValueError("NASA_FIRMS_KEY not set")
+    bbox = REGIONS.get(region, REGIONS[DEFAULT_REGION])
+    area = f"{bbox['lon_min']},{bbox['lat_min']},{bbox['lon_max']},{bbox['lat_max']}"
+    url = f"{FIRMS_BASE}/{api_key}/VIIRS_SNPP_NRT/{area}/{days}/{start.isoformat()}"
+
+    builder = DetectionBuilder()
+    async with get_http_pool().client("firms").stream("GET", url) as resp:
+        resp.raise_for_status()
+        lines = resp.aiter_lines()
+
+        header = next(csv.reader([await anext(lines, "")]), [])
+        cols = {name.strip(): i for i, name in enumerate(header)}
+        lat_i = cols.get("latitude", cols.get("lat"))
+        lon_i = cols.get("longitude", cols.get("lon"))
+        if lat_i is None or lon_i is None:
+            # FIRMS reports key/quota problems as a plain-text body
+            raise ValueError(f"Unexpected FIRMS response: {','.join(header)[:200]}")
+        frp_i, conf_i = cols.get("frp"), cols.get("confidence")
+        date_i, time_i = cols.get("acq_date"), cols.get("acq_time")
+        width = len(header)
+
+        async for line in lines:
+            fields = line.split(",")
+            if len(fields) < width:
+                continue
+            builder.append(
+                _safe_float(fields[lat_i]),
+                _safe_float(fields[lon_i]),
+                _safe_float(fields[frp_i]) if frp_i is not None else 0.0,
+                confidence_code(fields[conf_i]) if conf_i is not None else CONF_LOW,
+                acquisition_epoch(
+                    fields[date_i] if date_i is not None else "",
+                    fields[time_i] if time_i is not None else "",
+                ),
+            )
 
-def _classify(frp: float) -> str:
-    if frp > 1000:
-        return "explosion"
-    if frp >= 100:
-        return "fire"
-    return "unknown"
+    detections = builder.build()
+    return detections.select(detections.bbox_mask(bbox))
 
 
-# ── Tools ──────────────────────────────────────────────────────────────────
+# Past days are served locally; FIRMS is only asked for what is new
+FIRMS_ARCHIVE = FirmsArchive(_fetch_firms_area, root=os.getenv("FIRMS_ARCHIVE_DIR") or None)
+
+
+async def _archived_detections(region: str, days: int) -> FirmsDetections:
+    """Sync the region's archive, falling back to what is stored if FIRMS fails."""
+    try:
+        await FIRMS_ARCHIVE.sync(region)
+    except Exception as e:
+        if not FIRMS_ARCHIVE.watermark(region):
+            raise
+        print(f"[GEOINT] FIRMS refresh failed, serving archive – {region}: {e}")
+    return FIRMS_ARCHIVE.window(region, days)
+
 
 @tool
-def get_thermal_anomalies(region: str = "middle_east", days: int = 1) -> List[Dict[str, Any]]:
+async def get_thermal_anomalies(region: str = "middle_east", days: int = 1) -> List[Dict[str, Any]]:
     """
-    Fetch NASA FIRMS thermal anomalies for a region.
+    Fetch NASA FIRMS thermal anomalies for a region, with adjacent pixels of
+    one fire or strike merged into a single event.
     Region options: middle_east, eastern_europe, east_asia, africa.
     Days: 1-10.
     """
@@ -67,42 +117,31 @@ def get_thermal_anomalies(region: str = "middle_east", days: int = 1) -> List[Di
     if not api_key:
         return [{"error": "NASA_FIRMS_KEY not set"}]
 
-    bbox = REGIONS.get(region, REGIONS["middle_east"])
+    try:
+        detections = await _archived_detections(region, days)
+        events, _ = cluster_events(detections)
+        return events.to_dicts(events.top_k(MAX_ANOMALIES))
+    except Exception as e:
+        return [{"error": str(e)}]
+
 
-    async def _fetch():
-        url = f"{FIRMS_BASE}/{api_key}/VIIRS_SNPP_NRT/world/{days}"
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            return resp.text
+@tool
+async def get_thermal_events_near(lat: float, lon: float, radius_km: float = 50.0, days: int = 1) -> List[Dict[str, Any]]:
+    """
+    Fetch NASA FIRMS thermal events within radius_km of a location
+    (must lie inside one of the monitored regions). Days: 1-10.
+    """
+    region = point_region(lat, lon)
+    if region is None:
+        return [{"error": "location is outside the monitored regions"}]
+    if not os.getenv("NASA_FIRMS_KEY"):
+        return [{"error": "NASA_FIRMS_KEY not set"}]
 
     try:
-        csv_text = asyncio.run(_fetch())
-        anomalies = []
-        reader = csv.DictReader(io.StringIO(csv_text))
-        for row in reader:
-            lat = _safe_float(row.get("latitude") or row.get("lat"))
-            lon = _safe_float(row.get("longitude") or row.get("lon"))
-            if not (bbox["lat_min"] <= lat <= bbox["lat_max"]):
-                continue
-            if not (bbox["lon_min"] <= lon <= bbox["lon_max"]):
-                continue
-            frp = _safe_float(row.get("frp"))
-            conf = _confidence(row.get("confidence"))
-            acq_date = row.get("acq_date", "")
-            acq_time = row.get("acq_time", "")
-            t = str(acq_time).strip()
-            if len(t) == 4 and t.isdigit():
-                t = f"{t[:2]}:{t[2:]}"
-            acquired = f"{acq_date}T{t}Z" if acq_date else ""
-            anomalies.append({
-                "lat": lat, "lon": lon,
-                "frp": frp,
-                "confidence": conf,
-                "type": _classify(frp),
-                "acquired": acquired,
-            })
-        return anomalies
+        detections = await _archived_detections(region, days)
+        nearby = detections.select(GridIndex.from_detections(detections).radius(lat, lon, radius_km))
+        events, _ = cluster_events(nearby)
+        return events.to_dicts(events.top_k(MAX_ANOMALIES))
     except Exception as e:
         return [{"error": str(e)}]
 
@@ -110,35 +149,27 @@ def get_thermal_anomalies(region: str = "middle_east", days: int = 1) -> List[Di
 @tool
 def get_conflict_region(conflict: str) -> str:
     """Map a conflict name to its geographic region for thermal anomaly detection."""
-    cl = conflict.lower()
-    if any(k in cl for k in ["iran", "israel", "gaza", "yemen", "syria", "iraq"]):
-        return "middle_east"
-    if any(k in cl for k in ["ukraine", "russia", "donbas", "belarus"]):
-        return "eastern_europe"
-    if any(k in cl for k in ["taiwan", "china", "korea", "myanmar"]):
-        return "east_asia"
-    if any(k in cl for k in ["sudan", "ethiopia", "drc", "sahel", "mali"]):
-        return "africa"
-    return "middle_east"
+    return conflict_region(conflict)
 
 
 # ── Agent ──────────────────────────────────────────────────────────────────
 
-GEOINT_TOOLS = [get_conflict_region, get_thermal_anomalies]
+GEOINT_TOOLS = [get_conflict_region, get_thermal_anomalies, get_thermal_events_near]
 
 GEOINT_SYSTEM = """You are a GEOINT (Geospatial Intelligence) analyst using NASA FIRMS satellite data.
 Your job: determine the conflict region, fetch thermal anomalies, compute a GEOINT score (0-100).
 
 Steps:
 1. Call get_conflict_region to determine which region to monitor
-2. Call get_thermal_anomalies with that region
-3. Compute score and return JSON
+2. Call get_thermal_anomalies with that region (each result is one event: merged adjacent pixels)
+3. Optionally call get_thermal_events_near to inspect a specific location
+4. Compute score and return JSON
 
-Scoring rules:
+Scoring rules (per event, not per pixel):
 - Base: 20
-- Each high-confidence anomaly: +5 (max +40)
-- Each explosion-type anomaly: +15
-- More than 10 anomalies: +10
+- Each high-confidence event: +5 (max +40)
+- Each explosion-type event: +15
+- More than 10 events: +10
 - Clamp to [0, 100]
 
 Return ONLY valid JSON:
@@ -158,6 +189,7 @@ def _empty_result(conflict: str) -> Dict[str, Any]:
         "conflict": conflict,
         "anomalies": [],
         "anomaly_count": 0,
+        "pixel_count": 0,
         "high_confidence_count": 0,
         "geoint_score": 20.0,
         "hotspots": [],
@@ -165,10 +197,84 @@ def _empty_result(conflict: str) -> Dict[str, Any]:
     }
 
 
-def run_geoint_agent(conflict: str) -> Dict[str, Any]:
+def _compute_geoint_score(high_conf: int, explosions: int, total: int) -> float:
+    """Scoring rules from GEOINT_SYSTEM, applied directly."""
+    score = 20.0
+    score += min(high_conf * 5.0, 40.0)
+    score += explosions * 15.0
+    if total > 10:
+        score += 10.0
+    return max(0.0, min(100.0, score))
+
+
+def _build_geoint_result(conflict: str, region: str, detections: FirmsDetections) -> Dict[str, Any]:
+    # Adjacent pixels of one fire or strike count once
+    events, _ = cluster_events(detections)
+    total = len(events)
+    high_conf = events.confidence_counts()["high"]
+    explosions = events.type_counts()["explosion"]
+    score = _compute_geoint_score(high_conf, explosions, total)
+
+    # Only the strongest events are turned into dicts for the response
+    anomalies = events.to_dicts(events.top_k(MAX_ANOMALIES))
+
+    return {
+        "conflict": conflict,
+        "region": region,
+        "anomalies": anomalies,
+        "anomaly_count": total,
+        "pixel_count": len(detections),
+        "high_confidence_count": high_conf,
+        "geoint_score": score,
+        "hotspots": anomalies[:3],
+        "summary": (
+            f"{total} thermal events from {len(detections)} detections in {region.replace('_', ' ')} "
+            f"({high_conf} high-confidence, {explosions} explosion-class). "
+            f"GEOINT score: {score:.1f}."
+        ),
+    }
+
+
+async def _narrate(result: Dict[str, Any]) -> str | None:
+    """Optional single Haiku call turning the computed result into a summary."""
+    digest = {k: result[k] for k in ("region", "anomaly_count", "pixel_count", "high_confidence_count", "geoint_score", "hotspots")}
+    model = ChatAnthropic(model="claude-haiku-4-5-20251001", temperature=0)
+    try:
+        response = await model.ainvoke([
+            SystemMessage(content="You are a GEOINT analyst. Summarize the NASA FIRMS findings in 1-2 sentences. Plain text only."),
+            HumanMessage(content=json.dumps(digest, default=str)),
+        ])
+    except Exception:
+        return None
+    content = response.content
+    if isinstance(content, list):
+        content = " ".join(c.get("text", "") if isinstance(c, dict) else str(c) for c in content)
+    return str(content).strip() or None
+
+
+async def _arun_geoint_native(conflict: str) -> Dict[str, Any]:
+    api_key = os.getenv("NASA_FIRMS_KEY")
+    if not api_key:
+        return _empty_result(conflict)
+
+    region = conflict_region(conflict)
+    try:
+        detections = await _archived_detections(region, 1)
+    except Exception as e:
+        print(f"[GEOINT] FIRMS fetch failed: {e}")
+        return _empty_result(conflict)
+
+    result = _build_geoint_result(conflict, region, detections)
+    result["trend"] = FIRMS_ARCHIVE.trend(region)
+    if GEOINT_NARRATIVE:
+        result["summary"] = await _narrate(result) or result["summary"]
+    return result
+
+
+async def _arun_geoint_llm(conflict: str) -> Dict[str, Any]:
     """Run GEOINT agent with LangChain tool-calling."""
-    import json
     model = ChatAnthropic(model="claude-haiku-4-5-20251001", temperature=0).bind_tools(GEOINT_TOOLS)
+    tool_map = {t.name: t for t in GEOINT_TOOLS}
 
     messages = [
         SystemMessage(content=GEOINT_SYSTEM),
@@ -176,7 +282,7 @@ def run_geoint_agent(conflict: str) -> Dict[str, Any]:
     ]
 
     for _ in range(6):
-        response = model.invoke(messages)
+        response = await model.ainvoke(messages)
         messages.append(response)
 
         if not response.tool_calls:
@@ -191,14 +297,35 @@ def run_geoint_agent(conflict: str) -> Dict[str, Any]:
                 break
 
         for tc in response.tool_calls:
-            tool_map = {t.name: t for t in GEOINT_TOOLS}
             tool_fn = tool_map.get(tc["name"])
             if tool_fn:
-                result = tool_fn.invoke(tc.get("args", {}))
-                from langchain_core.messages import ToolMessage
+                result = await tool_fn.ainvoke(tc.get("args", {}))
                 messages.append(ToolMessage(
                     content=json.dumps(result, default=str),
                     tool_call_id=tc["id"],
                 ))
 
     return _empty_result(conflict)
+
+
+async def arun_geoint_agent(conflict: str) -> Dict[str, Any]:
+    """Run the GEOINT agent in the configured mode (native by default)."""
+    if GEOINT_MODE == "llm":
+        return await _arun_geoint_llm(conflict)
+    return await _arun_geoint_native(conflict)
+
+
+async def geoint_trends() -> Dict[str, Dict[str, Any]]:
+    """Last-24h vs. 7-day baseline detection counts for every region."""
+    if not os.getenv("NASA_FIRMS_KEY"):
+        return {}
+    results = await asyncio.gather(*(_archived_detections(r, 1) for r in REGIONS), return_exceptions=True)
+    return {
+        region: FIRMS_ARCHIVE.trend(region) if not isinstance(res, Exception) else {"region": region, "error": str(res)}
+        for region, res in zip(REGIONS, results)
+    }
+
+
+def run_geoint_agent(conflict: str) -> Dict[str, Any]:
+    """Sync wrapper around arun_geoint_agent for callers outside an event loop."""
+    return run_with_pool(arun_geoint_agent, conflict)
@@ -0,0 +1,194 @@
+"""
+Hedge – hedged requests across interchangeable providers.
+
+The most reliable provider is asked first. If it has not produced a
+non-empty result after the hedge delay (or fails / comes back empty
+earlier), the next provider is started as well. The first non-empty result
+wins and providers still in flight are cancelled. Results that complete
+together – or within the optional `grace` period – are merged.
+
+Modes:
+- "auto"       delay = recent latency quantile of the provider being hedged
+- "immediate"  all providers start together
+- "off"        sequential fallback (next provider only after failure / empty)
+- "<seconds>"  fixed delay
+
+Per-provider latency and outcome statistics drive both the ordering and the
+auto delay.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Sequence, Tuple
+
+Fetch = Callable[..., Awaitable[List[Any]]]
+
+MIN_SAMPLES = 10
+
+
+class _Provider:
+    __slots__ = ("name", "fetch", "latencies", "stats")
+
+    def __init__(self, name: str, fetch: Fetch, window: int):
+        self.name = name
+        self.fetch = fetch
+        # Latencies of calls that produced data
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.stats: Dict[str, Any] = {
+            "calls": 0, "ok": 0, "empty": 0, "errors": 0, "cancelled": 0, "wins": 0, "last_error": None,
+        }
+
+    def success_rate(self) -> float:
+        s = self.stats
+        return (s["ok"] + 1) / (s["ok"] + s["empty"] + s["errors"] + 2)
+
+    def latency_quantile(self, q: float) -> float | None:
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class HedgedFetch:
+    def __init__(
+        self,
+        providers: Sequence[Tuple[str, Fetch]],
+        merge: Callable[[List[List[Any]]], List[Any]],
+        mode: str = "auto",
+        default_delay: float = 2.0,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        quantile: float = 0.9,
+        grace: float = 0.0,
+        window: int = 100,
+    ):
+        self._providers = [_Provider(name, fetch, window) for name, fetch in providers]
+        self._merge = merge
+        self.mode = mode
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.quantile = quantile
+        self.grace = grace
+        self.stats: Dict[str, int] = {"fetches": 0, "hedged": 0, "merged": 0, "empty": 0}
+
+    def delay(self, provider: _Provider) -> float:
+        """How long to give `provider` before starting the next one."""
+        if self.mode == "immediate":
+            return 0.0
+        if self.mode == "auto":
+            observed = provider.latency_quantile(self.quantile)
+            if observed is None:
+                return self.default_delay
+            return min(max(observed, self.min_delay), self.max_delay)
+        try:
+            return float(self.mode)
+        except ValueError:
+            return self.default_delay
+
+    def _ranked(self) -> List[_Provider]:
+        # Stable sort: configured order breaks ties
+        return sorted(self._providers, key=lambda p: -p.success_rate())
+
+    async def _call(self, provider: _Provider, args: Tuple[Any, ...]) -> List[Any] | None:
+        provider.stats["calls"] += 1
+        started = time.monotonic()
+        try:
+            result = await provider.fetch(*args)
+        except asyncio.CancelledError:
+            provider.stats["cancelled"] += 1
+            raise
+        except Exception as e:
+            provider.stats["errors"] += 1
+            provider.stats["last_error"] = str(e)
+            return None
+        if not result:
+            provider.stats["empty"] += 1
+            return None
+        provider.stats["ok"] += 1
+        provider.latencies.append(time.monotonic() - started)
+        return result
+
+    async def fetch(self, *args: Any) -> List[Any]:
+        self.stats["fetches"] += 1
+        queue = self._ranked()
+
+        if self.mode == "off":
+            for provider in queue:
+                result = await self._call(provider, args)
+                if result:
+                    provider.stats["wins"] += 1
+                    return result
+            self.stats["empty"] += 1
+            return []
+
+        running: Dict[asyncio.Task, _Provider] = {}
+        results: List[Tuple[_Provider, List[Any]]] = []
+        hedge_at = 0.0
+
+        def launch() -> None:
+            nonlocal hedge_at
+            provider = queue.pop(0)
+            running[asyncio.ensure_future(self._call(provider, args))] = provider
+            hedge_at = time.monotonic() + self.delay(provider)
+
+        try:
+            launch()
+            while running or queue:
+                if not running:
+                    launch()
+                timeout = max(hedge_at - time.monotonic(), 0.0) if queue else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slow provider: hedge with the next one
+                    self.stats["hedged"] += 1
+                    launch()
+                    continue
+                for task in done:
+                    provider = running.pop(task)
+                    if task.result():
+                        results.append((provider, task.result()))
+                    elif queue:
+                        launch()
+                if results:
+                    break
+
+            if results and running and self.grace > 0:
+                done, _ = await asyncio.wait(running, timeout=self.grace)
+                for task in done:
+                    provider = running.pop(task)
+                    if task.result():
+                        results.append((provider, task.result()))
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if not results:
+            self.stats["empty"] += 1
+            return []
+        results[0][0].stats["wins"] += 1
+        if len(results) == 1:
+            return results[0][1]
+        self.stats["merged"] += 1
+        return self._merge([r for _, r in results])
+
+    def snapshot(self) -> Dict[str, Any]:
+        def ms(v: float | None) -> float | None:
+            return None if v is None else round(v * 1000, 1)
+
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "providers": {
+                p.name: {
+                    **p.stats,
+                    "success_rate": round(p.success_rate(), 3),
+                    "p50_ms": ms(p.latency_quantile(0.5)),
+                    "p90_ms": ms(p.latency_quantile(0.9)),
+                    "hedge_delay_ms": ms(self.delay(p)),
+                }
+                for p in self._providers
+            },
+        }
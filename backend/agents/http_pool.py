@@ -0,0 +1,120 @@
+"""
+HTTP Client Pool – process-wide pooled httpx clients shared by all agents.
+
+One long-lived AsyncClient per upstream source keeps TCP/TLS connections
+(and HTTP/2 sessions where the server negotiates h2 via ALPN) alive across
+refresh cycles. Each source gets its own timeout and connection limits, so a
+slow upstream cannot exhaust connections meant for another.
+
+The server installs a pool for its lifetime (see the FastAPI lifespan in
+main.py); sync entry points used outside the server scope a temporary pool
+with run_with_pool().
+"""
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Keep idle connections past the 60s refresh interval so the next cycle
+# reuses them instead of paying DNS + TLS again.
+KEEPALIVE_EXPIRY_S = 120.0
+
+DEFAULT_SOURCE: Dict[str, Any] = {
+    "timeout": 15.0,
+    "connect_timeout": 5.0,
+    "max_connections": 10,
+    "max_keepalive": 5,
+    "http2": True,
+    "headers": {},
+}
+
+# Per-source overrides on top of DEFAULT_SOURCE
+SOURCES: Dict[str, Dict[str, Any]] = {
+    "alphavantage":  {"max_connections": 4},
+    "polymarket":    {"max_connections": 4},
+    "adsb":          {"timeout": 15.0, "max_connections": 8},
+    "vesselfinder":  {"max_connections": 2},
+    "marinetraffic": {"max_connections": 2},
+    "newsapi":       {"max_connections": 4},
+    "firms":         {"timeout": 30.0, "max_connections": 4},
+    "telegram":      {"timeout": 10.0, "headers": {"User-Agent": "Mozilla/5.0"}},
+    "reddit":        {"timeout": 10.0, "headers": {"User-Agent": "DigitalWarRoom/1.0"}},
+    "rss":           {"timeout": 10.0, "headers": {"User-Agent": "DigitalWarRoom/1.0"}},
+}
+
+
+class HttpClientPool:
+    """Lazily created, per-source httpx.AsyncClient instances."""
+
+    def __init__(self, sources: Dict[str, Dict[str, Any]] | None = None):
+        self._sources = SOURCES if sources is None else sources
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, source: str) -> httpx.AsyncClient:
+        client = self._clients.get(source)
+        if client is None or client.is_closed:
+            cfg = {**DEFAULT_SOURCE, **self._sources.get(source, {})}
+            client = httpx.AsyncClient(
+                http2=cfg["http2"],
+                timeout=httpx.Timeout(cfg["timeout"], connect=cfg["connect_timeout"]),
+                limits=httpx.Limits(
+                    max_connections=cfg["max_connections"],
+                    max_keepalive_connections=cfg["max_keepalive"],
+                    keepalive_expiry=KEEPALIVE_EXPIRY_S,
+                ),
+                headers=cfg["headers"],
+            )
+            self._clients[source] = client
+        return client
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*[c.aclose() for c in clients], return_exceptions=True)
+
+    async def __aenter__(self) -> "HttpClientPool":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+
+_PROCESS_POOL: HttpClientPool | None = None
+_SCOPED_POOL: ContextVar[HttpClientPool | None] = ContextVar("scoped_http_pool", default=None)
+
+
+def set_http_pool(pool: HttpClientPool | None) -> None:
+    """Install (or clear) the process-wide pool. Called from the server lifespan."""
+    global _PROCESS_POOL
+    _PROCESS_POOL = pool
+
+
+def get_http_pool() -> HttpClientPool:
+    """Return the pool agents should fetch through."""
+    global _PROCESS_POOL
+    pool = _SCOPED_POOL.get()
+    if pool is not None:
+        return pool
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = HttpClientPool()
+    return _PROCESS_POOL
+
+
+def run_with_pool(fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """
+    Run an async agent entry point on a private event loop with its own pool.
+
+    httpx connections are bound to the loop that opened them, so sync
+    wrappers must not touch the process-wide pool.
+    """
+    async def _main() -> T:
+        async with HttpClientPool() as pool:
+            token = _SCOPED_POOL.set(pool)
+            try:
+                return await fn(*args)
+            finally:
+                _SCOPED_POOL.reset(token)
+
+    return asyncio.run(_main())
@@ -0,0 +1,180 @@
+"""
+Keyword Matcher – multi-keyword counting shared by the agents.
+
+By default a keyword matches wherever it occurs in the lowercased text,
+exactly like the `kw in text.lower()` loops NEWS, SOCMINT and the Polymarket
+index used before. Counts are distinct keywords per text and category – the
+"how many of these words appear" the agents' sentiment rules were written
+against. Batches return one (texts × categories) array.
+
+Each text is lowercased once and searched for each keyword with `in`. The
+searches are the whole cost, and at today's couple of dozen keywords
+nothing in CPython does them faster: tokenizing a text for whole-word
+lookups allocates one string per word and costs more than the searches,
+and Python's re engine is slower still (benchmarks/bench_keywords.py).
+
+whole_words=True matches whole words instead, so "war" no longer hits
+"software" or "Warriors" and "mali" no longer hits "Somalia". Since "iran"
+then stops matching "Iranian" by accident, every keyword also matches its
+regular inflections (-s / -es / -ies, -ed / -d / -ied, -ing with the silent
+e dropped) and, for places, its demonyms from ALIASES. Multi-word keywords
+match across any whitespace or punctuation between their words. All forms
+are compiled into one hash set; a batch is lowercased and stripped of
+punctuation in one str.translate pass and each text's words are
+intersected with the set, so the cost grows with the amount of text and
+hardly at all with the number of keywords.
+"""
+import string
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+import numpy as np
+
+# Punctuation splits words like \b does; "_" is a word character
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation.replace("_", "") + "‘’“”–—…«»·•"})
+# Joins batch texts for the single translate pass
+_SEPARATOR = "\x1e"
+
+# Demonyms / spelling variants matched for a (last) keyword word, plurals included
+ALIASES: Dict[str, Tuple[str, ...]] = {
+    "iran": ("iranian",), "israel": ("israeli",), "gaza": ("gazan",), "yemen": ("yemeni",),
+    "syria": ("syrian",), "iraq": ("iraqi",), "lebanon": ("lebanese",), "palestine": ("palestinian",),
+    "ukraine": ("ukrainian",), "russia": ("russian",), "belarus": ("belarusian",),
+    "taiwan": ("taiwanese",), "china": ("chinese",), "korea": ("korean",), "myanmar": ("burmese",),
+    "sudan": ("sudanese",), "ethiopia": ("ethiopian",), "sahel": ("sahelian",), "mali": ("malian",),
+    "drc": ("congolese",), "america": ("american",), "hezbollah": ("hizbollah", "hizballah"),
+}
+
+_VOWELS = "aeiou"
+
+
+def _plurals(word: str) -> List[str]:
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return [f"{word}es"]
+    if word.endswith("y") and len(word) > 1 and word[-2] not in _VOWELS:
+        return [f"{word[:-1]}ies"]
+    return [f"{word}s"]
+
+
+def _verb_forms(word: str) -> List[str]:
+    if word.endswith("e"):
+        return [f"{word}d", f"{word[:-1]}ing"]
+    if word.endswith("y") and len(word) > 1 and word[-2] not in _VOWELS:
+        return [f"{word[:-1]}ied", f"{word}ing"]
+    return [f"{word}ed", f"{word}ing"]
+
+
+def _forms(keyword: str) -> List[str]:
+    """The keyword, its inflected forms and demonyms (changing the last word)."""
+    head, _, last = keyword.rpartition(" ")
+    prefix = f"{head} " if head else ""
+    forms = [keyword] + [prefix + w for w in _plurals(last) + _verb_forms(last)]
+    for alias in ALIASES.get(last, ()):
+        forms += [prefix + w for w in [alias] + _plurals(alias)]
+    return forms
+
+
+def _tokenize(texts: Sequence[str]) -> List[List[str]]:
+    """Lowercased words of every text, in one lower / translate pass over the batch."""
+    texts = [t or "" for t in texts]
+    joined = _SEPARATOR.join(texts)
+    if joined.count(_SEPARATOR) != len(texts) - 1:
+        joined = _SEPARATOR.join(t.replace(_SEPARATOR, " ") for t in texts)
+    return [doc.split() for doc in joined.lower().translate(_PUNCTUATION).split(_SEPARATOR)]
+
+
+class KeywordMatcher:
+    def __init__(self, categories: Mapping[str, Iterable[str]], whole_words: bool = False):
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.whole_words = whole_words
+        keywords: Dict[str, Set[int]] = {}
+        for c, words in enumerate(categories.values()):
+            for word in words:
+                word = " ".join(word.lower().translate(_PUNCTUATION).split()) if whole_words else word.lower()
+                if word:
+                    keywords.setdefault(word, set()).add(c)
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self._by_category: Tuple[Tuple[str, ...], ...] = tuple(
+            tuple(word for word in self.keywords if c in keywords[word]) for c in range(len(self.categories))
+        )
+        if not whole_words:
+            return
+
+        # keyword × category membership, for turning keyword hits into category counts
+        self._membership = np.zeros((len(self.keywords), len(self.categories)), dtype=np.int32)
+        for k, word in enumerate(self.keywords):
+            self._membership[k, list(keywords[word])] = 1
+        # Surface form → keyword id; a form shared by two keywords goes to the first
+        self._form_ids: Dict[str, int] = {}
+        for k, word in enumerate(self.keywords):
+            for form in _forms(word):
+                self._form_ids.setdefault(form, k)
+        self._words = frozenset(f for f in self._form_ids if " " not in f)
+        self._phrases = tuple(f for f in self._form_ids if " " in f)
+        self._phrase_starts = frozenset(f.split()[0] for f in self._phrases)
+
+    # ── Whole words ────────────────────────────────────────────────────────
+
+    def _hits(self, words: List[str]) -> AbstractSet[str]:
+        """Keyword forms among one text's words."""
+        hits = self._words.intersection(words)
+        if self._phrases and not self._phrase_starts.isdisjoint(words):
+            line = f" {' '.join(words)} "
+            hits = hits.union(p for p in self._phrases if f" {p} " in line)
+        return hits
+
+    def _scan(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(text index, keyword id) of every distinct keyword hit in the batch."""
+        docs: List[int] = []
+        keyword_ids: List[int] = []
+        form_ids = self._form_ids
+        for i, words in enumerate(_tokenize(texts)):
+            hits = self._hits(words)
+            if hits:
+                ids = {form_ids[form] for form in hits}
+                docs.extend([i] * len(ids))
+                keyword_ids.extend(ids)
+        return np.array(docs, dtype=np.int64), np.array(keyword_ids, dtype=np.int64)
+
+    # ── Queries ────────────────────────────────────────────────────────────
+
+    def count_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), len(categories)) array of distinct keyword counts."""
+        if self.whole_words:
+            docs, keyword_ids = self._scan(texts)
+            hits = self._membership[keyword_ids]
+            counts = np.zeros((len(texts), len(self.categories)), dtype=np.int32)
+            for c in range(len(self.categories)):
+                counts[:, c] = np.bincount(docs, weights=hits[:, c], minlength=len(texts))
+            return counts
+        flat: List[int] = []
+        for text in texts:
+            lower = (text or "").lower()
+            flat.extend([sum(1 for k in words if k in lower) for words in self._by_category])
+        return np.array(flat, dtype=np.int32).reshape(len(texts), len(self.categories))
+
+    def keywords_batch(self, texts: Sequence[str]) -> List[Set[str]]:
+        """Distinct keywords (base form) found in each text."""
+        found: List[Set[str]] = [set() for _ in texts]
+        if self.whole_words:
+            for doc, k in zip(*self._scan(texts)):
+                found[doc].add(self.keywords[k])
+            return found
+        for keywords, text in zip(found, texts):
+            lower = (text or "").lower()
+            keywords.update(k for k in self.keywords if k in lower)
+        return found
+
+    def any_batch(self, texts: Sequence[str]) -> List[bool]:
+        return [self.any(text) for text in texts]
+
+    def counts(self, text: str) -> Dict[str, int]:
+        return dict(zip(self.categories, self.count_batch([text])[0].tolist()))
+
+    def matches(self, text: str) -> Set[str]:
+        return self.keywords_batch([text])[0]
+
+    def any(self, text: str) -> bool:
+        if self.whole_words:
+            return bool(text) and bool(self._hits(_tokenize([text])[0]))
+        lower = (text or "").lower()
+        return any(k in lower for k in self.keywords)
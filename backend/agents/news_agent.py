@@ -1,13 +1,19 @@
-import asyncio
 import os
-from collections import Counter
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Sequence
 
-import httpx
+import numpy as np
+
+from .http_pool import get_http_pool, run_with_pool
+from .keyword_matcher import KeywordMatcher
+from .news_store import NewsStore
+from .sentiment import SentimentBatch, label_sentiment
 
 
 NEWS_API_URL = "https://newsapi.org/v2/everything"
+# Newest articles included in the result; aggregates cover the whole window
+ARTICLES_RETURNED = int(os.getenv("NEWS_RETURN_ARTICLES", "20"))
+# Share of the window published in the last 24h that counts as a surge
+RECENT_SHARE = 0.5
 
 # Trusted domains for conflict/geopolitical coverage
 NEWS_DOMAINS = (
@@ -17,7 +23,7 @@ NEWS_DOMAINS = (
     "middleeasteye.net,thehill.com"
 )
 
-# Title substrings that indicate off-topic articles (case-insensitive)
+# Title words that indicate off-topic articles (case-insensitive)
 TITLE_EXCLUDE_KEYWORDS = [
     "marathon",
     "eurovision",
@@ -56,6 +62,9 @@ DE_ESCALATION_KEYWORDS = [
     "relief",
 ]
 
+SENTIMENT_MATCHER = KeywordMatcher({"escalation": ESCALATION_KEYWORDS, "de_escalation": DE_ESCALATION_KEYWORDS})
+TITLE_EXCLUDE_MATCHER = KeywordMatcher({"exclude": TITLE_EXCLUDE_KEYWORDS})
+
 
 def _build_query(conflict: str) -> str:
     """Build a conflict-specific NewsAPI query for highly relevant articles."""
@@ -83,136 +92,53 @@ def _build_query(conflict: str) -> str:
     return conflict_term
 
 
-def _safe_datetime(value: str | None) -> datetime | None:
-    if not value:
-        return None
-    try:
-        # NewsAPI returns ISO8601 with Z suffix; normalize for fromisoformat
-        if value.endswith("Z"):
-            value = value.replace("Z", "+00:00")
-        return datetime.fromisoformat(value)
-    except Exception:
-        return None
-
-
-def _analyze_article_sentiment(text: str) -> float:
-    """
-    Return sentiment score in [-1.0, 1.0] based on keyword counts.
-    Positive => escalatory, negative => de-escalatory.
-    """
-    if not text:
-        return 0.0
-
-    lower = text.lower()
-    score = 0
-
-    for kw in ESCALATION_KEYWORDS:
-        if kw in lower:
-            score += 1
-
-    for kw in DE_ESCALATION_KEYWORDS:
-        if kw in lower:
-       	    score -= 1
-
-    # Normalize to [-1, 1] with a simple clamp
-    if score == 0:
-        return 0.0
-    # Cap raw score magnitude at 3 for normalization
-    capped = max(-3, min(3, score))
-    return capped / 3.0
-
-
-def _label_sentiment(score: float) -> str:
-    if score > 0.2:
-        return "ESCALATORY"
-    if score < -0.2:
-        return "DE-ESCALATORY"
-    return "NEUTRAL"
-
-
-def _title_should_exclude(title: str) -> bool:
-    """Return True if the article title indicates off-topic content."""
-    if not title:
-        return False
-    lower = title.lower()
-    return any(kw in lower for kw in TITLE_EXCLUDE_KEYWORDS)
-
-
-async def _fetch_news(client: httpx.AsyncClient, conflict: str) -> Dict[str, Any]:
+async def _fetch_news_page(params: Dict[str, Any]) -> Dict[str, Any]:
     api_key = os.getenv("NEWS_API_KEY")
     if not api_key:
         raise RuntimeError("NEWS_API_KEY is not set")
 
-    from_date = datetime.now(timezone.utc) - timedelta(hours=48)
-    from_str = from_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    params = {
-        "q": _build_query(conflict),
-        "language": "en",
-        "sortBy": "relevance",
-        "pageSize": 20,
-        "from": from_str,
-        "domains": NEWS_DOMAINS,
-        "apiKey": api_key,
-    }
-
-    resp = await client.get(NEWS_API_URL, params=params)
+    resp = await get_http_pool().client("newsapi").get(
+        NEWS_API_URL,
+        params={**params, "language": "en", "domains": NEWS_DOMAINS, "apiKey": api_key},
+    )
     resp.raise_for_status()
-    return resp.json()
-
-
-def _process_articles(payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float, List[str], int]:
-    raw_articles = payload.get("articles") or []
-    processed: List[Dict[str, Any]] = []
-
-    scores: List[float] = []
-    source_counter: Counter[str] = Counter()
-    now = datetime.now(timezone.utc)
-    cutoff_24h = now - timedelta(hours=24)
-    recent_count_24h = 0
-
-    for art in raw_articles:
-        title = art.get("title") or ""
-        if _title_should_exclude(title):
-            continue
-        description = art.get("description") or ""
-        combined_text = f"{title}\n{description}"
-
-        sentiment_score = _analyze_article_sentiment(combined_text)
-        sentiment_label = _label_sentiment(sentiment_score)
-
-        source_name = (art.get("source") or {}).get("name") or ""
-        published_at_raw = art.get("publishedAt")
-        published_at_dt = _safe_datetime(published_at_raw)
-
-        if published_at_dt and published_at_dt.tzinfo is None:
-            published_at_dt = published_at_dt.replace(tzinfo=timezone.utc)
-
-        if published_at_dt and published_at_dt >= cutoff_24h:
-            recent_count_24h += 1
-
-        scores.append(sentiment_score)
-        if source_name:
-            source_counter[source_name] += 1
-
-        processed.append(
-            {
-                "title": title,
-                "source": source_name,
-                "url": art.get("url"),
-                "published_at": published_at_raw,
-                "sentiment_score": sentiment_score,
-                "sentiment_label": sentiment_label,
-            }
-        )
+    payload = resp.json()
+    if payload.get("status") != "ok":
+        raise RuntimeError(f"NewsAPI {payload.get('code')}: {payload.get('message')}")
+    return payload
+
+
+def _score_articles(raw_articles: Sequence[Dict[str, Any]]) -> List[Dict[str, Any] | None]:
+    """One record per article (None for off-topic titles); scored in one batch."""
+    titles = [art.get("title") or "" for art in raw_articles]
+    kept = np.flatnonzero(TITLE_EXCLUDE_MATCHER.count_batch(titles)[:, 0] == 0).tolist()
+    sentiment = SentimentBatch.from_texts(
+        SENTIMENT_MATCHER, [f"{titles[i]}\n{raw_articles[i].get('description') or ''}" for i in kept]
+    )
+
+    records: List[Dict[str, Any] | None] = [None] * len(raw_articles)
+    for i, score, label in zip(kept, sentiment.scores.tolist(), sentiment.labels.tolist()):
+        art = raw_articles[i]
+        records[i] = {
+            "title": titles[i],
+            "source": (art.get("source") or {}).get("name") or "",
+            "url": art.get("url"),
+            "published_at": art.get("publishedAt"),
+            "sentiment_score": score,
+            "sentiment_label": label,
+        }
+    return records
+
+
+# Per-query article windows, refreshed from a publishedAt watermark
+NEWS = NewsStore(_fetch_news_page, _score_articles, root=os.getenv("NEWS_STORE_DIR") or None)
 
-    overall_sentiment = sum(scores) / len(scores) if scores else 0.0
-    top_sources = [name for name, _ in source_counter.most_common(5)]
 
-    return processed, overall_sentiment, top_sources, recent_count_24h
+def news_stats() -> Dict[str, Any]:
+    return NEWS.snapshot()
 
 
-def _compute_news_score(overall_sentiment: float, recent_count_24h: int) -> float:
+def _compute_news_score(overall_sentiment: float, recent_count_24h: int, total: int) -> float:
     score = 50.0
 
     if overall_sentiment > 0.5:
@@ -222,22 +148,26 @@ def _compute_news_score(overall_sentiment: float, recent_count_24h: int) -> floa
     elif overall_sentiment < -0.2:
         score -= 15.0
 
-    if recent_count_24h > 10:
+    # Coverage surge: more than half the 48h window (and over 10 articles)
+    # from the last 24h – the same share the old 20-article sample used
+    if recent_count_24h > 10 and recent_count_24h > RECENT_SHARE * total:
         score += 10.0
 
     return max(0.0, min(100.0, score))
 
 
-async def _run_news_agent_async(conflict: str) -> Dict[str, Any]:
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        payload = await _fetch_news(client, conflict)
+async def arun_news_agent(conflict: str) -> Dict[str, Any]:
+    window = await NEWS.window(_build_query(conflict))
 
-    articles, overall_sentiment, top_sources, recent_count_24h = _process_articles(payload)
-    sentiment_label = _label_sentiment(overall_sentiment)
-    news_score = _compute_news_score(overall_sentiment, recent_count_24h)
+    articles = window.newest(ARTICLES_RETURNED)
+    overall_sentiment = window.overall_sentiment()
+    top_sources = window.top_sources()
+    recent_count_24h = window.recent_count(24)
+    sentiment_label = label_sentiment(overall_sentiment)
+    news_score = _compute_news_score(overall_sentiment, recent_count_24h, len(window.articles))
 
     summary = (
-        f"{len(articles)} articles analyzed. "
+        f"{len(window.articles)} articles analyzed. "
         f"Sentiment: {sentiment_label}."
     )
 
@@ -256,8 +186,9 @@ def run_news_agent(conflict: str) -> Dict[str, Any]:
     """
     Public sync entrypoint for the NEWS agent.
 
-    Uses async httpx under the hood but exposes a synchronous API
-    for consistency with other agents.
+    Runs arun_news_agent on a private event loop; for callers that are
+    not already inside one (scripts, tests). The supervisor awaits
+    arun_news_agent directly.
     """
-    return asyncio.run(_run_news_agent_async(conflict))
+    return run_with_pool(arun_news_agent, conflict)
 
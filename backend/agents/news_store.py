@@ -0,0 +1,296 @@
+"""
+News Store – per-query NewsAPI article window with a publish-time watermark.
+
+The first refresh of a query backfills the last WINDOW_H hours newest-first
+(sortBy=publishedAt), up to BACKFILL_PAGES pages of PAGE_SIZE articles.
+Later refreshes ask only for articles published since the watermark (newest
+publishedAt seen, less OVERLAP_S for late indexing) – normally one request
+per REFRESH_S. A full page pulls the next one, up to INCREMENTAL_PAGES.
+When a pass hits its page limit the newest articles fetched are kept and
+the watermark moves past the gap, so a busy query costs the same number of
+requests every refresh instead of refetching the window.
+
+Articles are deduplicated by URL across refreshes, so each one is processed
+(filtered, sentiment-scored) exactly once. Score sum and per-source counts
+are updated as articles enter and age out of the window, so reads never
+rescan it. With NEWS_STORE_DIR set each query's window is persisted as JSON
+and a restarted worker resumes from its watermark instead of backfilling.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .singleflight import SingleFlight
+
+# Articles per request (NewsAPI maximum)
+PAGE_SIZE = int(os.getenv("NEWS_PAGE_SIZE", "100"))
+BACKFILL_PAGES = int(os.getenv("NEWS_BACKFILL_PAGES", "3"))
+# Page limit per incremental pass
+INCREMENTAL_PAGES = 3
+WINDOW_H = 48
+# Minimum seconds between upstream refreshes of one query
+REFRESH_S = float(os.getenv("NEWS_REFRESH", "300"))
+# Retry delay after a failed refresh (stored articles are served meanwhile)
+RETRY_S = float(os.getenv("NEWS_RETRY", "120"))
+# Re-read this many seconds before the watermark (articles indexed late)
+OVERLAP_S = 900
+# Per-query cap; the oldest articles go first
+MAX_ARTICLES = int(os.getenv("NEWS_MAX_ARTICLES", "1000"))
+
+# fetch_page(params) → NewsAPI payload; raises on HTTP or API errors
+FetchPage = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+# process(raw articles) → one record per article (None = dropped); records carry
+# "url", "source", "published_at" and "sentiment_score"
+Process = Callable[[Sequence[Dict[str, Any]]], List[Dict[str, Any] | None]]
+
+
+def _timestamp(value: Any) -> float | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _article_key(raw: Dict[str, Any]) -> str:
+    url = raw.get("url")
+    if url:
+        return str(url)
+    return f"{(raw.get('source') or {}).get('name') or ''}|{raw.get('title') or ''}"
+
+
+class _Window:
+    __slots__ = ("articles", "seen", "watermark", "backfilled_at", "synced_at", "retry_at", "score_sum", "sources", "stats")
+
+    def __init__(self):
+        # URL → record, for articles kept by `process`
+        self.articles: Dict[str, Dict[str, Any]] = {}
+        # URL → publish time of every article processed (kept or dropped)
+        self.seen: Dict[str, float] = {}
+        self.watermark = 0.0
+        self.backfilled_at = 0.0
+        self.synced_at = 0.0
+        self.retry_at = 0.0
+        self.score_sum = 0.0
+        self.sources: Counter[str] = Counter()
+        self.stats: Dict[str, Any] = {
+            "backfills": 0, "incremental": 0, "requests": 0, "new": 0, "duplicates": 0,
+            "truncated": 0, "expired": 0, "errors": 0, "last_error": None,
+        }
+
+    def add(self, key: str, ts: float, record: Dict[str, Any] | None) -> None:
+        self.seen[key] = ts
+        if record is not None:
+            self.articles[key] = record
+            self.score_sum += record["sentiment_score"]
+            if record["source"]:
+                self.sources[record["source"]] += 1
+
+    def drop(self, key: str) -> None:
+        del self.seen[key]
+        record = self.articles.pop(key, None)
+        if record is not None:
+            self.score_sum -= record["sentiment_score"]
+            if record["source"]:
+                self.sources[record["source"]] -= 1
+                if not self.sources[record["source"]]:
+                    del self.sources[record["source"]]
+
+    def expire(self, now: float) -> None:
+        cutoff = now - WINDOW_H * 3600
+        expired = [key for key, ts in self.seen.items() if ts < cutoff]
+        if len(self.seen) - len(expired) > MAX_ARTICLES:
+            kept = sorted((key for key in self.seen if self.seen[key] >= cutoff), key=self.seen.__getitem__)
+            expired += kept[: len(kept) - MAX_ARTICLES]
+        for key in expired:
+            self.drop(key)
+        self.stats["expired"] += len(expired)
+
+    # ── Aggregates ─────────────────────────────────────────────────────────
+
+    def newest(self, limit: int | None = None) -> List[Dict[str, Any]]:
+        keys = sorted(self.articles, key=self.seen.__getitem__, reverse=True)
+        return [self.articles[key] for key in keys[:limit]]
+
+    def overall_sentiment(self) -> float:
+        return self.score_sum / len(self.articles) if self.articles else 0.0
+
+    def top_sources(self, n: int = 5) -> List[str]:
+        return [name for name, _ in self.sources.most_common(n)]
+
+    def recent_count(self, hours: float) -> int:
+        published = np.fromiter((self.seen[key] for key in self.articles), dtype=np.float64, count=len(self.articles))
+        return int(np.count_nonzero(published >= time.time() - hours * 3600))
+
+
+class NewsStore:
+    def __init__(self, fetch_page: FetchPage, process: Process, root: str | None = None):
+        self.root = root
+        self._fetch_page = fetch_page
+        self._process = process
+        self._windows: Dict[str, _Window] = {}
+        self._flight = SingleFlight(fresh_ttl=REFRESH_S)
+
+    async def window(self, query: str) -> _Window:
+        """Article window for `query`, refreshed at most every REFRESH_S."""
+        if query not in self._windows:
+            await self._flight.do(("load", query), lambda: self._load(query))
+        w = self._windows[query]
+        if time.time() >= w.retry_at:
+            try:
+                await self._flight.do(query, lambda: self._refresh(query, w))
+            except Exception as e:
+                if not (w.synced_at or w.articles):
+                    raise
+                print(f"[NEWS] Refresh of {query!r} failed, serving {len(w.articles)} stored articles: {e}")
+        elif not (w.synced_at or w.articles):
+            raise RuntimeError(f"NewsAPI unavailable: {w.stats['last_error']}")
+        w.expire(time.time())
+        return w
+
+    # ── Refresh ────────────────────────────────────────────────────────────
+
+    async def _refresh(self, query: str, w: _Window) -> None:
+        now = time.time()
+        w.expire(now)
+        try:
+            if w.watermark:
+                await self._incremental(query, w)
+            else:
+                await self._backfill(query, w, now)
+        except Exception as e:
+            w.stats["errors"] += 1
+            w.stats["last_error"] = str(e)
+            w.retry_at = time.time() + RETRY_S
+            raise
+        w.synced_at = time.time()
+        w.retry_at = 0.0
+        if self.root:
+            await asyncio.to_thread(self._persist, query, w)
+
+    async def _pages(self, query: str, w: _Window, since: float, max_pages: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """(articles published since `since`, newest first; False if `max_pages` was not enough)."""
+        articles: List[Dict[str, Any]] = []
+        for page in range(1, max_pages + 1):
+            try:
+                payload = await self._fetch_page(
+                    {"q": query, "from": _iso(since), "sortBy": "publishedAt", "pageSize": PAGE_SIZE, "page": page}
+                )
+            except Exception as e:
+                # Past the first page (e.g. the plan's result cap), keep what came back
+                if page == 1:
+                    raise
+                print(f"[NEWS] {query!r} page {page} failed, keeping {len(articles)} articles: {e}")
+                return articles, False
+            w.stats["requests"] += 1
+            batch = payload.get("articles") or []
+            articles.extend(batch)
+            total = payload.get("totalResults")
+            if len(batch) < PAGE_SIZE or (isinstance(total, int) and page * PAGE_SIZE >= total):
+                return articles, True
+        return articles, False
+
+    async def _incremental(self, query: str, w: _Window) -> None:
+        """Merge articles published since the watermark."""
+        articles, complete = await self._pages(query, w, w.watermark - OVERLAP_S, INCREMENTAL_PAGES)
+        if not complete:
+            w.stats["truncated"] += 1
+            print(f"[NEWS] {query!r} has more than {INCREMENTAL_PAGES * PAGE_SIZE} new articles; keeping the newest")
+        self._merge(w, articles)
+        w.stats["incremental"] += 1
+
+    async def _backfill(self, query: str, w: _Window, now: float) -> None:
+        articles, complete = await self._pages(query, w, now - WINDOW_H * 3600, BACKFILL_PAGES)
+        if not complete:
+            w.stats["truncated"] += 1
+            print(f"[NEWS] {query!r} has more than {BACKFILL_PAGES * PAGE_SIZE} articles in {WINDOW_H}h; keeping the newest")
+        self._merge(w, articles)
+        w.backfilled_at = time.time()
+        w.stats["backfills"] += 1
+
+    def _merge(self, w: _Window, articles: List[Dict[str, Any]]) -> None:
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for raw in articles:
+            key = _article_key(raw)
+            if key in w.seen or key in fresh:
+                w.stats["duplicates"] += 1
+            else:
+                fresh[key] = raw
+        if not fresh:
+            return
+        now = time.time()
+        raws = list(fresh.values())
+        for key, raw, record in zip(fresh, raws, self._process(raws)):
+            ts = _timestamp(raw.get("publishedAt"))
+            if ts is not None:
+                ts = min(ts, now)
+                w.watermark = max(w.watermark, ts)
+            # Undated articles count as published when first seen, without moving the watermark
+            w.add(key, now if ts is None else ts, record)
+        w.stats["new"] += len(fresh)
+
+    # ── Disk tier ──────────────────────────────────────────────────────────
+
+    def _path(self, query: str) -> str:
+        digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root or "", f"news-{digest}.json")
+
+    async def _load(self, query: str) -> None:
+        w = _Window()
+        if self.root:
+            stored = await asyncio.to_thread(self._read, query)
+            if stored is not None and stored.get("query") == query:
+                records = stored.get("articles", {})
+                for key, ts in stored.get("seen", {}).items():
+                    w.add(key, float(ts), records.get(key))
+                w.watermark = float(stored.get("watermark") or 0.0)
+                w.expire(time.time())
+        self._windows[query] = w
+
+    def _read(self, query: str) -> Dict[str, Any] | None:
+        try:
+            with open(self._path(query), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _persist(self, query: str, w: _Window) -> None:
+        os.makedirs(self.root or "", exist_ok=True)
+        path = self._path(query)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"query": query, "watermark": w.watermark, "seen": w.seen, "articles": w.articles}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[NEWS] Could not persist {query!r}: {e}")
+
+    # ── Stats ──────────────────────────────────────────────────────────────
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            query: {
+                **w.stats,
+                "articles": len(w.articles),
+                "seen": len(w.seen),
+                "watermark": _iso(w.watermark) if w.watermark else None,
+                "age_s": round(now - w.synced_at, 1) if w.synced_at else None,
+            }
+            for query, w in self._windows.items()
+        }
@@ -0,0 +1,230 @@
+"""
+Polymarket Sync – local, incrementally updated Polymarket market catalog.
+
+The first sync pages through every active market (PAGE_SIZE per request).
+After that a refresh asks for markets ordered by updatedAt, newest first,
+and stops at the first page reaching back past the watermark (latest
+updatedAt seen), so a refresh is normally a single request. Markets that
+closed or went inactive are dropped. A full resync every FULL_SYNC_S catches
+markets that expired without an update; an incremental pass that falls too
+far behind turns into a full sync as well.
+
+Every stored market is indexed under the terms its question contains, as
+whole words with their inflections and demonyms (see keyword_matcher: "war"
+is not found in "Warriors", "iran" is in "Iranian"), so keyword / conflict
+lookups are set unions instead of catalog scans and coverage does not
+depend on the API page size.
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Set, Tuple
+
+from .keyword_matcher import KeywordMatcher
+from .singleflight import SingleFlight
+
+# Markets per request (Gamma API maximum)
+PAGE_SIZE = int(os.getenv("POLYMARKET_PAGE_SIZE", "500"))
+# Safety cap for a full sync
+MAX_PAGES = 200
+# Incremental passes needing more pages than this resync fully
+INCREMENTAL_PAGES = 5
+# Minimum seconds between upstream refreshes
+REFRESH_S = float(os.getenv("POLYMARKET_REFRESH", "60"))
+FULL_SYNC_S = float(os.getenv("POLYMARKET_FULL_SYNC", str(6 * 3600)))
+# Re-read updates this many seconds before the watermark (clock skew, equal timestamps)
+OVERLAP_S = 300
+
+# fetch_page(params) → list of raw Gamma market objects
+FetchPage = Callable[[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]]
+
+
+def _safe_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def market_probability(market: Dict[str, Any]) -> float:
+    """Highest outcome price, used as the implied conflict probability."""
+    prices = market.get("outcomePrices") or market.get("prices") or []
+    if isinstance(prices, str):
+        # Gamma returns outcomePrices as a JSON-encoded list
+        try:
+            prices = json.loads(prices)
+        except ValueError:
+            pass
+    if not isinstance(prices, list):
+        prices = [prices]
+
+    probs = [v for v in (_safe_float(p) for p in prices) if v is not None]
+    return max(probs) if probs else 0.0
+
+
+def market_volume(market: Dict[str, Any]) -> float:
+    for key in ("volume", "volume24hr", "volume24h", "liquidity"):
+        if key in market:
+            val = _safe_float(market[key])
+            if val is not None:
+                return val
+    return 0.0
+
+
+def _question(market: Dict[str, Any]) -> str | None:
+    question = market.get("question") or market.get("title") or market.get("name")
+    return question if isinstance(question, str) else None
+
+
+def _updated_at(market: Dict[str, Any]) -> float:
+    value = market.get("updatedAt") or market.get("updated_at")
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class MarketCatalog:
+    def __init__(self, fetch_page: FetchPage, terms: Iterable[str]):
+        self._fetch_page = fetch_page
+        self._matcher = KeywordMatcher({"term": sorted({t.lower() for t in terms})}, whole_words=True)
+        self.terms: Tuple[str, ...] = self._matcher.keywords
+        # market id → {"id", "question", "probability", "volume", "updated_at"}
+        self._markets: Dict[str, Dict[str, Any]] = {}
+        # term → market ids, and the reverse for updates
+        self._index: Dict[str, Set[str]] = {t: set() for t in self.terms}
+        self._terms_of: Dict[str, Tuple[str, ...]] = {}
+        self._watermark = 0.0
+        self._full_synced_at = 0.0
+        self._synced_at = 0.0
+        self._flight = SingleFlight(fresh_ttl=REFRESH_S)
+        self.stats: Dict[str, Any] = {
+            "full_syncs": 0, "incremental_syncs": 0, "truncated": 0, "pages": 0, "updated": 0, "removed": 0,
+        }
+
+    # ── Refresh ────────────────────────────────────────────────────────────
+
+    async def sync(self) -> "MarketCatalog":
+        """Bring the catalog up to date (at most every REFRESH_S)."""
+        await self._flight.do("catalog", self._sync)
+        return self
+
+    async def _sync(self) -> None:
+        if time.time() - self._full_synced_at >= FULL_SYNC_S or not await self._incremental_sync():
+            await self._full_sync()
+        self._synced_at = time.time()
+
+    async def _pages(self, params: Dict[str, Any], max_pages: int, done: Callable[[List[Dict[str, Any]]], bool]) -> Tuple[List[Dict[str, Any]], bool]:
+        """(markets from consecutive pages until `done(page)`, False if `max_pages` was not enough)."""
+        markets: List[Dict[str, Any]] = []
+        for page in range(max_pages):
+            batch = await self._fetch_page({**params, "limit": PAGE_SIZE, "offset": page * PAGE_SIZE})
+            self.stats["pages"] += 1
+            markets.extend(batch)
+            if len(batch) < PAGE_SIZE or done(batch):
+                return markets, True
+        return markets, False
+
+    async def _full_sync(self) -> None:
+        markets, complete = await self._pages({"active": "true", "closed": "false"}, MAX_PAGES, lambda batch: False)
+        terms = self._matcher.keywords_batch([_question(m) or "" for m in markets])
+        if complete:
+            # Rebuild without awaiting so readers never see a half-built index
+            self._markets, self._terms_of, self._watermark = {}, {}, 0.0
+            self._index = {t: set() for t in self.terms}
+        else:
+            # Markets past the cap are not known to be gone; update on top of the current catalog
+            self.stats["truncated"] += 1
+            print(f"[POLYMARKET] Catalog larger than {MAX_PAGES * PAGE_SIZE} markets; kept the existing entries")
+        for market, market_terms in zip(markets, terms):
+            self._apply(market, market_terms)
+        self._full_synced_at = time.time()
+        self.stats["full_syncs"] += 1
+
+    async def _incremental_sync(self) -> bool:
+        """Apply markets updated since the watermark; False if a full sync is needed instead."""
+        if not self._full_synced_at:
+            return False
+        since = self._watermark - OVERLAP_S
+        changed, complete = await self._pages(
+            {"order": "updatedAt", "ascending": "false"},
+            INCREMENTAL_PAGES,
+            lambda batch: _updated_at(batch[-1]) <= since,
+        )
+        if not complete:
+            return False
+        for market, terms in zip(changed, self._matcher.keywords_batch([_question(m) or "" for m in changed])):
+            self._apply(market, terms)
+        self.stats["incremental_syncs"] += 1
+        return True
+
+    def _apply(self, raw: Dict[str, Any], terms: Set[str]) -> None:
+        market_id = str(raw.get("id") or raw.get("conditionId") or "")
+        if not market_id:
+            return
+        updated_at = _updated_at(raw)
+        self._watermark = max(self._watermark, updated_at)
+
+        question = _question(raw)
+        if raw.get("closed") or raw.get("archived") or raw.get("active") is False or question is None:
+            if self._remove(market_id):
+                self.stats["removed"] += 1
+            return
+
+        self._remove(market_id)
+        self._markets[market_id] = {
+            "id": market_id,
+            "question": question,
+            "probability": market_probability(raw),
+            "volume": market_volume(raw),
+            "updated_at": updated_at,
+        }
+        for term in terms:
+            self._index[term].add(market_id)
+        self._terms_of[market_id] = tuple(terms)
+        self.stats["updated"] += 1
+
+    def _remove(self, market_id: str) -> bool:
+        if self._markets.pop(market_id, None) is None:
+            return False
+        for term in self._terms_of.pop(market_id, ()):
+            self._index[term].discard(market_id)
+        return True
+
+    # ── Queries ────────────────────────────────────────────────────────────
+
+    @property
+    def synced(self) -> bool:
+        return self._full_synced_at > 0
+
+    def age(self) -> float | None:
+        return time.time() - self._synced_at if self._synced_at else None
+
+    def lookup(self, terms: Iterable[str]) -> List[Dict[str, Any]]:
+        """Markets whose question contains any of `terms`; unindexed terms fall back to a scan."""
+        ids: Set[str] = set()
+        unindexed: List[str] = []
+        for term in {" ".join(t.lower().split()) for t in terms}:
+            if term in self._index:
+                ids |= self._index[term]
+            else:
+                unindexed.append(term)
+        if unindexed:
+            matcher = KeywordMatcher({"term": unindexed}, whole_words=True)
+            ids.update(mid for mid, m in self._markets.items() if matcher.any(m["question"]))
+        return [self._markets[mid] for mid in ids]
+
+    def snapshot(self) -> Dict[str, Any]:
+        age = self.age()
+        return {
+            **self.stats,
+            "markets": len(self._markets),
+            "indexed": sum(1 for terms in self._terms_of.values() if terms),
+            "age_s": None if age is None else round(age, 1),
+            "watermark": datetime.fromtimestamp(self._watermark, tz=timezone.utc).isoformat() if self._watermark else None,
+            "terms": {t: len(ids) for t, ids in self._index.items() if ids},
+        }
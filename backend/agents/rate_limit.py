@@ -0,0 +1,42 @@
+"""
+Rate Limit – token bucket shared by the upstream clients with request quotas.
+
+Callers reserve a token synchronously and sleep off any deficit, so
+concurrent callers queue in arrival order instead of racing for refills.
+`pause()` empties the bucket when an upstream reports we are over quota.
+"""
+import asyncio
+import time
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """Requests per second with bursts up to `capacity`; waiters queue by reservation."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self.stats: Dict[str, Any] = {"acquired": 0, "waited": 0, "waited_s": 0.0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # Reserve synchronously; a negative balance is the queue of callers ahead
+        self._refill()
+        self._tokens -= 1
+        self.stats["acquired"] += 1
+        if self._tokens < 0:
+            wait = -self._tokens / self.rate
+            self.stats["waited"] += 1
+            self.stats["waited_s"] = round(self.stats["waited_s"] + wait, 3)
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """No tokens for the next `seconds` (upstream says we are over quota)."""
+        self._refill()
+        self._tokens = min(self._tokens, 1.0 - self.rate * seconds)
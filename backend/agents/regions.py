@@ -0,0 +1,50 @@
+"""
+Regions – conflict → geographic region mapping shared by the agents.
+
+GEOINT uses the bboxes for FIRMS area queries, SIGINT for ADS-B tiling and
+vessel queries, so every agent reports on the same area for a conflict.
+FININT looks up prediction markets by the conflict keywords of a region, and
+SOCMINT picks a region's Telegram channels and subreddits.
+"""
+from typing import Dict, List
+
+# Region bounding boxes
+REGIONS: Dict[str, Dict[str, float]] = {
+    "middle_east": {"lat_min": 20, "lat_max": 40, "lon_min": 35, "lon_max": 65},
+    "eastern_europe": {"lat_min": 44, "lat_max": 55, "lon_min": 22, "lon_max": 40},
+    "east_asia": {"lat_min": 20, "lat_max": 45, "lon_min": 100, "lon_max": 130},
+    "africa": {"lat_min": -5, "lat_max": 25, "lon_min": 20, "lon_max": 45},
+}
+
+DEFAULT_REGION = "middle_east"
+
+# Conflict name keywords per region (also used to index prediction markets)
+CONFLICT_KEYWORDS: Dict[str, List[str]] = {
+    "middle_east": ["iran", "israel", "gaza", "yemen", "syria", "iraq"],
+    "eastern_europe": ["ukraine", "russia", "donbas", "belarus"],
+    "east_asia": ["taiwan", "china", "korea", "myanmar"],
+    "africa": ["sudan", "ethiopia", "drc", "sahel", "mali"],
+}
+
+
+def conflict_region(conflict: str) -> str:
+    cl = conflict.lower()
+    for region, keywords in CONFLICT_KEYWORDS.items():
+        if any(k in cl for k in keywords):
+            return region
+    return DEFAULT_REGION
+
+
+def point_region(lat: float, lon: float) -> str | None:
+    for name, bbox in REGIONS.items():
+        if in_bbox(bbox, lat, lon):
+            return name
+    return None
+
+
+def in_bbox(bbox: Dict[str, float], lat: float, lon: float) -> bool:
+    return bbox["lat_min"] <= lat <= bbox["lat_max"] and bbox["lon_min"] <= lon <= bbox["lon_max"]
+
+
+def region_label(region: str) -> str:
+    return region.replace("_", " ").title()
@@ -0,0 +1,86 @@
+"""
+Sentiment – batch keyword sentiment over document arrays.
+
+N documents are scored with one KeywordMatcher scan and held as parallel
+NumPy columns: escalation and de-escalation keyword counts, the normalized
+score (net count capped at ±MAX_NET, scaled to [-1, 1]) and a label code.
+Aggregates – mean sentiment, per-label counts – are array reductions; dicts
+are only built for the documents a response returns.
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .keyword_matcher import KeywordMatcher
+
+# Label codes (index into SENTIMENT_LABELS)
+LABEL_NEUTRAL, LABEL_ESCALATORY, LABEL_DE_ESCALATORY = 0, 1, 2
+SENTIMENT_LABELS = ("NEUTRAL", "ESCALATORY", "DE-ESCALATORY")
+
+# Net keyword count that maps to a score of ±1
+MAX_NET = 3
+# |score| above this is escalatory / de-escalatory
+LABEL_THRESHOLD = 0.2
+
+_LABEL_ARRAY = np.array(SENTIMENT_LABELS)
+
+
+def normalized_scores(escalation: np.ndarray, de_escalation: np.ndarray) -> np.ndarray:
+    net = np.asarray(escalation, dtype=np.int64) - np.asarray(de_escalation, dtype=np.int64)
+    return np.clip(net, -MAX_NET, MAX_NET) / MAX_NET
+
+
+def label_codes(scores: np.ndarray) -> np.ndarray:
+    return np.where(
+        scores > LABEL_THRESHOLD, LABEL_ESCALATORY,
+        np.where(scores < -LABEL_THRESHOLD, LABEL_DE_ESCALATORY, LABEL_NEUTRAL),
+    ).astype(np.int8)
+
+
+def label_counts(codes: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(codes, minlength=len(SENTIMENT_LABELS))
+    return {label: int(counts[i]) for i, label in enumerate(SENTIMENT_LABELS)}
+
+
+def label_sentiment(score: float) -> str:
+    if score > LABEL_THRESHOLD:
+        return "ESCALATORY"
+    if score < -LABEL_THRESHOLD:
+        return "DE-ESCALATORY"
+    return "NEUTRAL"
+
+
+class SentimentBatch:
+    __slots__ = ("escalation", "de_escalation", "scores", "codes")
+
+    def __init__(self, escalation: np.ndarray, de_escalation: np.ndarray):
+        self.escalation = np.asarray(escalation, dtype=np.int32)
+        self.de_escalation = np.asarray(de_escalation, dtype=np.int32)
+        self.scores = normalized_scores(self.escalation, self.de_escalation)
+        self.codes = label_codes(self.scores)
+
+    @classmethod
+    def from_texts(
+        cls,
+        matcher: KeywordMatcher,
+        texts: Sequence[str],
+        escalation: str = "escalation",
+        de_escalation: str = "de_escalation",
+    ) -> "SentimentBatch":
+        """Score `texts` with the matcher's `escalation` / `de_escalation` categories."""
+        counts = matcher.count_batch(texts)
+        return cls(counts[:, matcher.categories.index(escalation)], counts[:, matcher.categories.index(de_escalation)])
+
+    def __len__(self) -> int:
+        return int(self.scores.shape[0])
+
+    @property
+    def labels(self) -> np.ndarray:
+        return _LABEL_ARRAY[self.codes]
+
+    def overall(self) -> float:
+        """Mean score; 0.0 for an empty batch."""
+        return float(self.scores.mean()) if len(self) else 0.0
+
+    def label_counts(self) -> Dict[str, int]:
+        return label_counts(self.codes)
@@ -1,44 +1,49 @@
 import asyncio
+import math
+import os
+import time
+import weakref
+from functools import partial
 from typing import Any, Dict, List, Tuple
 
 import httpx
 
-
-ADSB_URL = "https://opendata.adsb.fi/api/v2/lat/27.0/lon/55.0/dist/250"
+from .classifiers import classify_aircraft, is_warship
+from .collectors import latest_snapshot, register_collector
+from .hedge import HedgedFetch
+from .http_pool import HttpClientPool, get_http_pool, run_with_pool
+from .rate_limit import TokenBucket
+from .regions import REGIONS, conflict_region, in_bbox, region_label
+from .singleflight import SingleFlight
+from .source_cache import SOURCE_CACHE, cached_source
+from .track_store import TRACK_STORE
+
+
+ADSB_BASE = "https://opendata.adsb.fi/api/v2"
+# Largest radius one ADS-B query may ask for
+ADSB_MAX_NM = 250
+# adsb.fi asks for about one request per second per client; bursts of a region's tiles
+ADSB_RATE_PER_S = float(os.getenv("SIGINT_ADSB_RATE", "1"))
+ADSB_BURST = float(os.getenv("SIGINT_ADSB_BURST", "5"))
+ADSB_CONCURRENCY = int(os.getenv("SIGINT_ADSB_CONCURRENCY", "4"))
+# Seconds without requests after a 429
+ADSB_THROTTLE_PAUSE_S = 10.0
+# Direct (no collector snapshot) fetches return whatever tiles arrived by then
+ADSB_DIRECT_BUDGET_S = float(os.getenv("SIGINT_ADSB_BUDGET", "6"))
 VESSELFINDER_URL = "https://www.vesselfinder.com/api/pub/vesselsonmap"
 MARINETRAFFIC_URL = "https://www.marinetraffic.com/getData/get_data_json_4"
 
-MILITARY_CALLSIGNS = [
-    "RCH",
-    "USAF",
-    "NAVY",
-    "DUKE",
-    "REACH",
-    "JAKE",
-    "EVAC",
-    "GTMO",
-    "SAM",
-    "AIR1",
-    "AIR2",
-]
-
-SURVEILLANCE_TYPES = [
-    "RC-135",
-    "E-3",
-    "E-8",
-    "P-8",
-    "EP-3",
-    "RQ-4",
-    "MQ-9",
-    "U-2",
-    "E-6",
-]
-
-TANKER_TYPES = [
-    "KC-135",
-    "KC-10",
-    "KC-46",
-]
+# Background poll cadence (seconds); see collectors.py. A region's ADS-B poll
+# is never scheduled faster than its tiles pass the rate limit.
+ADSB_POLL_S = float(os.getenv("SIGINT_ADSB_POLL", "10"))
+VESSEL_POLL_S = float(os.getenv("SIGINT_VESSEL_POLL", "60"))
+# Vessel providers: auto | immediate | off | <seconds>; see hedge.py
+VESSEL_HEDGE = os.getenv("VESSEL_HEDGE", "auto")
+VESSEL_HEDGE_DELAY_S = float(os.getenv("VESSEL_HEDGE_DELAY", "2.0"))
+# Seconds to wait for the losing provider so both results can be merged
+VESSEL_HEDGE_GRACE_S = float(os.getenv("VESSEL_HEDGE_GRACE", "0"))
+# Pollers for a region pause once it has not been analyzed for this long
+REGION_IDLE_S = float(os.getenv("SIGINT_REGION_IDLE", "900"))
 
 
 def _safe_float(value: Any) -> float | None:
@@ -48,12 +53,61 @@ def _safe_float(value: Any) -> float | None:
         return None
 
 
-async def _fetch_adsb_aircraft(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
-    try:
-        resp = await client.get(ADSB_URL)
-        resp.raise_for_status()
-    except httpx.HTTPError:
-        return []
+def _adsb_tiles(bbox: Dict[str, float], radius_nm: float = ADSB_MAX_NM) -> List[Tuple[float, float]]:
+    """
+    Centres of radius-`radius_nm` circles that together cover the bbox.
+
+    The box is cut into equal rows; each row into the fewest columns whose
+    cells still fit inside one circle, measured at the row's widest latitude.
+    """
+    lat_span_nm = (bbox["lat_max"] - bbox["lat_min"]) * 60
+    rows = max(1, math.ceil(lat_span_nm / (radius_nm * math.sqrt(2))))
+    row_nm = lat_span_nm / rows
+    cell_width_nm = math.sqrt(max(4 * radius_nm ** 2 - row_nm ** 2, 1.0))
+
+    tiles: List[Tuple[float, float]] = []
+    for r in range(rows):
+        lat0 = bbox["lat_min"] + r * row_nm / 60
+        lat1 = lat0 + row_nm / 60
+        widest_lat = 0.0 if lat0 <= 0 <= lat1 else min(abs(lat0), abs(lat1))
+        width_nm = (bbox["lon_max"] - bbox["lon_min"]) * 60 * math.cos(math.radians(widest_lat))
+        cols = max(1, math.ceil(width_nm / cell_width_nm))
+        step = (bbox["lon_max"] - bbox["lon_min"]) / cols
+        for c in range(cols):
+            tiles.append((round((lat0 + lat1) / 2, 3), round(bbox["lon_min"] + (c + 0.5) * step, 3)))
+    return tiles
+
+
+# Shared by every region's tiles, pollers and direct fetches alike
+ADSB_GOVERNOR = TokenBucket(ADSB_RATE_PER_S, capacity=ADSB_BURST)
+# In-flight adsb.fi requests, per event loop (sync entrypoints run private loops)
+_ADSB_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _adsb_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _ADSB_SLOTS.get(loop)
+    if slots is None:
+        slots = _ADSB_SLOTS[loop] = asyncio.Semaphore(ADSB_CONCURRENCY)
+    return slots
+
+
+# A poller and a direct fetch of the same region share in-flight tile requests
+_ADSB_INFLIGHT = SingleFlight()
+
+
+async def _request_adsb_tile(client: httpx.AsyncClient, tile: Tuple[float, float]) -> List[Dict[str, Any]]:
+    return await _ADSB_INFLIGHT.do(tile, lambda: _get_adsb_tile(client, tile))
+
+
+async def _get_adsb_tile(client: httpx.AsyncClient, tile: Tuple[float, float]) -> List[Dict[str, Any]]:
+    lat, lon = tile
+    async with _adsb_slots():
+        await ADSB_GOVERNOR.acquire()
+        resp = await client.get(f"{ADSB_BASE}/lat/{lat}/lon/{lon}/dist/{ADSB_MAX_NM}")
+    if resp.status_code == 429:
+        ADSB_GOVERNOR.pause(ADSB_THROTTLE_PAUSE_S)
+    resp.raise_for_status()
     data = resp.json()
 
     # ADSB.fi may return a dict with "ac" or "aircraft" or a bare list
@@ -66,23 +120,55 @@ async def _fetch_adsb_aircraft(client: httpx.AsyncClient) -> List[Dict[str, Any]
     return []
 
 
-def _classify_aircraft(callsign: str, ac_type: str) -> str | None:
-    cs_upper = callsign.upper()
-    type_upper = ac_type.upper()
+@cached_source("adsb", key=lambda client, tile: tile)
+async def _fetch_adsb_tile(client: httpx.AsyncClient, tile: Tuple[float, float]) -> List[Dict[str, Any]]:
+    # Errors propagate so a failed tile is never cached as "no aircraft"
+    return await _request_adsb_tile(client, tile)
 
-    if any(cs_upper.startswith(prefix) for prefix in MILITARY_CALLSIGNS):
-        # Callsigns like RCH, REACH, etc are usually transport or tanker
-        if any(t in type_upper for t in TANKER_TYPES):
-            return "tanker"
-        return "transport"
 
-    if any(t in type_upper for t in SURVEILLANCE_TYPES):
-        return "surveillance"
+def _merge_tiles(tiles: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Union of overlapping tile results; one record per airframe."""
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for records in tiles:
+        for ac in records:
+            hex_id = str(ac.get("hex") or ac.get("icao24") or "").strip().lower()
+            key = hex_id or (ac.get("flight") or ac.get("callsign"), ac.get("lat"), ac.get("lon"))
+            merged.setdefault(key, ac)
+    return list(merged.values())
 
-    if any(t in type_upper for t in TANKER_TYPES):
-        return "tanker"
 
-    return None
+async def _region_aircraft(
+    client: httpx.AsyncClient, region: str, fetch_tile=_fetch_adsb_tile, budget: float | None = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    All tiles of the region (concurrently, within the adsb.fi rate limit),
+    deduplicated, plus tile coverage: {"tiles", "fetched", "failed", "pending",
+    "complete"}. With a `budget` (seconds) tiles still queued behind the rate
+    limit are left to finish in the background – into the tile cache – and
+    reported as pending. If no tile arrived, coverage also carries the error.
+    """
+    bbox = REGIONS[region]
+    tasks = [asyncio.ensure_future(fetch_tile(client, t)) for t in _adsb_tiles(bbox)]
+    done, pending = await asyncio.wait(tasks, timeout=budget)
+    errors = [t.exception() for t in done if t.exception() is not None]
+    tiles = [t.result() for t in done if t.exception() is None]
+    coverage: Dict[str, Any] = {
+        "tiles": len(tasks),
+        "fetched": len(tiles),
+        "failed": len(errors),
+        "pending": len(pending),
+        "complete": len(tiles) == len(tasks),
+    }
+    if not tiles:
+        for task in pending:
+            task.cancel()
+        coverage["error"] = repr(errors[0]) if errors else f"no ADS-B tile within {budget}s"
+        print(f"[SIGINT] {region}: no ADS-B data: {coverage['error']}")
+        return [], coverage
+    if errors:
+        print(f"[SIGINT] {region}: {len(errors)}/{len(tasks)} ADS-B tiles failed: {errors[0]!r}")
+    aircraft = _filter_aircraft(_merge_tiles(tiles))
+    return [ac for ac in aircraft if in_bbox(bbox, ac["lat"], ac["lon"])], coverage
 
 
 def _extract_aircraft_position(raw: Dict[str, Any]) -> Tuple[float | None, float | None, int | None]:
@@ -107,7 +193,7 @@ def _filter_aircraft(aircraft_raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]
         callsign = (
             (ac.get("flight") or ac.get("callsign") or ac.get("cs") or "").strip()
         )
-        ac_type = (
+        ac_type = str(
             ac.get("type")
             or ac.get("t")
             or ac.get("aircraft_type")
@@ -118,7 +204,8 @@ def _filter_aircraft(aircraft_raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]
         if not callsign and not ac_type:
             continue
 
-        category = _classify_aircraft(callsign, ac_type)
+        # Cached per airframe; repeat sightings are a dict lookup
+        category = classify_aircraft(callsign, ac_type)
         if category is None:
             continue
 
@@ -140,19 +227,7 @@ def _filter_aircraft(aircraft_raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     return results
 
 
-async def _fetch_vessels_vesselfinder(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
-    # Public "vesselsonmap" endpoint used by the website; format is not formally documented,
-    # so we treat it as best-effort JSON.
-    try:
-        resp = await client.get(VESSELFINDER_URL, params={"bbox": "48,22,62,30"})
-        resp.raise_for_status()
-    except httpx.HTTPError:
-        return []
-    try:
-        data = resp.json()
-    except ValueError:
-        return []
-
+def _vessel_list(data: Any) -> List[Dict[str, Any]]:
     if isinstance(data, list):
         return data
     if isinstance(data, dict):
@@ -162,68 +237,64 @@ async def _fetch_vessels_vesselfinder(client: httpx.AsyncClient) -> List[Dict[st
     return []
 
 
-async def _fetch_vessels_marinetraffic(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
-    try:
-        resp = await client.get(MARINETRAFFIC_URL)
-        resp.raise_for_status()
-    except httpx.HTTPError:
-        return []
-    try:
-        data = resp.json()
-    except ValueError:
-        return []
+async def _fetch_vessels_vesselfinder(pool: HttpClientPool, region: str) -> List[Dict[str, Any]]:
+    # Public "vesselsonmap" endpoint used by the website; format is not formally documented,
+    # so we treat it as best-effort JSON.
+    bbox = REGIONS[region]
+    area = f"{bbox['lon_min']},{bbox['lat_min']},{bbox['lon_max']},{bbox['lat_max']}"
+    resp = await pool.client("vesselfinder").get(VESSELFINDER_URL, params={"bbox": area})
+    resp.raise_for_status()
+    return _vessel_list(resp.json())
 
-    if isinstance(data, list):
-        return data
-    if isinstance(data, dict):
-        for key in ("vessels", "data", "rows"):
-            if isinstance(data.get(key), list):
-                return data[key]
-    return []
 
+async def _fetch_vessels_marinetraffic(pool: HttpClientPool, region: str) -> List[Dict[str, Any]]:
+    # No bbox parameter; _region_ships clips the result
+    resp = await pool.client("marinetraffic").get(MARINETRAFFIC_URL)
+    resp.raise_for_status()
+    return _vessel_list(resp.json())
 
-async def _fetch_ships(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
-    # Try VesselFinder first, fall back to MarineTraffic if it fails
-    try:
-        vessels = await _fetch_vessels_vesselfinder(client)
-        if vessels:
-            return vessels
-    except httpx.HTTPError:
-        pass
 
-    try:
-        vessels = await _fetch_vessels_marinetraffic(client)
-        return vessels
-    except httpx.HTTPError:
-        return []
+def _vessel_key(v: Dict[str, Any]) -> Any:
+    ais = v.get("AIS") if isinstance(v.get("AIS"), dict) else {}
+    mmsi = v.get("mmsi") or v.get("MMSI") or ais.get("MMSI")
+    if mmsi:
+        return str(mmsi)
+    name = str(v.get("name") or v.get("NAME") or v.get("shipname") or v.get("SHIPNAME") or ais.get("NAME") or "")
+    lat, lon = _extract_ship_position(v)
+    return name.strip().lower(), round(lat or 0.0, 2), round(lon or 0.0, 2)
 
 
-def _is_warship(name: str, ship_type: str) -> bool:
-    name_l = name.lower()
-    type_l = ship_type.lower()
+def _merge_vessels(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for vessels in results:
+        for v in vessels:
+            merged.setdefault(_vessel_key(v), v)
+    return list(merged.values())
 
-    keywords = [
-        "warship",
-        "military",
-        "destroyer",
-        "frigate",
-        "corvette",
-        "carrier",
-        "aircraft carrier",
-        "navy",
-        "patrol boat",
-        "patrol vessel",
-    ]
 
-    for kw in keywords:
-        if kw in name_l or kw in type_l:
-            return True
+VESSEL_PROVIDERS = HedgedFetch(
+    [("vesselfinder", _fetch_vessels_vesselfinder), ("marinetraffic", _fetch_vessels_marinetraffic)],
+    merge=_merge_vessels,
+    mode=VESSEL_HEDGE,
+    default_delay=VESSEL_HEDGE_DELAY_S,
+    grace=VESSEL_HEDGE_GRACE_S,
+)
 
-    # Common hull prefixes
-    if any(prefix in name for prefix in ("USS ", "HMS ", "FS ", "FREMM ")):
-        return True
 
-    return False
+async def _request_ships(pool: HttpClientPool, region: str) -> List[Dict[str, Any]]:
+    # Hedged: the secondary provider starts once the primary is slower than usual
+    return await VESSEL_PROVIDERS.fetch(pool, region)
+
+
+@cached_source("vessels", key=lambda pool, region: region)
+async def _fetch_ships(pool: HttpClientPool, region: str) -> List[Dict[str, Any]]:
+    return await _request_ships(pool, region)
+
+
+def _region_ships(vessels_raw: List[Dict[str, Any]], region: str) -> List[Dict[str, Any]]:
+    # MarineTraffic has no bbox parameter, so clip every provider's result
+    bbox = REGIONS[region]
+    return [s for s in _filter_ships(vessels_raw) if in_bbox(bbox, s["lat"], s["lon"])]
 
 
 def _extract_ship_position(raw: Dict[str, Any]) -> Tuple[float | None, float | None]:
@@ -264,7 +335,7 @@ def _filter_ships(vessels_raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not name and not ship_type:
             continue
 
-        if not _is_warship(name, ship_type):
+        if not is_warship(name, ship_type):
             continue
 
         lat, lon = _extract_ship_position(v)
@@ -297,23 +368,26 @@ def _compute_sigint_score(aircraft: List[Dict[str, Any]], ships: List[Dict[str,
     return max(0.0, min(100.0, score))
 
 
-def _build_summary(aircraft: List[Dict[str, Any]], ships: List[Dict[str, Any]], score: float) -> str:
+def _build_summary(aircraft: List[Dict[str, Any]], ships: List[Dict[str, Any]], score: float, region: str) -> str:
     num_aircraft = len(aircraft)
     num_warships = len(ships)
     return (
         f"{num_aircraft} military-relevant aircraft detected, "
-        f"{num_warships} likely warships in region. "
+        f"{num_warships} likely warships in {region_label(region)}. "
         f"SIGINT activity score: {score:.1f}."
     )
 
 
-def _build_alerts(aircraft: List[Dict[str, Any]], ships: List[Dict[str, Any]]) -> List[str]:
+def _build_alerts(aircraft: List[Dict[str, Any]], ships: List[Dict[str, Any]], region: str) -> List[str]:
     alerts: List[str] = []
 
     for ac in aircraft:
         category = ac.get("category")
         ac_type = str(ac.get("type") or "").upper()
         callsign = ac.get("callsign") or "Unknown"
+        if ac.get("orbiting"):
+            minutes = round((ac.get("loiter_s") or 0) / 60)
+            alerts.append(f"{ac_type or 'Aircraft'} ({callsign}) orbiting for {minutes} min - persistent ISR/refuelling pattern.")
         if category == "surveillance":
             alerts.append(f"{ac_type or 'Surveillance aircraft'} ({callsign}) detected - active ISR mission.")
         elif category == "tanker":
@@ -321,7 +395,7 @@ def _build_alerts(aircraft: List[Dict[str, Any]], ships: List[Dict[str, Any]]) -
 
     for ship in ships:
         name = ship.get("name") or "Warship"
-        alerts.append(f"{name} detected in Persian Gulf - naval presence heightened.")
+        alerts.append(f"{name} detected in {region_label(region)} - naval presence heightened.")
 
     # Deduplicate while preserving order and avoid overly long lists
     seen = set()
@@ -336,36 +410,112 @@ def _build_alerts(aircraft: List[Dict[str, Any]], ships: List[Dict[str, Any]]) -
     return unique_alerts
 
 
-async def _run_sigint_agent_async(conflict: str) -> Dict[str, Any]:  # conflict kept for interface symmetry
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        aircraft_raw, ships_raw = await asyncio.gather(
-            _fetch_adsb_aircraft(client),
-            _fetch_ships(client),
-        )
+# ── Feeds ──────────────────────────────────────────────────────────────────
+
+# region → last time an analysis asked for it
+_REGION_DEMAND: Dict[str, float] = {}
+
+
+def _region_active(region: str) -> bool:
+    return time.time() - _REGION_DEMAND.get(region, 0.0) <= REGION_IDLE_S
+
+
+async def _poll_adsb_tile(client: httpx.AsyncClient, tile: Tuple[float, float]) -> List[Dict[str, Any]]:
+    # Always fetched; published to the tile cache so direct fetches reuse it
+    records = await _request_adsb_tile(client, tile)
+    SOURCE_CACHE.put("adsb", tile, records)
+    return records
+
+
+async def _poll_aircraft(region: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    aircraft, coverage = await _region_aircraft(get_http_pool().client("adsb"), region, fetch_tile=_poll_adsb_tile)
+    if not coverage["fetched"]:
+        # Keep the previous snapshot rather than publishing an empty sky
+        raise RuntimeError(coverage["error"])
+    TRACK_STORE.update(aircraft)
+    return aircraft, coverage
+
 
-    aircraft = _filter_aircraft(aircraft_raw)
-    ships = _filter_ships(ships_raw)
+async def _poll_ships(region: str) -> List[Dict[str, Any]]:
+    return _region_ships(await _request_ships(get_http_pool(), region), region)
+
+
+for _region, _bbox in REGIONS.items():
+    _adsb_poll_s = max(ADSB_POLL_S, len(_adsb_tiles(_bbox)) / ADSB_RATE_PER_S)
+    register_collector(f"adsb:{_region}", _adsb_poll_s, partial(_poll_aircraft, _region), partial(_region_active, _region))
+    register_collector(f"vessels:{_region}", VESSEL_POLL_S, partial(_poll_ships, _region), partial(_region_active, _region))
+
+
+async def _current_aircraft(
+    pool: HttpClientPool, region: str
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any], float | None]:
+    """Latest collector snapshot, or a direct (cached) fetch when no poller has one."""
+    snapshot = latest_snapshot(f"adsb:{region}")
+    if snapshot is not None:
+        (aircraft, coverage), age = snapshot
+        return aircraft, coverage, age
+    aircraft, coverage = await _region_aircraft(pool.client("adsb"), region, budget=ADSB_DIRECT_BUDGET_S)
+    TRACK_STORE.update(aircraft)
+    return aircraft, coverage, None
+
+
+async def _current_ships(pool: HttpClientPool, region: str) -> Tuple[List[Dict[str, Any]], float | None]:
+    snapshot = latest_snapshot(f"vessels:{region}")
+    if snapshot is not None:
+        return snapshot
+    return _region_ships(await _fetch_ships(pool, region), region), None
+
+
+async def arun_sigint_agent(conflict: str) -> Dict[str, Any]:
+    region = conflict_region(conflict)
+    _REGION_DEMAND[region] = time.time()
+
+    pool = get_http_pool()
+    (aircraft, adsb_coverage, adsb_age), (ships, vessels_age) = await asyncio.gather(
+        _current_aircraft(pool, region),
+        _current_ships(pool, region),
+    )
+
+    # Attach per-airframe history (loiter, orbit, first/last seen)
+    aircraft = TRACK_STORE.annotate(aircraft)
 
     sigint_score = _compute_sigint_score(aircraft, ships)
-    summary = _build_summary(aircraft, ships, sigint_score)
-    alerts = _build_alerts(aircraft, ships)
+    summary = _build_summary(aircraft, ships, sigint_score, region)
+    if not adsb_coverage["fetched"]:
+        summary += " ADS-B unavailable; aircraft not assessed."
+    elif not adsb_coverage["complete"]:
+        summary += f" ADS-B coverage partial ({adsb_coverage['fetched']}/{adsb_coverage['tiles']} tiles)."
+    alerts = _build_alerts(aircraft, ships, region)
 
     return {
         "conflict": conflict,
+        "region": region,
         "aircraft": aircraft,
         "ships": ships,
         "sigint_score": sigint_score,
         "summary": summary,
         "alerts": alerts,
+        "tracked_airframes": len(TRACK_STORE),
+        "adsb_coverage": adsb_coverage,
+        # Seconds since the background poll; None when fetched directly
+        "feed_age_s": {
+            "adsb": None if adsb_age is None else round(adsb_age, 1),
+            "vessels": None if vessels_age is None else round(vessels_age, 1),
+        },
     }
 
 
+def vessel_provider_stats() -> Dict[str, Any]:
+    return VESSEL_PROVIDERS.snapshot()
+
+
 def run_sigint_agent(conflict: str) -> Dict[str, Any]:
     """
     Public sync entrypoint for the SIGINT agent.
 
-    Uses async httpx under the hood but exposes a synchronous API
-    for consistency with other agents.
+    Runs arun_sigint_agent on a private event loop; for callers that are
+    not already inside one (scripts, tests). The supervisor awaits
+    arun_sigint_agent directly.
     """
-    return asyncio.run(_run_sigint_agent_async(conflict))
+    return run_with_pool(arun_sigint_agent, conflict)
 
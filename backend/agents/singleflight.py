@@ -0,0 +1,81 @@
+"""
+Single-flight – coalesce concurrent identical async calls.
+
+Callers that ask for the same key while a call is in flight await that call
+instead of starting their own. A just-finished result is reused for
+`fresh_ttl` seconds, so a burst of requests arriving right after completion
+does not trigger another run either.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    def __init__(self, fresh_ttl: float = 0.0):
+        self.fresh_ttl = fresh_ttl
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._fresh: Dict[Hashable, Tuple[float, Any]] = {}
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "fresh_hits": 0,
+            "errors": 0,
+        }
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Future, bool]:
+        """
+        Join or start the call for `key` without yielding to the event loop.
+
+        Returns (future, leader). `leader` is True only when this caller's
+        `fn` is the one being executed.
+        """
+        self.stats["calls"] += 1
+
+        hit = self._fresh.get(key)
+        if hit is not None and time.monotonic() - hit[0] <= self.fresh_ttl:
+            self.stats["fresh_hits"] += 1
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(hit[1])
+            return future, False
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return inflight, False
+
+        self.stats["executions"] += 1
+        task = asyncio.ensure_future(self._run(key, fn))
+        self._inflight[key] = task
+        return task, True
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future, _ = self.start(key, fn)
+        # Shield so one caller going away does not cancel work others await
+        return await asyncio.shield(future)
+
+    def busy(self, key: Hashable) -> bool:
+        """True if a call for `key` is in flight or a fresh result exists."""
+        if key in self._inflight:
+            return True
+        hit = self._fresh.get(key)
+        return hit is not None and time.monotonic() - hit[0] <= self.fresh_ttl
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**self.stats, "in_flight": len(self._inflight)}
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fn()
+        except BaseException:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        now = time.monotonic()
+        if self.fresh_ttl > 0:
+            self._fresh = {k: v for k, v in self._fresh.items() if now - v[0] <= self.fresh_ttl}
+            self._fresh[key] = (now, value)
+        return value
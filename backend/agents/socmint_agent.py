@@ -1,17 +1,31 @@
 """
-SOCMINT Agent - LangChain Tool-Calling Agent
+SOCMINT Agent - Telegram, Reddit and RSS signal collection
+
+Default (SOCMINT_MODE=native) runs all three collectors concurrently and
+computes counts, sentiment and score in code; SOCMINT_LLM_SUMMARY=1 adds one
+Haiku call that ranks/summarizes a compact digest. SOCMINT_MODE=llm runs the
+original LangChain tool-calling loop.
 """
 import asyncio
+import json
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from functools import lru_cache
+from itertools import compress
+from typing import Any, Dict, List, Sequence, Tuple
 
 import feedparser
-import httpx
+import numpy as np
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 from langchain_core.tools import tool
 
+from .http_pool import get_http_pool, run_with_pool
+from .keyword_matcher import KeywordMatcher
+from .regions import conflict_region
+from .sentiment import SentimentBatch, label_codes, label_counts
+from .source_cache import SOURCE_CACHE
+
 TELEGRAM_CHANNELS = {
     "middle_east": ["intelslava", "MiddleEastSpectator", "OSINTdefender"],
     "eastern_europe": ["intelslava", "ukraine_now", "osint_ua"],
@@ -30,14 +44,8 @@ RSS_FEEDS = [
 ]
 ESCALATION_KW = ["attack","strike","missile","war","explosion","killed","military","nuclear","threat","troops","airstrike"]
 DE_ESCALATION_KW = ["ceasefire","talks","diplomatic","deal","agreement","peace","negotiate"]
-
-def _region(conflict):
-    cl = conflict.lower()
-    if any(k in cl for k in ["iran","israel","gaza","yemen","syria"]): return "middle_east"
-    if any(k in cl for k in ["ukraine","russia","donbas"]): return "eastern_europe"
-    if any(k in cl for k in ["taiwan","china","korea"]): return "east_asia"
-    if any(k in cl for k in ["sudan","ethiopia","sahel"]): return "africa"
-    return "middle_east"
+SOCMINT_MODE = os.getenv("SOCMINT_MODE", "native")
+SOCMINT_LLM_SUMMARY = os.getenv("SOCMINT_LLM_SUMMARY", "0") == "1"
 
 def _keywords(conflict):
     cl = conflict.lower()
@@ -47,16 +55,22 @@ def _keywords(conflict):
     if "taiwan" in cl: return ["taiwan","china","pla","strait"]
     return cl.split() or ["conflict"]
 
-def _sentiment(text):
-    lower = text.lower()
-    s = sum(1 for k in ESCALATION_KW if k in lower) - sum(1 for k in DE_ESCALATION_KW if k in lower)
-    return 0.0 if s == 0 else max(-3, min(3, s)) / 3.0
+SENTIMENT_MATCHER = KeywordMatcher({"escalation": ESCALATION_KW, "de_escalation": DE_ESCALATION_KW})
 
-@tool
-def scrape_telegram_channels(conflict: str) -> List[Dict[str, Any]]:
-    """Scrape public Telegram channels for conflict-related posts."""
+@lru_cache(maxsize=64)
+def _relevance_matcher(kw: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher({"conflict": kw})
+
+def _score_posts(texts: Sequence[str], kw: List[str]) -> List[Tuple[int, float, str]]:
+    """(index, sentiment score, label) of the texts mentioning a conflict keyword; sentiment is
+    escalation minus de-escalation keywords, capped at ±3, scaled to [-1, 1]."""
+    relevant = list(compress(range(len(texts)), _relevance_matcher(tuple(kw)).any_batch(texts)))
+    batch = SentimentBatch.from_texts(SENTIMENT_MATCHER, [texts[i] for i in relevant])
+    return list(zip(relevant, batch.scores.tolist(), batch.labels.tolist()))
+
+async def _collect_telegram(conflict: str) -> List[Dict[str, Any]]:
     import re
-    channels = TELEGRAM_CHANNELS.get(_region(conflict), TELEGRAM_CHANNELS["middle_east"])
+    channels = TELEGRAM_CHANNELS.get(conflict_region(conflict), TELEGRAM_CHANNELS["middle_east"])
     kw = _keywords(conflict)
     async def _fetch(client, ch):
         try:
@@ -64,92 +78,170 @@ def scrape_telegram_channels(conflict: str) -> List[Dict[str, Any]]:
             if resp.status_code != 200: return []
             msgs = re.findall(r'<div class="tgme_widget_message_text[^"]*"[^>]*>(.*?)</div>', resp.text, re.DOTALL)
             clean = [re.sub(r'<[^>]+>', '', m).strip() for m in msgs]
+            texts = [t for t in clean[:10] if len(t) >= 20]
             results = []
-            for text in clean[:10]:
-                if len(text) < 20 or not any(k in text.lower() for k in kw): continue
-                sc = _sentiment(text)
-                results.append({"source": f"telegram:{ch}", "text": text[:300], "sentiment_score": sc,
-                    "sentiment_label": "ESCALATORY" if sc > 0.2 else "DE-ESCALATORY" if sc < -0.2 else "NEUTRAL", "platform": "telegram"})
+            for i, sc, label in _score_posts(texts, kw):
+                results.append({"source": f"telegram:{ch}", "text": texts[i][:300], "sentiment_score": sc,
+                    "sentiment_label": label, "platform": "telegram"})
             return results
         except: return []
-    async def _run():
-        async with httpx.AsyncClient(timeout=10.0, headers={"User-Agent": "Mozilla/5.0"}) as client:
-            results = await asyncio.gather(*[_fetch(client, ch) for ch in channels], return_exceptions=True)
-            return [p for r in results if isinstance(r, list) for p in r]
-    try: return asyncio.run(_run())
+    async def _collect():
+        client = get_http_pool().client("telegram")
+        results = await asyncio.gather(*[_fetch(client, ch) for ch in channels], return_exceptions=True)
+        return [p for r in results if isinstance(r, list) for p in r]
+    try: return await SOURCE_CACHE.get("telegram", (tuple(channels), tuple(kw)), _collect)
     except Exception as e: return [{"error": str(e)}]
 
 @tool
-def search_reddit(conflict: str, limit: int = 20) -> List[Dict[str, Any]]:
-    """Search Reddit for recent conflict-related posts."""
-    subreddits = REDDIT_SUBREDDITS.get(_region(conflict), ["geopolitics","worldnews"])
+async def scrape_telegram_channels(conflict: str) -> List[Dict[str, Any]]:
+    """Scrape public Telegram channels for conflict-related posts."""
+    return await _collect_telegram(conflict)
+
+async def _collect_reddit(conflict: str, limit: int = 20) -> List[Dict[str, Any]]:
+    subreddits = REDDIT_SUBREDDITS.get(conflict_region(conflict), ["geopolitics","worldnews"])
     kw = _keywords(conflict)
     async def _fetch(client, sr):
         try:
             resp = await client.get(f"https://www.reddit.com/r/{sr}/new.json", params={"limit": limit})
             resp.raise_for_status()
             cutoff = datetime.now(timezone.utc) - timedelta(hours=48)
-            results = []
+            recent = []
             for post in resp.json().get("data", {}).get("children", []):
                 p = post.get("data", {})
                 created = datetime.fromtimestamp(p.get("created_utc", 0), tz=timezone.utc)
-                if created < cutoff: continue
+                if created >= cutoff: recent.append((p, created, f"{p.get('title', '')} {p.get('selftext', '')}"))
+            results = []
+            for i, sc, label in _score_posts([c for _, _, c in recent], kw):
+                p, created, _ = recent[i]
                 title = p.get("title", ""); text = p.get("selftext", "")
-                combined = f"{title} {text}".lower()
-                if not any(k in combined for k in kw): continue
-                sc = _sentiment(combined)
                 results.append({"source": f"reddit:r/{sr}", "title": title, "text": text[:200],
                     "url": f"https://reddit.com{p.get('permalink','')}", "upvotes": p.get("score", 0),
-                    "sentiment_score": sc, "sentiment_label": "ESCALATORY" if sc > 0.2 else "DE-ESCALATORY" if sc < -0.2 else "NEUTRAL",
+                    "sentiment_score": sc, "sentiment_label": label,
                     "platform": "reddit", "published_at": created.isoformat()})
             return results
         except: return []
-    async def _run():
-        async with httpx.AsyncClient(timeout=10.0, headers={"User-Agent": "DigitalWarRoom/1.0"}) as client:
-            results = await asyncio.gather(*[_fetch(client, sr) for sr in subreddits], return_exceptions=True)
-            posts = [p for r in results if isinstance(r, list) for p in r]
-            return sorted(posts, key=lambda x: x.get("upvotes", 0), reverse=True)[:20]
-    try: return asyncio.run(_run())
+    async def _collect():
+        client = get_http_pool().client("reddit")
+        results = await asyncio.gather(*[_fetch(client, sr) for sr in subreddits], return_exceptions=True)
+        posts = [p for r in results if isinstance(r, list) for p in r]
+        return sorted(posts, key=lambda x: x.get("upvotes", 0), reverse=True)[:20]
+    try: return await SOURCE_CACHE.get("reddit", (tuple(subreddits), tuple(kw), limit), _collect)
     except Exception as e: return [{"error": str(e)}]
 
 @tool
-def fetch_rss_feeds(conflict: str) -> List[Dict[str, Any]]:
-    """Fetch RSS feeds for conflict-related content."""
+async def search_reddit(conflict: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Search Reddit for recent conflict-related posts."""
+    return await _collect_reddit(conflict, limit)
+
+async def _collect_rss(conflict: str) -> List[Dict[str, Any]]:
     import calendar
     kw = _keywords(conflict)
     cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-    results = []
-    for url in RSS_FEEDS:
+    async def _fetch(client, url):
+        resp = await client.get(url, follow_redirects=True)
+        resp.raise_for_status()
+        return feedparser.parse(resp.content)
+    # Feeds are conflict-independent, so cache them per URL and filter below
+    client = get_http_pool().client("rss")
+    feeds = await asyncio.gather(*[SOURCE_CACHE.get("rss", url, lambda url=url: _fetch(client, url)) for url in RSS_FEEDS],
+        return_exceptions=True)
+    entries = []
+    for url, feed in zip(RSS_FEEDS, feeds):
+        if isinstance(feed, BaseException): continue
         try:
-            feed = feedparser.parse(url)
             for entry in feed.entries[:20]:
-                title = entry.get("title", ""); summary = entry.get("summary", "")
-                combined = f"{title} {summary}".lower()
-                if not any(k in combined for k in kw): continue
                 published = None
                 if hasattr(entry, "published_parsed") and entry.published_parsed:
                     try: published = datetime.fromtimestamp(calendar.timegm(entry.published_parsed), tz=timezone.utc)
                     except: pass
                 if published and published < cutoff: continue
-                sc = _sentiment(combined)
-                results.append({"source": f"rss:{feed.feed.get('title', url)}", "title": title,
-                    "summary": summary[:200], "url": entry.get("link", ""), "sentiment_score": sc,
-                    "sentiment_label": "ESCALATORY" if sc > 0.2 else "DE-ESCALATORY" if sc < -0.2 else "NEUTRAL",
-                    "platform": "rss", "published_at": published.isoformat() if published else ""})
+                entries.append((feed.feed.get("title", url), entry, published))
         except: continue
+    # Score every feed's entries in one batch
+    scored = _score_posts([f"{e.get('title', '')} {e.get('summary', '')}" for _, e, _ in entries], kw)
+    results = []
+    for i, sc, label in scored:
+        feed_title, entry, published = entries[i]
+        title = entry.get("title", ""); summary = entry.get("summary", "")
+        results.append({"source": f"rss:{feed_title}", "title": title,
+            "summary": summary[:200], "url": entry.get("link", ""), "sentiment_score": sc,
+            "sentiment_label": label,
+            "platform": "rss", "published_at": published.isoformat() if published else ""})
     return results[:20]
 
+@tool
+async def fetch_rss_feeds(conflict: str) -> List[Dict[str, Any]]:
+    """Fetch RSS feeds for conflict-related content."""
+    return await _collect_rss(conflict)
+
 SOCMINT_TOOLS = [scrape_telegram_channels, search_reddit, fetch_rss_feeds]
 SOCMINT_SYSTEM = """You are a SOCMINT analyst. Call all three tools, then return ONLY valid JSON:
 {"telegram_posts":[...],"reddit_posts":[...],"rss_articles":[...],"total_signals":<n>,"escalatory_count":<n>,"de_escalatory_count":<n>,"overall_sentiment":<-1 to 1>,"socmint_score":<0-100>,"top_signals":["..."],"summary":"..."}"""
 
-def run_socmint_agent(conflict: str) -> Dict[str, Any]:
+def _empty_result(conflict: str) -> Dict[str, Any]:
+    return {"conflict": conflict, "telegram_posts": [], "reddit_posts": [], "rss_articles": [],
+        "total_signals": 0, "escalatory_count": 0, "de_escalatory_count": 0,
+        "overall_sentiment": 0.0, "socmint_score": 30.0, "top_signals": [], "summary": "SOCMINT data unavailable."}
+
+def _compute_socmint_score(overall_sentiment: float, escalatory: int, total: int) -> float:
+    # Base 30 (neutral chatter), sentiment shifts up to ±30, +2 per escalatory
+    # post (max +20), +10 once volume passes 20 signals
+    score = 30.0 + overall_sentiment * 30.0 + min(escalatory * 2.0, 20.0)
+    if total > 20: score += 10.0
+    return max(0.0, min(100.0, score))
+
+def _signal_text(post: Dict[str, Any]) -> str:
+    text = post.get("title") or post.get("text") or ""
+    return f"[{post.get('source', post.get('platform', '?'))}] {text[:140]}"
+
+def _build_socmint_result(conflict: str, telegram: List[Dict[str, Any]], reddit: List[Dict[str, Any]],
+        rss: List[Dict[str, Any]]) -> Dict[str, Any]:
+    posts = telegram + reddit + rss
+    scores = np.array([p.get("sentiment_score", 0.0) for p in posts], dtype=np.float64)
+    by_label = label_counts(label_codes(scores))
+    escalatory, de_escalatory = by_label["ESCALATORY"], by_label["DE-ESCALATORY"]
+    overall = float(scores.mean()) if posts else 0.0
+    score = _compute_socmint_score(overall, escalatory, len(posts))
+    ranked = sorted(posts, key=lambda p: (abs(p.get("sentiment_score", 0.0)), p.get("upvotes", 0)), reverse=True)
+    return {"conflict": conflict, "telegram_posts": telegram, "reddit_posts": reddit, "rss_articles": rss,
+        "total_signals": len(posts), "escalatory_count": escalatory, "de_escalatory_count": de_escalatory,
+        "overall_sentiment": overall, "socmint_score": score, "top_signals": [_signal_text(p) for p in ranked[:5]],
+        "summary": f"{len(posts)} social signals ({len(telegram)} Telegram, {len(reddit)} Reddit, {len(rss)} RSS); "
+            f"{escalatory} escalatory, {de_escalatory} de-escalatory. SOCMINT score: {score:.1f}."}
+
+async def _llm_rank(result: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Optional single Haiku call: rank the strongest signals and summarize a compact digest."""
+    digest = {k: result[k] for k in ("total_signals", "escalatory_count", "de_escalatory_count", "overall_sentiment")}
+    digest["candidates"] = [_signal_text(p) for p in (result["telegram_posts"] + result["reddit_posts"] + result["rss_articles"])[:30]]
+    model = ChatAnthropic(model="claude-haiku-4-5-20251001", temperature=0)
+    try:
+        response = await model.ainvoke([SystemMessage(content='You are a SOCMINT analyst. From the candidates pick the 5 most '
+            'significant signals and summarize. Return ONLY valid JSON: {"top_signals":["..."],"summary":"..."}'),
+            HumanMessage(content=json.dumps(digest, default=str))])
+        content = response.content
+        if isinstance(content, list): content = " ".join(c.get("text","") if isinstance(c,dict) else str(c) for c in content)
+        return json.loads(content)
+    except: return None
+
+async def _arun_socmint_native(conflict: str) -> Dict[str, Any]:
+    collected = await asyncio.gather(_collect_telegram(conflict), _collect_reddit(conflict), _collect_rss(conflict),
+        return_exceptions=True)
+    telegram, reddit, rss = ([p for p in posts if "error" not in p] if isinstance(posts, list) else [] for posts in collected)
+    result = _build_socmint_result(conflict, telegram, reddit, rss)
+    if SOCMINT_LLM_SUMMARY and result["total_signals"]:
+        ranked = await _llm_rank(result)
+        if ranked:
+            result["top_signals"] = list(ranked.get("top_signals") or result["top_signals"])[:5]
+            result["summary"] = str(ranked.get("summary") or result["summary"])
+    return result
+
+async def _arun_socmint_llm(conflict: str) -> Dict[str, Any]:
     """Run SOCMINT agent with LangChain tool-calling."""
-    import json
     model = ChatAnthropic(model="claude-haiku-4-5-20251001", temperature=0).bind_tools(SOCMINT_TOOLS)
+    tool_map = {t.name: t for t in SOCMINT_TOOLS}
     messages = [SystemMessage(content=SOCMINT_SYSTEM), HumanMessage(content=f"Monitor social media for conflict: {conflict}")]
     for _ in range(6):
-        response = model.invoke(messages)
+        response = await model.ainvoke(messages)
         messages.append(response)
         if not response.tool_calls:
             try:
@@ -157,11 +249,18 @@ def run_socmint_agent(conflict: str) -> Dict[str, Any]:
                 if isinstance(content, list): content = " ".join(c.get("text","") if isinstance(c,dict) else str(c) for c in content)
                 result = json.loads(content); result["conflict"] = conflict; return result
             except: break
-        for tc in response.tool_calls:
-            tool_map = {t.name: t for t in SOCMINT_TOOLS}
-            fn = tool_map.get(tc["name"])
-            if fn:
-                messages.append(ToolMessage(content=json.dumps(fn.invoke(tc.get("args",{})), default=str), tool_call_id=tc["id"]))
-    return {"conflict": conflict, "telegram_posts": [], "reddit_posts": [], "rss_articles": [],
-        "total_signals": 0, "escalatory_count": 0, "de_escalatory_count": 0,
-        "overall_sentiment": 0.0, "socmint_score": 30.0, "top_signals": [], "summary": "SOCMINT data unavailable."}
+        # Tool calls issued in the same turn are independent – run them concurrently
+        calls = [(tc, tool_map[tc["name"]]) for tc in response.tool_calls if tc["name"] in tool_map]
+        outputs = await asyncio.gather(*[fn.ainvoke(tc.get("args",{})) for tc, fn in calls])
+        for (tc, _), out in zip(calls, outputs):
+            messages.append(ToolMessage(content=json.dumps(out, default=str), tool_call_id=tc["id"]))
+    return _empty_result(conflict)
+
+async def arun_socmint_agent(conflict: str) -> Dict[str, Any]:
+    """Run the SOCMINT agent in the configured mode (native by default)."""
+    if SOCMINT_MODE == "llm": return await _arun_socmint_llm(conflict)
+    return await _arun_socmint_native(conflict)
+
+def run_socmint_agent(conflict: str) -> Dict[str, Any]:
+    """Sync wrapper around arun_socmint_agent for callers outside an event loop."""
+    return run_with_pool(arun_socmint_agent, conflict)
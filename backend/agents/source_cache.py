@@ -0,0 +1,170 @@
+"""
+Source Cache – per-source TTL cache for upstream fetches.
+
+Upstreams refresh at very different rates (RSS feeds every few minutes,
+vessel positions by the minute, ADS-B by the second), so each source has its
+own freshness TTL plus a stale-while-revalidate window:
+
+- age <= ttl          → served from cache
+- age <= ttl + stale  → served from cache, refreshed in the background
+- otherwise           → fetched; concurrent misses share one fetch
+
+Entries live in a bounded LRU per source. Sources marked `disk` are also
+written as JSON under SOURCE_CACHE_DIR (if set) so a restarted worker starts
+warm; parsed RSS feeds are not plain JSON and stay in memory. Sources with
+history worth keeping have their own stores (firms_archive, commodity_cache,
+polymarket_sync, news_store).
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from cachetools import LRUCache
+
+from .singleflight import SingleFlight
+
+DEFAULT_POLICY: Dict[str, Any] = {"ttl": 60.0, "stale": 60.0, "maxsize": 64, "disk": False}
+
+# Seconds; override any TTL with CACHE_TTL_<SOURCE>, e.g. CACHE_TTL_RSS=600
+SOURCE_POLICIES: Dict[str, Dict[str, Any]] = {
+    # One entry per tile; every region's tiles fit
+    "adsb":         {"ttl": 10, "stale": 20, "maxsize": 96},
+    "vessels":      {"ttl": 60, "stale": 120, "maxsize": 16, "disk": True},
+    "telegram":     {"ttl": 120, "stale": 240, "maxsize": 64, "disk": True},
+    "reddit":       {"ttl": 120, "stale": 240, "maxsize": 64, "disk": True},
+    "rss":          {"ttl": 300, "stale": 600, "maxsize": 64},
+}
+
+
+def _policy(source: str) -> Dict[str, Any]:
+    policy = {**DEFAULT_POLICY, **SOURCE_POLICIES.get(source, {})}
+    override = os.getenv(f"CACHE_TTL_{source.upper()}")
+    if override:
+        policy["ttl"] = float(override)
+    return policy
+
+
+class SourceCache:
+    def __init__(self, disk_dir: str | None = None):
+        self.disk_dir = disk_dir
+        self._memory: Dict[str, LRUCache] = {}
+        self._flight = SingleFlight()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    async def get(
+        self,
+        source: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        policy = _policy(source)
+        counters = self.stats.setdefault(source, {"hits": 0, "stale_hits": 0, "misses": 0, "disk_hits": 0})
+        memory = self._store(source)
+
+        entry: Tuple[float, Any] | None = memory.get(key)
+        if entry is None and policy["disk"] and self.disk_dir:
+            entry = await asyncio.to_thread(self._disk_load, source, key)
+            if entry is not None:
+                counters["disk_hits"] += 1
+                memory[key] = entry
+
+        flight_key = (source, key)
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age <= policy["ttl"]:
+                counters["hits"] += 1
+                return entry[1]
+            if age <= policy["ttl"] + policy["stale"]:
+                counters["stale_hits"] += 1
+                future, leader = self._flight.start(flight_key, lambda: self._refresh(source, key, fetch, policy, cacheable))
+                if leader:
+                    future.add_done_callback(functools.partial(_report_refresh_error, source))
+                return entry[1]
+
+        counters["misses"] += 1
+        return await self._flight.do(flight_key, lambda: self._refresh(source, key, fetch, policy, cacheable))
+
+    def put(self, source: str, key: Hashable, value: Any) -> None:
+        """Store a value fetched elsewhere (e.g. by a background poller) as fresh, in memory only."""
+        self._store(source)[key] = (time.time(), value)
+
+    def _store(self, source: str) -> LRUCache:
+        return self._memory.setdefault(source, LRUCache(maxsize=_policy(source)["maxsize"]))
+
+    async def _refresh(
+        self,
+        source: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        policy: Dict[str, Any],
+        cacheable: Callable[[Any], bool] | None,
+    ) -> Any:
+        value = await fetch()
+        if cacheable is not None and not cacheable(value):
+            return value
+        entry = (time.time(), value)
+        self._store(source)[key] = entry
+        if policy["disk"] and self.disk_dir:
+            await asyncio.to_thread(self._disk_store, source, key, entry)
+        return value
+
+    # ── Disk tier ──────────────────────────────────────────────────────────
+
+    def _disk_path(self, source: str, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_dir or "", source, f"{digest}.json")
+
+    def _disk_load(self, source: str, key: Hashable) -> Tuple[float, Any] | None:
+        try:
+            with open(self._disk_path(source, key), encoding="utf-8") as f:
+                stored = json.load(f)
+            return float(stored["stored_at"]), stored["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _disk_store(self, source: str, key: Hashable, entry: Tuple[float, Any]) -> None:
+        path = self._disk_path(source, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": entry[0], "value": entry[1]}, f, default=str)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+
+def _report_refresh_error(source: str, future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        print(f"[CACHE] Background refresh failed – {source}: {future.exception()}")
+
+
+SOURCE_CACHE = SourceCache(disk_dir=os.getenv("SOURCE_CACHE_DIR") or None)
+
+
+def cached_source(
+    source: str,
+    key: Callable[..., Hashable],
+    cacheable: Callable[[Any], bool] | None = None,
+):
+    """
+    Decorate an async fetch function so its result is cached under `source`.
+    `key` receives the same arguments as the function (clients included)
+    and returns the cache key; results rejected by `cacheable` (e.g. rate
+    limit notices) are returned but not stored.
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await SOURCE_CACHE.get(source, key(*args, **kwargs), lambda: fn(*args, **kwargs), cacheable)
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    return {source: dict(counters) for source, counters in SOURCE_CACHE.stats.items()}
@@ -3,20 +3,27 @@ Supervisor – LangGraph Multi-Agent Orchestrator
 Coordinates FININT, SIGINT, NEWS, GEOINT, SOCMINT agents in parallel,
 then runs Claude Sonnet as the senior analyst for final assessment.
 """
+import asyncio
 import json
 import os
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, List, TypedDict
+import time
+from typing import Any, AsyncIterator, Dict, List, TypedDict
 
+from cachetools import LRUCache
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, StateGraph
 
-from .finint_agent import run_finint_agent
-from .geoint_agent import run_geoint_agent
-from .news_agent import run_news_agent
-from .sigint_agent import run_sigint_agent
-from .socmint_agent import run_socmint_agent
+from .change_detector import SynthesisCache, extract_features
+from .compaction import compact_payload
+from .finint_agent import arun_finint_agent
+from .geoint_agent import arun_geoint_agent
+from .http_pool import run_with_pool
+from .news_agent import arun_news_agent
+from .sigint_agent import arun_sigint_agent
+from .singleflight import SingleFlight
+from .socmint_agent import arun_socmint_agent
 
 
 # ── State ──────────────────────────────────────────────────────────────────
@@ -28,6 +35,8 @@ class AnalysisState(TypedDict, total=False):
     news_result: Dict[str, Any]
     geoint_result: Dict[str, Any]
     socmint_result: Dict[str, Any]
+    agent_status: Dict[str, str]
+    synthesis: Dict[str, Any]
     escalation_score: float
     threat_level: str
     key_findings: List[str]
@@ -37,35 +46,167 @@ class AnalysisState(TypedDict, total=False):
 
 # ── Intelligence Collection Node (all 5 agents in parallel) ───────────────
 
-def collection_node(state: AnalysisState) -> AnalysisState:
-    """Run all 5 intelligence agents in parallel."""
-    conflict = state.get("conflict") or ""
+AGENTS = {
+    "finint":  arun_finint_agent,
+    "sigint":  arun_sigint_agent,
+    "news":    arun_news_agent,
+    "geoint":  arun_geoint_agent,
+    "socmint": arun_socmint_agent,
+}
+
+# Latency budget for the whole collection phase and per-agent deadlines
+# (seconds, measured from the start of collection). Override per agent with
+# AGENT_DEADLINE_<NAME>, e.g. AGENT_DEADLINE_GEOINT=30.
+ANALYSIS_BUDGET_S = float(os.getenv("ANALYSIS_BUDGET", "25"))
+AGENT_DEADLINES = {
+    name: float(os.getenv(f"AGENT_DEADLINE_{name.upper()}", default))
+    for name, default in {"finint": 10, "sigint": 10, "news": 10, "geoint": 20, "socmint": 20}.items()
+}
+
+# Agent runs that outlive their deadline keep going in the background; the
+# next cycle joins them instead of starting another, and their result is
+# pushed to backfill listeners when it lands.
+_AGENT_TASKS: Dict[tuple, asyncio.Task] = {}
+_LATE_AGENTS: set = set()
+_LAST_GOOD: LRUCache = LRUCache(maxsize=256)
+_BACKFILL_LISTENERS: List[Any] = []
+
+
+def _conflict_key(conflict: str) -> str:
+    return " ".join(conflict.lower().split())
+
+
+def add_backfill_listener(callback) -> None:
+    """Register `async callback(conflict, stage, result)` for late agent results."""
+    _BACKFILL_LISTENERS.append(callback)
+
+
+def _agent_task(conflict: str, name: str, fn) -> asyncio.Task:
+    key = (_conflict_key(conflict), name)
+    task = _AGENT_TASKS.get(key)
+    if task is None or task.done():
+        task = asyncio.ensure_future(fn(conflict))
+        task.add_done_callback(lambda t: _on_agent_done(conflict, name, t))
+        _AGENT_TASKS[key] = task
+    return task
+
+
+def _on_agent_done(conflict: str, name: str, task: asyncio.Task) -> None:
+    key = (_conflict_key(conflict), name)
+    if _AGENT_TASKS.get(key) is task:
+        del _AGENT_TASKS[key]
+    if task.cancelled() or task.exception() is not None:
+        _LATE_AGENTS.discard(key)
+        return
+
+    result = task.result()
+    _LAST_GOOD[key] = (time.time(), result)
+    if key in _LATE_AGENTS:
+        _LATE_AGENTS.discard(key)
+        print(f"[SUPERVISOR] Late {name.upper()} result backfilled – conflict: {conflict}")
+        for callback in _BACKFILL_LISTENERS:
+            asyncio.ensure_future(callback(conflict, name, result))
+
+
+def _fallback_result(conflict: str, name: str, reason: str) -> tuple[Dict[str, Any], str]:
+    """Last good result marked stale, or a placeholder marked missing."""
+    last = _LAST_GOOD.get((_conflict_key(conflict), name))
+    if last is not None:
+        stored_at, result = last
+        return {**result, "stale": True, "stale_age_s": round(time.time() - stored_at, 1)}, "stale"
+    return {
+        "conflict": conflict,
+        "missing": True,
+        "summary": f"{name.upper()} data unavailable ({reason}).",
+    }, "missing"
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        finint_f  = executor.submit(run_finint_agent, conflict)
-        sigint_f  = executor.submit(run_sigint_agent, conflict)
-        news_f    = executor.submit(run_news_agent, conflict)
-        geoint_f  = executor.submit(run_geoint_agent, conflict)
-        socmint_f = executor.submit(run_socmint_agent, conflict)
 
-        finint_result  = finint_f.result()
-        sigint_result  = sigint_f.result()
-        news_result    = news_f.result()
-        geoint_result  = geoint_f.result()
-        socmint_result = socmint_f.result()
+async def collection_node(state: AnalysisState) -> AnalysisState:
+    """
+    Run all 5 intelligence agents concurrently on the current event loop.
+
+    Each agent result is emitted on the graph's custom stream as soon as it
+    completes, so streaming callers can render it before the slowest agent
+    (and the supervisor) has finished. Agents that miss their deadline or
+    fail are replaced by their last good result (stale) or a placeholder
+    (missing); the collection never waits past ANALYSIS_BUDGET.
+    """
+    conflict = state.get("conflict") or ""
+    writer = get_stream_writer()
+    results: Dict[str, Dict[str, Any]] = {}
+    statuses: Dict[str, str] = {}
+    started = time.monotonic()
+
+    async def _run(name: str, fn) -> None:
+        task = _agent_task(conflict, name, fn)
+        deadline = min(AGENT_DEADLINES[name], ANALYSIS_BUDGET_S)
+        remaining = max(0.0, deadline - (time.monotonic() - started))
+        try:
+            # shield: a missed deadline must not cancel the run we backfill from
+            results[name] = await asyncio.wait_for(asyncio.shield(task), timeout=remaining)
+            statuses[name] = "ok"
+        except asyncio.TimeoutError:
+            _LATE_AGENTS.add((_conflict_key(conflict), name))
+            print(f"[SUPERVISOR] {name.upper()} missed {deadline:.0f}s deadline – conflict: {conflict}")
+            results[name], statuses[name] = _fallback_result(conflict, name, "deadline exceeded")
+        except Exception as e:
+            print(f"[SUPERVISOR] {name.upper()} failed – conflict: {conflict}: {e}")
+            results[name], statuses[name] = _fallback_result(conflict, name, str(e))
+        writer({"stage": name, "conflict": conflict, "agent_status": statuses[name], "data": results[name]})
+
+    await asyncio.gather(*[_run(name, fn) for name, fn in AGENTS.items()])
 
     return {
-        "finint_result":  finint_result,
-        "sigint_result":  sigint_result,
-        "news_result":    news_result,
-        "geoint_result":  geoint_result,
-        "socmint_result": socmint_result,
+        **{f"{name}_result": result for name, result in results.items()},
+        "agent_status": statuses,
     }
 
 
 # ── Supervisor Node (Claude Sonnet as senior analyst) ─────────────────────
 
-def supervisor_node(state: AnalysisState) -> AnalysisState:
+SUPERVISOR_TIMEOUT_S = float(os.getenv("SUPERVISOR_TIMEOUT", "30"))
+
+# Last Sonnet synthesis per conflict; reused while agent inputs are unchanged
+_SYNTHESIS_CACHE = SynthesisCache()
+
+SYSTEM_PROMPT = """You are a senior intelligence analyst with access to 5 intelligence streams:
+- FININT: Financial markets and oil price indicators
+- SIGINT: Military aircraft and naval vessel movements  
+- NEWS: Open-source media sentiment analysis
+- GEOINT: Satellite thermal anomaly detection
+- SOCMINT: Social media signals from Telegram, Reddit, and RSS
+
+Analyze all streams holistically and return ONLY valid JSON with no markdown:
+{
+  "escalation_score": <number 0-100>,
+  "threat_level": <"MINIMAL"|"LOW"|"ELEVATED"|"HIGH"|"CRITICAL">,
+  "key_findings": [<array of concise finding strings>],
+  "scenarios": [{"description": <string>, "probability": <0-1>}],
+  "summary": "<2-3 sentence BLUF summary>"
+}"""
+
+
+async def _synthesize(user_payload: Dict[str, Any]) -> Dict[str, Any] | None:
+    """One Sonnet call; returns the parsed assessment or None on timeout/bad JSON."""
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        raise RuntimeError("ANTHROPIC_API_KEY is not set")
+
+    model = ChatAnthropic(model="claude-sonnet-4-6", temperature=0.1)
+
+    try:
+        msg = await asyncio.wait_for(model.ainvoke([
+            SystemMessage(content=SYSTEM_PROMPT),
+            HumanMessage(content=json.dumps(user_payload, default=str)),
+        ]), timeout=SUPERVISOR_TIMEOUT_S)
+        content = msg.content if hasattr(msg, "content") else str(msg)
+        if isinstance(content, list):
+            content = " ".join(c.get("text", "") if isinstance(c, dict) else str(c) for c in content)
+        return json.loads(content)
+    except (asyncio.TimeoutError, json.JSONDecodeError):
+        return None
+
+
+async def supervisor_node(state: AnalysisState) -> AnalysisState:
     """Claude Sonnet synthesizes all 5 intelligence streams into a final assessment."""
     conflict       = state.get("conflict") or ""
     finint_result  = state.get("finint_result") or {}
@@ -73,6 +214,7 @@ def supervisor_node(state: AnalysisState) -> AnalysisState:
     news_result    = state.get("news_result") or {}
     geoint_result  = state.get("geoint_result") or {}
     socmint_result = state.get("socmint_result") or {}
+    agent_status   = state.get("agent_status") or {}
 
     # Extract scores
     finint_score  = float(finint_result.get("escalation_score", 0.0))
@@ -83,70 +225,58 @@ def supervisor_node(state: AnalysisState) -> AnalysisState:
 
     # Weighted composite score
     # FININT 20% | SIGINT 25% | NEWS 20% | GEOINT 15% | SOCMINT 20%
-    combined_score = (
-        finint_score  * 0.20 +
-        sigint_score  * 0.25 +
-        news_score    * 0.20 +
-        geoint_score  * 0.15 +
-        socmint_score * 0.20
-    )
-
-    if not os.getenv("ANTHROPIC_API_KEY"):
-        raise RuntimeError("ANTHROPIC_API_KEY is not set")
-
-    model = ChatAnthropic(model="claude-sonnet-4-6", temperature=0.1)
-
-    system_prompt = """You are a senior intelligence analyst with access to 5 intelligence streams:
-- FININT: Financial markets and oil price indicators
-- SIGINT: Military aircraft and naval vessel movements  
-- NEWS: Open-source media sentiment analysis
-- GEOINT: Satellite thermal anomaly detection
-- SOCMINT: Social media signals from Telegram, Reddit, and RSS
-
-Analyze all streams holistically and return ONLY valid JSON with no markdown:
-{
-  "escalation_score": <number 0-100>,
-  "threat_level": <"MINIMAL"|"LOW"|"ELEVATED"|"HIGH"|"CRITICAL">,
-  "key_findings": [<array of concise finding strings>],
-  "scenarios": [{"description": <string>, "probability": <0-1>}],
-  "summary": "<2-3 sentence BLUF summary>"
-}"""
+    # Missing agents are left out and the remaining weights renormalized.
+    weighted = {
+        "finint":  (finint_score,  0.20),
+        "sigint":  (sigint_score,  0.25),
+        "news":    (news_score,    0.20),
+        "geoint":  (geoint_score,  0.15),
+        "socmint": (socmint_score, 0.20),
+    }
+    available = {n: sw for n, sw in weighted.items() if agent_status.get(n) != "missing"}
+    total_weight = sum(w for _, w in available.values())
+    combined_score = sum(sc * w for sc, w in available.values()) / total_weight if total_weight else 0.0
 
-    user_payload = {
-        "conflict": conflict,
-        "composite_score": combined_score,
-        "agent_scores": {
-            "finint": finint_score,
-            "sigint": sigint_score,
-            "news": news_score,
-            "geoint": geoint_score,
-            "socmint": socmint_score,
-        },
+    features = extract_features({
         "finint": finint_result,
         "sigint": sigint_result,
         "news": news_result,
         "geoint": geoint_result,
         "socmint": socmint_result,
-    }
-
-    msg = model.invoke([
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=json.dumps(user_payload, default=str)),
-    ])
-    content = msg.content if hasattr(msg, "content") else str(msg)
-    if isinstance(content, list):
-        content = " ".join(c.get("text", "") if isinstance(c, dict) else str(c) for c in content)
-
-    try:
-        parsed = json.loads(content)
-    except json.JSONDecodeError:
-        parsed = {
-            "escalation_score": combined_score,
-            "threat_level": "ELEVATED",
-            "key_findings": ["Failed to parse supervisor output."],
-            "scenarios": [],
-            "summary": "Supervisor synthesis failed; raw agent data available.",
+    }, agent_status)
+    parsed, synthesis_meta = _SYNTHESIS_CACHE.lookup(_conflict_key(conflict), features)
+
+    if parsed is None:
+        user_payload = {
+            "conflict": conflict,
+            "composite_score": combined_score,
+            "agent_status": agent_status,
+            "agent_scores": {
+                "finint": finint_score,
+                "sigint": sigint_score,
+                "news": news_score,
+                "geoint": geoint_score,
+                "socmint": socmint_score,
+            },
+            "finint": finint_result,
+            "sigint": sigint_result,
+            "news": news_result,
+            "geoint": geoint_result,
+            "socmint": socmint_result,
         }
+        # Send the supervisor a bounded digest, not every raw item
+        compact, synthesis_meta["payload"] = compact_payload(user_payload)
+        parsed = await _synthesize(compact)
+        if parsed is not None:
+            _SYNTHESIS_CACHE.store(_conflict_key(conflict), features, parsed)
+        else:
+            parsed = {
+                "escalation_score": combined_score,
+                "threat_level": "ELEVATED",
+                "key_findings": ["Failed to parse supervisor output."],
+                "scenarios": [],
+                "summary": "Supervisor synthesis failed; raw agent data available.",
+            }
 
     threat_level = str(parsed.get("threat_level", "MINIMAL"))
     key_findings = list(parsed.get("key_findings") or [])
@@ -176,6 +306,7 @@ Analyze all streams holistically and return ONLY valid JSON with no markdown:
         "key_findings": key_findings,
         "scenarios": scenarios,
         "summary": summary,
+        "synthesis": synthesis_meta,
     }
 
 
@@ -194,9 +325,7 @@ def build_graph():
 _COMPILED_GRAPH = build_graph()
 
 
-def analyze_conflict(conflict: str) -> Dict[str, Any]:
-    """Public entrypoint – runs all 5 agents then supervisor synthesis."""
-    result = _COMPILED_GRAPH.invoke({"conflict": conflict})
+def _response_from_state(conflict: str, result: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "conflict": conflict,
         "finint":   result.get("finint_result", {}),
@@ -204,9 +333,70 @@ def analyze_conflict(conflict: str) -> Dict[str, Any]:
         "news":     result.get("news_result", {}),
         "geoint":   result.get("geoint_result", {}),
         "socmint":  result.get("socmint_result", {}),
+        "agent_status":     result.get("agent_status", {}),
         "escalation_score": result.get("escalation_score", 0.0),
         "threat_level":     result.get("threat_level", "MINIMAL"),
         "key_findings":     result.get("key_findings", []),
         "scenarios":        result.get("scenarios", []),
         "summary":          result.get("summary", ""),
+        "synthesis":        result.get("synthesis", {}),
     }
+
+
+# Concurrent callers for the same conflict share one pipeline run; a result
+# finished within the freshness window is handed out again as-is.
+ANALYSIS_FRESH_TTL_S = float(os.getenv("ANALYSIS_FRESH_TTL", "15"))
+_ANALYSIS_FLIGHT = SingleFlight(fresh_ttl=ANALYSIS_FRESH_TTL_S)
+
+
+async def _run_analysis(conflict: str) -> Dict[str, Any]:
+    result = await _COMPILED_GRAPH.ainvoke({"conflict": conflict})
+    return _response_from_state(conflict, result)
+
+
+async def aanalyze_conflict(conflict: str) -> Dict[str, Any]:
+    """Public entrypoint – runs all 5 agents then supervisor synthesis."""
+    result = await _ANALYSIS_FLIGHT.do(_conflict_key(conflict), lambda: _run_analysis(conflict))
+    # Callers share the result object; hand each one its own top level
+    return {**result, "conflict": conflict}
+
+
+def analyze_conflict(conflict: str) -> Dict[str, Any]:
+    """Sync wrapper around aanalyze_conflict for callers outside an event loop."""
+    return run_with_pool(aanalyze_conflict, conflict)
+
+
+async def astream_conflict(conflict: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming entrypoint – yields one message per agent as it completes,
+    e.g. {"stage": "sigint", "conflict": ..., "data": {...}}, followed by
+    the full analysis tagged {"stage": "supervisor", ...}.
+
+    If an analysis for the same conflict is already in flight (or just
+    finished), only the shared final result is yielded.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _run() -> Dict[str, Any]:
+        try:
+            final: Dict[str, Any] = {}
+            async for mode, chunk in _COMPILED_GRAPH.astream({"conflict": conflict}, stream_mode=["custom", "values"]):
+                if mode == "custom":
+                    queue.put_nowait(chunk)
+                else:
+                    final = chunk
+            return _response_from_state(conflict, final)
+        finally:
+            queue.put_nowait(None)
+
+    future, leader = _ANALYSIS_FLIGHT.start(_conflict_key(conflict), _run)
+    if leader:
+        while (message := await queue.get()) is not None:
+            yield message
+    result = await asyncio.shield(future)
+    yield {"stage": "supervisor", **result, "conflict": conflict}
+
+
+def analysis_stats() -> Dict[str, int]:
+    """Single-flight counters for analyze_conflict (calls, coalesced, ...)."""
+    return _ANALYSIS_FLIGHT.snapshot()
@@ -0,0 +1,164 @@
+"""
+Track Store – rolling per-airframe history across SIGINT cycles.
+
+Every SIGINT cycle feeds its classified aircraft in; each airframe (ICAO hex,
+or callsign when the feed has no hex) keeps a bounded ring buffer of recent
+positions. That history yields first/last seen, loiter time and orbit
+detection (ISR racetracks) without extra upstream calls.
+
+Memory is bounded twice: TRACK_POINTS positions per airframe and MAX_TRACKS
+airframes. Tracks not updated for TRACK_STALE_S seconds are dropped;
+tracks are kept in least-recently-updated order, so eviction only touches
+the ones being removed.
+"""
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Tuple
+
+TRACK_POINTS = int(os.getenv("SIGINT_TRACK_POINTS", "120"))
+TRACK_STALE_S = float(os.getenv("SIGINT_TRACK_STALE", "1800"))
+MAX_TRACKS = int(os.getenv("SIGINT_MAX_TRACKS", "5000"))
+# An airframe staying inside a box this wide is loitering
+LOITER_KM = float(os.getenv("SIGINT_LOITER_KM", "60"))
+# Net turn while loitering that counts as flying an orbit
+ORBIT_TURN_DEG = 300.0
+
+KM_PER_DEG = 111.32
+
+# (timestamp, lat, lon, altitude ft | None)
+Point = Tuple[float, float, float, int | None]
+
+
+def track_key(aircraft: Dict[str, Any]) -> str | None:
+    hex_id = str(aircraft.get("hex") or "").strip().lower()
+    if hex_id:
+        return hex_id
+    callsign = str(aircraft.get("callsign") or "").strip().upper()
+    return callsign or None
+
+
+def _bearing(a: Point, b: Point) -> float:
+    lat1, lat2 = math.radians(a[1]), math.radians(b[1])
+    dlon = math.radians(b[2] - a[2])
+    x = math.sin(dlon) * math.cos(lat2)
+    y = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
+    return math.degrees(math.atan2(x, y))
+
+
+class Track:
+    __slots__ = ("key", "callsign", "type", "category", "first_seen", "last_seen", "points")
+
+    def __init__(self, key: str, now: float):
+        self.key = key
+        self.callsign: str | None = None
+        self.type: str | None = None
+        self.category: str | None = None
+        self.first_seen = now
+        self.last_seen = now
+        self.points: Deque[Point] = deque(maxlen=TRACK_POINTS)
+
+    def loiter(self) -> Tuple[float, int]:
+        """
+        (seconds, points) of the trailing stretch spent inside a LOITER_KM box.
+
+        Walks back from the newest point keeping a running bounding box, so
+        the cost is linear in the stretch length.
+        """
+        points = self.points
+        if len(points) < 2:
+            return 0.0, len(points)
+        newest = points[-1]
+        lat_min = lat_max = newest[1]
+        lon_min = lon_max = newest[2]
+        lon_scale = KM_PER_DEG * max(math.cos(math.radians(newest[1])), 1e-6)
+        start = len(points) - 1
+        for i in range(len(points) - 2, -1, -1):
+            _, lat, lon, _ = points[i]
+            lat_min, lat_max = min(lat_min, lat), max(lat_max, lat)
+            lon_min, lon_max = min(lon_min, lon), max(lon_max, lon)
+            if (lat_max - lat_min) * KM_PER_DEG > LOITER_KM or (lon_max - lon_min) * lon_scale > LOITER_KM:
+                break
+            start = i
+        return newest[0] - points[start][0], len(points) - start
+
+    def net_turn(self, count: int) -> float:
+        """Signed heading change (degrees) over the last `count` points."""
+        points = list(self.points)[-count:]
+        bearings = [_bearing(a, b) for a, b in zip(points, points[1:]) if (a[1], a[2]) != (b[1], b[2])]
+        turn = 0.0
+        for prev, cur in zip(bearings, bearings[1:]):
+            turn += (cur - prev + 180.0) % 360.0 - 180.0
+        return turn
+
+    def features(self) -> Dict[str, Any]:
+        loiter_s, loiter_points = self.loiter()
+        orbiting = loiter_points >= 4 and abs(self.net_turn(loiter_points)) >= ORBIT_TURN_DEG
+        return {
+            "first_seen": round(self.first_seen),
+            "last_seen": round(self.last_seen),
+            "tracked_s": round(self.last_seen - self.first_seen),
+            "track_points": len(self.points),
+            "loiter_s": round(loiter_s),
+            "orbiting": orbiting,
+        }
+
+
+class TrackStore:
+    def __init__(self, max_tracks: int = MAX_TRACKS, stale_s: float = TRACK_STALE_S):
+        self.max_tracks = max_tracks
+        self.stale_s = stale_s
+        # Least recently updated first
+        self._tracks: "OrderedDict[str, Track]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def get(self, key: str) -> Track | None:
+        return self._tracks.get(key)
+
+    def update(self, aircraft: List[Dict[str, Any]], now: float | None = None) -> None:
+        """Append one snapshot of normalized aircraft (see sigint_agent._filter_aircraft)."""
+        now = time.time() if now is None else now
+        for ac in aircraft:
+            key = track_key(ac)
+            if key is None or ac.get("lat") is None or ac.get("lon") is None:
+                continue
+            track = self._tracks.get(key)
+            if track is None:
+                track = self._tracks[key] = Track(key, now)
+            else:
+                self._tracks.move_to_end(key)
+            track.callsign = ac.get("callsign") or track.callsign
+            track.type = ac.get("type") or track.type
+            track.category = ac.get("category") or track.category
+            track.last_seen = now
+            # Cached snapshots repeat positions; only movement extends the history
+            if not track.points or track.points[-1][1:3] != (ac["lat"], ac["lon"]):
+                track.points.append((now, ac["lat"], ac["lon"], ac.get("altitude")))
+        self.evict(now)
+
+    def evict(self, now: float | None = None) -> int:
+        """Drop stale tracks and enforce the track cap; returns how many went."""
+        cutoff = (time.time() if now is None else now) - self.stale_s
+        dropped = 0
+        while self._tracks:
+            key, track = next(iter(self._tracks.items()))
+            if track.last_seen >= cutoff and len(self._tracks) <= self.max_tracks:
+                break
+            del self._tracks[key]
+            dropped += 1
+        return dropped
+
+    def annotate(self, aircraft: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return copies of `aircraft` with their track features attached."""
+        annotated = []
+        for ac in aircraft:
+            key = track_key(ac)
+            track = self._tracks.get(key) if key else None
+            annotated.append({**ac, **track.features()} if track else dict(ac))
+        return annotated
+
+
+TRACK_STORE = TrackStore()
@@ -1,7 +1,13 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from agents.supervisor import analyze_conflict
+from agents.collectors import collector_stats
+from agents.finint_agent import commodity_stats, polymarket_stats
+from agents.geoint_agent import geoint_trends
+from agents.news_agent import news_stats
+from agents.sigint_agent import vessel_provider_stats
+from agents.source_cache import cache_stats
+from agents.supervisor import aanalyze_conflict, analysis_stats
 
 
 router = APIRouter()
@@ -12,11 +18,89 @@ class AnalyzeRequest(BaseModel):
 
 
 @router.post("/analyze")
-def analyze(request: AnalyzeRequest):
+async def analyze(request: AnalyzeRequest):
     """
     POST /analyze
     Body: {"conflict": "US-Iran"}
     Returns the full supervisor (Claude + FININT) analysis response.
     """
-    result = analyze_conflict(request.conflict)
+    result = await aanalyze_conflict(request.conflict)
     return result
+
+
+@router.get("/analyze/stats")
+def analyze_stats():
+    """
+    GET /analyze/stats
+    Returns single-flight counters: how many analyze calls were executed,
+    coalesced onto an in-flight run, or served from the freshness window.
+    """
+    return analysis_stats()
+
+
+@router.get("/cache/stats")
+def source_cache_stats():
+    """
+    GET /cache/stats
+    Returns per-source cache counters (hits, stale hits, misses, disk hits).
+    """
+    return cache_stats()
+
+
+@router.get("/collectors/stats")
+def background_collector_stats():
+    """
+    GET /collectors/stats
+    Returns per-feed poller state: polls, errors, cadence and snapshot age.
+    """
+    return collector_stats()
+
+
+@router.get("/geoint/trends")
+async def geoint_region_trends():
+    """
+    GET /geoint/trends
+    Returns per-region thermal anomaly counts for the last 24h against the
+    7-day daily mean, served from the local FIRMS archive.
+    """
+    return await geoint_trends()
+
+
+@router.get("/sigint/providers")
+def sigint_provider_stats():
+    """
+    GET /sigint/providers
+    Returns hedged vessel-provider stats: outcomes, wins, latency quantiles
+    and the current hedge delay per provider.
+    """
+    return vessel_provider_stats()
+
+
+@router.get("/finint/polymarket")
+def finint_polymarket_stats():
+    """
+    GET /finint/polymarket
+    Returns local Polymarket catalog state: market count, sync counters,
+    watermark and markets per indexed keyword.
+    """
+    return polymarket_stats()
+
+
+@router.get("/finint/commodities")
+def finint_commodity_stats():
+    """
+    GET /finint/commodities
+    Returns per-series commodity history state (latest point, next expected
+    point, upstream calls, throttles) and rate-governor counters.
+    """
+    return commodity_stats()
+
+
+@router.get("/news/store")
+def news_store_stats():
+    """
+    GET /news/store
+    Returns per-query NewsAPI article windows: stored articles, watermark,
+    requests, new vs duplicate articles and backfills.
+    """
+    return news_stats()
@@ -0,0 +1,187 @@
+"""
+Benchmark – SIGINT aircraft / vessel filtering.
+
+Compares the compiled, per-airframe-cached classifiers (agents/classifiers.py)
+used by sigint_agent._filter_aircraft / _filter_ships against the previous
+per-record `any(startswith)` / substring-scan implementation, reproduced
+below as the baseline. Exits with an error if the two disagree on any poll.
+
+A synthetic feed of mostly civil traffic with a few percent military
+airframes is "polled" repeatedly with jittered positions, the way the
+ADS-B collector sees a region.
+
+Run from backend/:
+    python -m benchmarks.bench_classifier [--aircraft 5000] [--vessels 3000] [--polls 20]
+"""
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from agents import classifiers
+from agents.sigint_agent import _extract_aircraft_position, _extract_ship_position, _filter_aircraft, _filter_ships
+
+# ── Baseline (previous implementation) ────────────────────────────────────
+
+_MILITARY_CALLSIGNS = ["RCH", "USAF", "NAVY", "DUKE", "REACH", "JAKE", "EVAC", "GTMO", "SAM", "AIR1", "AIR2"]
+_SURVEILLANCE_TYPES = ["RC-135", "E-3", "E-8", "P-8", "EP-3", "RQ-4", "MQ-9", "U-2", "E-6"]
+_TANKER_TYPES = ["KC-135", "KC-10", "KC-46"]
+
+
+def _legacy_classify_aircraft(callsign: str, ac_type: str) -> str | None:
+    cs_upper = callsign.upper()
+    type_upper = ac_type.upper()
+    if any(cs_upper.startswith(prefix) for prefix in _MILITARY_CALLSIGNS):
+        if any(t in type_upper for t in _TANKER_TYPES):
+            return "tanker"
+        return "transport"
+    if any(t in type_upper for t in _SURVEILLANCE_TYPES):
+        return "surveillance"
+    if any(t in type_upper for t in _TANKER_TYPES):
+        return "tanker"
+    return None
+
+
+def legacy_filter_aircraft(aircraft_raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    results = []
+    for ac in aircraft_raw:
+        callsign = (ac.get("flight") or ac.get("callsign") or ac.get("cs") or "").strip()
+        ac_type = ac.get("type") or ac.get("t") or ac.get("aircraft_type") or ac.get("desc") or ""
+        if not callsign and not ac_type:
+            continue
+        category = _legacy_classify_aircraft(callsign, ac_type)
+        if category is None:
+            continue
+        lat, lon, alt_ft = _extract_aircraft_position(ac)
+        if lat is None or lon is None:
+            continue
+        results.append({"callsign": callsign or None, "type": ac_type or None, "lat": lat, "lon": lon,
+                        "altitude": alt_ft, "category": category})
+    return results
+
+
+def _legacy_is_warship(name: str, ship_type: str) -> bool:
+    name_l = name.lower()
+    type_l = ship_type.lower()
+    keywords = ["warship", "military", "destroyer", "frigate", "corvette", "carrier", "aircraft carrier",
+                "navy", "patrol boat", "patrol vessel"]
+    for kw in keywords:
+        if kw in name_l or kw in type_l:
+            return True
+    return any(prefix in name for prefix in ("USS ", "HMS ", "FS ", "FREMM "))
+
+
+def legacy_filter_ships(vessels_raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    results = []
+    for v in vessels_raw:
+        name = v.get("name") or v.get("NAME") or v.get("shipname") or v.get("SHIPNAME") or ""
+        ship_type = v.get("type") or v.get("TYPE") or v.get("ship_type") or v.get("SHIPTYPE") or ""
+        name = str(name or "").strip()
+        ship_type = str(ship_type or "").strip()
+        if not name and not ship_type:
+            continue
+        if not _legacy_is_warship(name, ship_type):
+            continue
+        lat, lon = _extract_ship_position(v)
+        if lat is None or lon is None:
+            continue
+        results.append({"name": name or None, "type": ship_type or None, "lat": lat, "lon": lon})
+    return results
+
+
+# ── Synthetic feeds ───────────────────────────────────────────────────────
+
+CIVIL_TYPES = ["A320", "A321", "B738", "B77W", "A359", "B789", "E190", "AT76", "C172", "A333"]
+CIVIL_AIRLINES = ["UAE", "QTR", "ETD", "THY", "DLH", "BAW", "AFR", "SVA", "IRA", "FDB", "KAC", "GFA"]
+MILITARY = [
+    ("RCH", "C17"), ("RCH", "KC-135R"), ("FORTE", "RQ-4B"), ("JAKE", "RC-135W"), ("NAVY", "P8"),
+    ("HOMER", "R135"), ("QID", "K35R"), ("NATO", "E3TF"), ("DUKE", "C30J"), ("", "Q9"),
+]
+CIVIL_SHIPS = [("MSC {}", "Cargo"), ("MAERSK {}", "Container Ship"), ("{} SPIRIT", "Tanker"), ("AL {}", "Bulk Carrier")]
+NAVAL_SHIPS = [("USS {}", "Military"), ("HMS {}", "Military ops"), ("INS {}", "Warship"), ("{}", "Patrol Vessel")]
+
+
+def make_fleet(n: int, military_share: float, rng: random.Random) -> List[Dict[str, Any]]:
+    fleet = []
+    for i in range(n):
+        if rng.random() < military_share:
+            prefix, ac_type = rng.choice(MILITARY)
+            hex_id = f"{rng.randint(0xAE0000, 0xAFFFFF):06x}"
+            flight = f"{prefix}{rng.randint(1, 99)}" if prefix else ""
+        else:
+            ac_type = rng.choice(CIVIL_TYPES)
+            hex_id = f"{rng.randint(0x700000, 0x8FFFFF):06x}"
+            flight = f"{rng.choice(CIVIL_AIRLINES)}{rng.randint(1, 9999)}"
+        fleet.append({"hex": hex_id, "flight": f"{flight:<8}", "t": ac_type,
+                      "lat": rng.uniform(20, 40), "lon": rng.uniform(35, 65), "alt_baro": rng.randint(0, 45000)})
+    return fleet
+
+
+def make_vessels(n: int, naval_share: float, rng: random.Random) -> List[Dict[str, Any]]:
+    vessels = []
+    for i in range(n):
+        name, ship_type = rng.choice(NAVAL_SHIPS if rng.random() < naval_share else CIVIL_SHIPS)
+        vessels.append({"name": name.format(f"V{i}"), "type": ship_type,
+                        "lat": rng.uniform(20, 30), "lon": rng.uniform(48, 62)})
+    return vessels
+
+
+def jitter(records: List[Dict[str, Any]], rng: random.Random) -> List[Dict[str, Any]]:
+    return [{**r, "lat": r["lat"] + rng.uniform(-0.01, 0.01), "lon": r["lon"] + rng.uniform(-0.01, 0.01)} for r in records]
+
+
+def run(fn: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]], polls: List[List[Dict[str, Any]]]) -> Tuple[float, float, int]:
+    """(first poll seconds, mean later poll seconds, matches in first poll)."""
+    start = time.perf_counter()
+    matched = len(fn(polls[0]))
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for poll in polls[1:]:
+        fn(poll)
+    rest = (time.perf_counter() - start) / max(len(polls) - 1, 1)
+    return first, rest, matched
+
+
+def check_identical(label: str, legacy: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                    compiled: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                    polls: List[List[Dict[str, Any]]]) -> None:
+    for i, poll in enumerate(polls):
+        if legacy(poll) != compiled(poll):
+            raise SystemExit(f"{label}: compiled classifier output differs from the baseline on poll {i}")
+
+
+def report(label: str, n: int, legacy: Tuple[float, float, int], compiled: Tuple[float, float, int]) -> None:
+    print(f"\n{label} ({n} records/poll)")
+    print(f"  {'':10} {'first poll':>12} {'later polls':>12} {'records/s':>12} {'matched':>8}")
+    for name, (first, rest, matched) in (("baseline", legacy), ("compiled", compiled)):
+        print(f"  {name:10} {first * 1000:10.2f}ms {rest * 1000:10.2f}ms {n / rest if rest else 0:12,.0f} {matched:8}")
+    print(f"  speedup: {legacy[0] / compiled[0]:.1f}x first poll, {legacy[1] / compiled[1]:.1f}x later polls")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--aircraft", type=int, default=5000)
+    parser.add_argument("--vessels", type=int, default=3000)
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fleet = make_fleet(args.aircraft, 0.04, rng)
+    aircraft_polls = [jitter(fleet, rng) for _ in range(args.polls)]
+    vessels = make_vessels(args.vessels, 0.03, rng)
+    vessel_polls = [jitter(vessels, rng) for _ in range(args.polls)]
+
+    classifiers.classify_aircraft.cache_clear()
+    classifiers.is_warship.cache_clear()
+    report("Aircraft", args.aircraft, run(legacy_filter_aircraft, aircraft_polls), run(_filter_aircraft, aircraft_polls))
+    report("Vessels", args.vessels, run(legacy_filter_ships, vessel_polls), run(_filter_ships, vessel_polls))
+    check_identical("Aircraft", legacy_filter_aircraft, _filter_aircraft, aircraft_polls)
+    check_identical("Vessels", legacy_filter_ships, _filter_ships, vessel_polls)
+    print("\noutput identical to the baseline on every poll")
+    print(f"classify_aircraft cache: {classifiers.classify_aircraft.cache_info()}")
+    print(f"is_warship cache:        {classifiers.is_warship.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark – keyword relevance and sentiment scoring.
+
+Compares agents/keyword_matcher.KeywordMatcher – a relevance pass, then
+escalation / de-escalation counts for the relevant posts, as SOCMINT's
+_score_posts does – against the per-post `kw in text.lower()` loops the NEWS
+and SOCMINT agents used before, on synthetic social posts. Both must
+produce the same scores; the run fails otherwise.
+
+Then scores the same posts with whole_words=True (the Polymarket index's
+mode) and reports its speed and how many posts it scores differently, e.g.
+no "war" inside "software" but "attacks" for "attack".
+
+Runs are repeated with the keyword lists padded by --scale, to show how each
+grows as keyword sets do.
+
+Run from backend/:
+    python -m benchmarks.bench_keywords [--posts 5000] [--words 40] [--scale 10] [--repeat 5]
+"""
+import argparse
+import random
+import string
+import time
+from itertools import compress
+from typing import Callable, List, Sequence, Tuple
+
+from agents.keyword_matcher import KeywordMatcher
+from agents.socmint_agent import DE_ESCALATION_KW, ESCALATION_KW
+
+RELEVANCE_KW = ["iran", "irgc", "tehran", "nuclear", "khamenei"]
+
+FILLER = (
+    "the a of to in on and for with from said officials report today after before new government people "
+    "city region statement week spokesman video footage market price update software ideal warning toward "
+    "warehouse forward reward strikers attacker statistics drone border forces iranian tehran's talkshow"
+).split()
+SIGNAL = ESCALATION_KW + DE_ESCALATION_KW + RELEVANCE_KW + ["strikes", "attacks", "negotiating", "talks", "wars"]
+
+KeywordSets = Tuple[List[str], List[str], List[str]]
+Scorer = Callable[[Sequence[str]], List[float | None]]
+
+
+def make_posts(n: int, words: int, rng: random.Random) -> List[str]:
+    posts = []
+    for _ in range(n):
+        tokens = [rng.choice(SIGNAL) if rng.random() < 0.08 else rng.choice(FILLER) for _ in range(words)]
+        tokens[0] = tokens[0].capitalize()
+        posts.append(" ".join(tokens) + ".")
+    return posts
+
+
+def padded(keywords: List[str], scale: int, rng: random.Random) -> List[str]:
+    """`keywords` plus enough made-up words to make the list `scale` times as long."""
+    extra = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))) for _ in range(len(keywords) * (scale - 1))]
+    return keywords + extra
+
+
+def _capped(s: int) -> float:
+    return 0.0 if s == 0 else max(-3, min(3, s)) / 3.0
+
+
+def legacy_scorer(relevance: List[str], escalation: List[str], de_escalation: List[str]) -> Scorer:
+    def score(posts: Sequence[str]) -> List[float | None]:
+        scores = []
+        for text in posts:
+            lower = text.lower()
+            if not any(k in lower for k in relevance):
+                scores.append(None)
+                continue
+            scores.append(_capped(sum(1 for k in escalation if k in lower) - sum(1 for k in de_escalation if k in lower)))
+        return scores
+    return score
+
+
+def matcher_scorer(relevance: List[str], escalation: List[str], de_escalation: List[str], whole_words: bool = False) -> Scorer:
+    relevant = KeywordMatcher({"conflict": relevance}, whole_words=whole_words)
+    sentiment = KeywordMatcher({"escalation": escalation, "de_escalation": de_escalation}, whole_words=whole_words)
+
+    def score(posts: Sequence[str]) -> List[float | None]:
+        flags = relevant.any_batch(posts)
+        counts = sentiment.count_batch(list(compress(posts, flags)))
+        net = iter((counts[:, 0] - counts[:, 1]).tolist())
+        return [_capped(next(net)) if flag else None for flag in flags]
+    return score
+
+
+def best_of(fn: Scorer, posts: Sequence[str], repeat: int) -> Tuple[float, List[float | None]]:
+    timings, result = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(posts)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    posts = make_posts(args.posts, args.words, rng)
+    base: KeywordSets = (RELEVANCE_KW, ESCALATION_KW, DE_ESCALATION_KW)
+
+    print(f"{args.posts} posts × {args.words} words, best of {args.repeat}")
+    print(f"  {'keywords':>9} {'':16} {'time':>10} {'posts/s':>12} {'vs loops':>9}")
+    for scale in (1, args.scale):
+        sets = base if scale == 1 else tuple(padded(kw, scale, rng) for kw in base)
+        n_keywords = sum(len(kw) for kw in sets)
+        loops = best_of(legacy_scorer(*sets), posts, args.repeat)
+        batch = best_of(matcher_scorer(*sets), posts, args.repeat)
+        for name, (seconds, _) in (("substring loops", loops), ("matcher batch", batch)):
+            print(f"  {n_keywords:9} {name:16} {seconds * 1000:8.1f}ms {args.posts / seconds:12,.0f} {loops[0] / seconds:8.1f}x")
+        if loops[1] != batch[1]:
+            raise SystemExit(f"matcher scores differ from the loops at {n_keywords} keywords")
+        if scale == 1:
+            substring = batch
+    print("\nscores identical to the loops")
+
+    whole = best_of(matcher_scorer(*base, whole_words=True), posts, args.repeat)
+    old, new = substring[1], whole[1]
+    differ = sum(1 for a, b in zip(old, new) if a != b)
+    print(f"\nwhole words: {whole[0] * 1000:.1f}ms, {substring[0] / whole[0]:.1f}x the substring matcher")
+    print(f"  posts scored differently: {differ} ({differ / args.posts:.1%})")
+    print(f"  relevant: {sum(s is not None for s in old)} substring vs {sum(s is not None for s in new)} whole-word")
+    print(f"  escalatory (> 0.2): {sum(1 for s in old if s and s > 0.2)} substring vs {sum(1 for s in new if s and s > 0.2)} whole-word")
+    print(f"  de-escalatory (< -0.2): {sum(1 for s in old if s is not None and s < -0.2)} substring vs {sum(1 for s in new if s is not None and s < -0.2)} whole-word")
+
+
+if __name__ == "__main__":
+    main()
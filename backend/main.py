@@ -1,6 +1,7 @@
 import os
 import asyncio
 import json
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -8,14 +9,32 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import router as api_router
 from api.pdf_export import router as pdf_router
-from agents.supervisor import analyze_conflict
+from agents.collectors import start_collectors, stop_collectors
+from agents.http_pool import HttpClientPool, set_http_pool
+from agents.supervisor import add_backfill_listener, astream_conflict
 
 load_dotenv()
 
 os.environ.setdefault("LANGCHAIN_TRACING_V2", os.getenv("LANGCHAIN_TRACING_V2", "true"))
 os.environ.setdefault("LANGCHAIN_ENDPOINT", os.getenv("LANGCHAIN_ENDPOINT", "https://api.smith.langchain.com"))
 
-app = FastAPI(title="Conflict Analysis Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client set for the whole process, shared by all agents
+    http_pool = HttpClientPool()
+    set_http_pool(http_pool)
+    # ADS-B / vessel pollers publish snapshots that SIGINT reads
+    if os.getenv("COLLECTORS", "1") == "1":
+        start_collectors()
+    try:
+        yield
+    finally:
+        await stop_collectors()
+        set_http_pool(None)
+        await http_pool.aclose()
+
+
+app = FastAPI(title="Conflict Analysis Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,59 +54,131 @@ def health() -> dict:
 
 
 # ── WebSocket Manager ──────────────────────────────────────────────────────
+REFRESH_INTERVAL_S = float(os.getenv("WS_REFRESH_INTERVAL", "60"))
+# A subscriber that cannot take a message within this long is dropped
+SEND_TIMEOUT_S = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
+    """
+    Topic-based WebSocket fan-out.
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+    Each conflict is a topic with exactly one refresh task, started when the
+    first client subscribes and cancelled once the last one leaves. Analysis
+    load therefore scales with distinct conflicts, not connected clients.
+    """
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+    def __init__(self):
+        self.topics: dict[str, set[WebSocket]] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.latest: dict[str, dict] = {}
+        self.streaming: set[WebSocket] = set()
 
-    async def broadcast(self, data: dict):
-        dead = []
-        for connection in self.active_connections:
+    async def connect(self, websocket: WebSocket, conflict: str, stream: bool = False):
+        await websocket.accept()
+        self.topics.setdefault(conflict, set()).add(websocket)
+        if stream:
+            self.streaming.add(websocket)
+
+        # Late joiners get the last completed analysis straight away
+        if conflict in self.latest:
+            await websocket.send_json(self.latest[conflict])
+
+        if conflict not in self.tasks:
+            self.tasks[conflict] = asyncio.create_task(self._refresh_loop(conflict))
+            print(f"[WS] Refresh task started – conflict: {conflict}")
+
+    def disconnect(self, websocket: WebSocket, conflict: str):
+        subscribers = self.topics.get(conflict)
+        if subscribers is None:
+            return
+        subscribers.discard(websocket)
+        self.streaming.discard(websocket)
+        if subscribers:
+            return
+
+        del self.topics[conflict]
+        self.latest.pop(conflict, None)
+        task = self.tasks.pop(conflict, None)
+        if task is not None:
+            task.cancel()
+            print(f"[WS] Refresh task stopped – conflict: {conflict}")
+
+    async def broadcast(self, conflict: str, data: dict, streaming: bool | None = None):
+        """
+        Send to a topic; `streaming` restricts to (non-)streaming subscribers.
+
+        Sends run concurrently, each bounded by SEND_TIMEOUT_S, so one slow
+        client cannot hold up the rest; failed or timed-out sockets are dropped.
+        """
+        targets = [
+            connection for connection in self.topics.get(conflict, ())
+            if streaming is None or (connection in self.streaming) == streaming
+        ]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(connection.send_json(data), SEND_TIMEOUT_S) for connection in targets),
+            return_exceptions=True,
+        )
+        for connection, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.TimeoutError):
+                    print(f"[WS] Dropping subscriber that stalled for {SEND_TIMEOUT_S:g}s – conflict: {conflict}")
+                self.disconnect(connection, conflict)
+
+    async def on_backfill(self, conflict: str, stage: str, result: dict):
+        """Push an agent result that arrived after its analysis deadline."""
+        if conflict not in self.topics:
+            return
+        await self.broadcast(
+            conflict,
+            {"status": "partial", "stage": stage, "conflict": conflict, "agent_status": "backfill", "data": result},
+            streaming=True,
+        )
+        latest = self.latest.get(conflict)
+        if latest is not None:
+            latest = {**latest, stage: result, "agent_status": {**latest.get("agent_status", {}), stage: "backfill"}}
+            self.latest[conflict] = latest
+            await self.broadcast(conflict, latest, streaming=False)
+
+    async def _refresh_loop(self, conflict: str):
+        while True:
+            await self.broadcast(conflict, {"status": "analyzing", "conflict": conflict})
             try:
-                await connection.send_json(data)
-            except Exception:
-                dead.append(connection)
-        for d in dead:
-            self.active_connections.remove(d)
+                async for message in astream_conflict(conflict):
+                    if message.get("stage") == "supervisor":
+                        result = {**message, "status": "ok"}
+                        self.latest[conflict] = result
+                    else:
+                        await self.broadcast(conflict, {**message, "status": "partial"}, streaming=True)
+            except Exception as e:
+                print(f"[WS] Error: {e}")
+                result = {"status": "error", "conflict": conflict, "message": str(e)}
+            await self.broadcast(conflict, result)
+            await asyncio.sleep(REFRESH_INTERVAL_S)
 
 
 manager = ConnectionManager()
+add_backfill_listener(manager.on_backfill)
 
 
 @app.websocket("/ws/{conflict}")
-async def websocket_endpoint(websocket: WebSocket, conflict: str):
-    await manager.connect(websocket)
-    print(f"[WS] Client connected – conflict: {conflict}")
+async def websocket_endpoint(websocket: WebSocket, conflict: str, stream: bool = False):
+    """
+    Subscribe to a conflict. With ?stream=1 the client also receives each
+    agent's result as {"status": "partial", "stage": "<agent>", "data": ...}
+    before the final {"status": "ok", "stage": "supervisor", ...} message.
+    """
     try:
-        # Send initial analysis immediately on connect
-        await websocket.send_json({"status": "analyzing", "conflict": conflict})
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, analyze_conflict, conflict)
-        result["status"] = "ok"
-        await websocket.send_json(result)
-
-        # Then push updates every 60 seconds
+        # disconnect() in `finally` also undoes a connect that failed part way
+        await manager.connect(websocket, conflict, stream)
+        print(f"[WS] Client connected – conflict: {conflict}")
+        # Updates are pushed by the topic's refresh task; we only need to
+        # notice when the client goes away.
         while True:
-            await asyncio.sleep(60)
-            await websocket.send_json({"status": "analyzing", "conflict": conflict})
-            result = await loop.run_in_executor(None, analyze_conflict, conflict)
-            result["status"] = "ok"
-            await websocket.send_json(result)
-
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
         print(f"[WS] Client disconnected – conflict: {conflict}")
     except Exception as e:
         print(f"[WS] Error: {e}")
-        try:
-            await websocket.send_json({"status": "error", "message": str(e)})
-        except Exception:
-            pass
-        manager.disconnect(websocket)
-
+    finally:
+        manager.disconnect(websocket, conflict)
@@ -45,7 +45,7 @@ export function useConflictWebSocket({ conflict, enabled = true }: UseConflictWe
       wsRef.current.close();
     }
 
-    const wsUrl = `ws://localhost:8000/ws/${encodeURIComponent(conflictRef.current)}`;
+    const wsUrl = `ws://localhost:8000/ws/${encodeURIComponent(conflictRef.current)}?stream=1`;
     console.log("[WS] Connecting to", wsUrl);
     setStatus("connecting");
 
@@ -66,6 +66,10 @@ export function useConflictWebSocket({ conflict, enabled = true }: UseConflictWe
         const msg = JSON.parse(event.data);
         if (msg.status === "analyzing") {
           setStatus("analyzing");
+        } else if (msg.status === "partial" && msg.stage) {
+          // Per-agent result streamed ahead of the supervisor synthesis
+          setData((prev) => ({ ...(prev ?? { conflict: msg.conflict } as ConflictData), [msg.stage]: msg.data }));
+          setLastUpdated(new Date());
         } else if (msg.status === "ok") {
           setData(msg);
           setLastUpdated(new Date());